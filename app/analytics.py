@@ -0,0 +1,190 @@
+# research_copilot/app/analytics.py
+"""
+Multi-ticker sentiment analytics.
+
+The ``date, ticker, avg_sentiment`` series is scattered once into a date x ticker NumPy
+matrix (NaN where a ticker has no value that day), and every feature is computed on the
+whole matrix at once instead of per ticker:
+
+- rolling mean / std from cumulative sums of values, squares and observation counts;
+- z-scores, over the full sample or a rolling window;
+- cross-sectional ranks per date (ties averaged, NaN left unranked);
+- the pairwise-complete Pearson correlation matrix from a few matrix products.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class SentimentMatrix:
+    """``values[i, j]`` is the sentiment of ``tickers[j]`` on ``dates[i]`` (NaN if missing)."""
+
+    dates: np.ndarray
+    tickers: np.ndarray
+    values: np.ndarray
+
+    def frame(self, values: np.ndarray | None = None) -> pd.DataFrame:
+        """``values`` (default the sentiment itself) as a date x ticker DataFrame."""
+        return pd.DataFrame(self.values if values is None else values, index=pd.DatetimeIndex(self.dates, name="date"), columns=pd.Index(self.tickers, name="ticker"))
+
+
+def to_matrix(series: list[dict] | pd.DataFrame) -> SentimentMatrix:
+    """
+    Builds the date x ticker matrix from ``date, ticker, avg_sentiment`` records in one
+    pass; duplicate (date, ticker) rows are averaged.
+    """
+    df = series if isinstance(series, pd.DataFrame) else pd.DataFrame(series, columns=["date", "ticker", "avg_sentiment"])
+    if df.empty:
+        return SentimentMatrix(np.array([], dtype="datetime64[ns]"), np.array([], dtype=object), np.empty((0, 0)))
+    dates = df["date"] if pd.api.types.is_datetime64_any_dtype(df["date"]) else pd.to_datetime(df["date"], format="ISO8601")
+    di, uniq_dates = pd.factorize(dates, sort=True)
+    ti, uniq_tickers = pd.factorize(df["ticker"], sort=True)
+    v = df["avg_sentiment"].to_numpy(dtype=np.float64)
+    ok = ~np.isnan(v)
+    shape = (len(uniq_dates), len(uniq_tickers))
+    flat = (di * shape[1] + ti)[ok]
+    sums = np.bincount(flat, weights=v[ok], minlength=shape[0] * shape[1])
+    counts = np.bincount(flat, minlength=shape[0] * shape[1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        values = (sums / counts).reshape(shape)  # 0/0 -> NaN for missing cells
+    return SentimentMatrix(np.asarray(uniq_dates), np.asarray(uniq_tickers, dtype=object), values)
+
+
+def _window_sums(x: np.ndarray, window: int) -> np.ndarray:
+    """Sum of the last ``window`` rows at each row (fewer at the start), via one cumsum."""
+    cs = np.cumsum(x, axis=0)
+    out = cs.copy()
+    out[window:] -= cs[:-window]
+    return out
+
+
+def _rolling_moments(values: np.ndarray, window: int, min_periods: int | None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if window < 1:
+        raise ValueError(f"window must be >= 1, got {window}")
+    ok = ~np.isnan(values)
+    x = np.where(ok, values, 0.0)
+    n = _window_sums(ok.astype(np.float64), window)
+    s = _window_sums(x, window)
+    ss = _window_sums(x * x, window)
+    n[n < (window if min_periods is None else max(min_periods, 1))] = np.nan
+    return n, s, ss
+
+
+def rolling_mean(values: np.ndarray, window: int, min_periods: int | None = None) -> np.ndarray:
+    """
+    Per-column mean over the last ``window`` rows, ignoring NaN.
+
+    Args:
+        values (np.ndarray): date x ticker matrix.
+        window (int): Rows per window.
+        min_periods (int, optional): Non-NaN values needed for a result; defaults to ``window``.
+    """
+    n, s, _ = _rolling_moments(values, window, min_periods)
+    return s / n
+
+
+def rolling_std(values: np.ndarray, window: int, min_periods: int | None = None, ddof: int = 1) -> np.ndarray:
+    """Per-column standard deviation over the last ``window`` rows, ignoring NaN (see :func:`rolling_mean`)."""
+    n, s, ss = _rolling_moments(values, window, min_periods)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (ss - s * s / n) / (n - ddof)
+    return np.sqrt(np.maximum(var, 0.0, where=~np.isnan(var), out=var))
+
+
+def zscore(values: np.ndarray, window: int | None = None, min_periods: int | None = None) -> np.ndarray:
+    """
+    ``(x - mean) / std`` per ticker: over the whole sample, or over the trailing ``window``
+    rows when given. Zero-variance windows give NaN.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if window is None:
+            mean = np.nanmean(values, axis=0) if values.size else values
+            std = np.nanstd(values, axis=0, ddof=1) if values.size else values
+        else:
+            mean, std = rolling_mean(values, window, min_periods), rolling_std(values, window, min_periods)
+        z = (values - mean) / std
+    z[~np.isfinite(z)] = np.nan
+    return z
+
+
+def cs_rank(values: np.ndarray, pct: bool = True) -> np.ndarray:
+    """
+    Rank of each ticker among the tickers with a value that date (1 = lowest; ties share
+    their average rank). With ``pct`` the rank is divided by the number of ranked tickers.
+    NaN stays NaN.
+    """
+    if values.size == 0:
+        return values.copy()
+    rows = np.arange(values.shape[0])[:, None]
+    order = np.argsort(values, axis=1, kind="stable")  # NaN sorts last
+    ordered = values[rows, order]
+    k = values.shape[1]
+    pos = np.broadcast_to(np.arange(k), values.shape)
+    # first and last position of each run of equal values, per row
+    new = np.ones(values.shape, dtype=bool)
+    new[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    end = np.ones(values.shape, dtype=bool)
+    end[:, :-1] = new[:, 1:]
+    first = np.maximum.accumulate(np.where(new, pos, 0), axis=1)
+    last = np.minimum.accumulate(np.where(end, pos, k - 1)[:, ::-1], axis=1)[:, ::-1]
+    ranks = np.empty(values.shape)
+    ranks[rows, order] = (first + last) / 2 + 1
+    ranks[np.isnan(values)] = np.nan
+    if pct:
+        with np.errstate(invalid="ignore"):  # all-NaN rows stay NaN
+            ranks /= np.sum(~np.isnan(values), axis=1, keepdims=True)
+    return ranks
+
+
+def correlation(values: np.ndarray, min_periods: int = 2) -> np.ndarray:
+    """
+    ticker x ticker Pearson correlation using, for each pair, the dates where both have a
+    value (like ``DataFrame.corr``). Pairs with fewer than ``min_periods`` such dates are NaN.
+    """
+    ok = ~np.isnan(values)
+    m = ok.astype(np.float64)
+    x = np.where(ok, values, 0.0)
+    n = m.T @ m  # shared observations per pair
+    sx = x.T @ m  # sum of i over dates where j is present: sx[i, j]
+    sxx = (x * x).T @ m
+    sxy = x.T @ x
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sxy - sx * sx.T / n
+        var = sxx - sx * sx / n
+        corr = cov / np.sqrt(var * var.T)
+    corr[(n < max(min_periods, 2)) | ~np.isfinite(corr)] = np.nan
+    np.clip(corr, -1.0, 1.0, out=corr)
+    return corr
+
+
+def features(series: list[dict] | pd.DataFrame, window: int = 20) -> pd.DataFrame:
+    """
+    Long ``date, ticker`` frame with ``avg_sentiment``, ``rolling_mean``, ``rolling_z``
+    (trailing ``window``, at least half of it observed) and ``cs_rank`` (percentile across
+    tickers that date), one row per observed value.
+    """
+    mat = to_matrix(series)
+    cols = ["date", "ticker", "avg_sentiment", "rolling_mean", "rolling_z", "cs_rank"]
+    if mat.values.size == 0:
+        return pd.DataFrame(columns=cols)
+    min_periods = max(window // 2, 2)
+    ok = ~np.isnan(mat.values)
+    di, ti = np.nonzero(ok)
+    out = {
+        "date": mat.dates[di],
+        "ticker": mat.tickers[ti],
+        "avg_sentiment": mat.values[ok],
+        "rolling_mean": rolling_mean(mat.values, window, min_periods)[ok],
+        "rolling_z": zscore(mat.values, window, min_periods)[ok],
+        "cs_rank": cs_rank(mat.values)[ok],
+    }
+    return pd.DataFrame(out, columns=cols)
+
+
+def correlation_frame(series: list[dict] | pd.DataFrame, min_periods: int = 20) -> pd.DataFrame:
+    """:func:`correlation` of the selected tickers as a labelled ticker x ticker DataFrame."""
+    mat = to_matrix(series)
+    return pd.DataFrame(correlation(mat.values, min_periods), index=pd.Index(mat.tickers, name="ticker"), columns=pd.Index(mat.tickers, name="ticker"))
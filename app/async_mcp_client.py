@@ -0,0 +1,90 @@
+# research_copilot/app/async_mcp_client.py
+import asyncio
+import time
+from typing import Any
+
+from app.context import RiskContext
+from app.mcp_client import TIMEOUTS, MCPClient
+
+# Which default timeout bounds each operation when no budget is given.
+_DEFAULT_BUDGETS = {
+    "sentiment_panel_stats": TIMEOUTS["panel_stats"],
+    "risk_summarize": TIMEOUTS["summarize_risk"],
+    "strategy_last_metrics": TIMEOUTS["last_metrics"],
+    "strategy_run_backtest": TIMEOUTS["run_backtest"],
+}
+
+
+class AsyncMCPClient:
+    """
+    asyncio front-end for MCPClient.
+
+    Calls run on worker threads over the same pooled keep-alive sessions, so several
+    services can be queried concurrently from one event loop.
+
+    Args:
+        client (MCPClient, optional): Sync client to delegate to. A new one is created if omitted.
+    """
+
+    def __init__(self, client: MCPClient | None = None) -> None:
+        self.client = client or MCPClient()
+
+    async def _call(self, op: str, budget: float | None = None, **kwargs: Any) -> Any:
+        budget = budget or _DEFAULT_BUDGETS[op]
+        fn = getattr(self.client, op)
+        return await asyncio.wait_for(asyncio.to_thread(fn, timeout=budget, **kwargs), timeout=budget)
+
+    async def sentiment_panel_stats(self, tickers: list, date_from: str, date_to: str, budget: float | None = None) -> Any:
+        """Async counterpart of MCPClient.sentiment_panel_stats, bounded by ``budget`` seconds."""
+        return await self._call("sentiment_panel_stats", budget, tickers=tickers, date_from=date_from, date_to=date_to)
+
+    async def risk_summarize(
+        self, issuer: str | None = None, year: int | None = None, query: str = "top risks", budget: float | None = None, ctx: RiskContext | None = None
+    ) -> Any:
+        """Async counterpart of MCPClient.risk_summarize, bounded by ``budget`` seconds."""
+        return await self._call("risk_summarize", budget or (ctx and ctx.timeout), issuer=issuer, year=year, query=query, ctx=ctx)
+
+    async def strategy_last_metrics(self, budget: float | None = None) -> Any:
+        """Async counterpart of MCPClient.strategy_last_metrics, bounded by ``budget`` seconds."""
+        return await self._call("strategy_last_metrics", budget)
+
+    async def strategy_run_backtest(self, factor: str = "SENT_L1", horizon: int = 1, universe: str = "SP500", costs_bps: int = 10, budget: float | None = None) -> Any:
+        """Async counterpart of MCPClient.strategy_run_backtest, bounded by ``budget`` seconds."""
+        return await self._call("strategy_run_backtest", budget, factor=factor, horizon=horizon, universe=universe, costs_bps=costs_bps)
+
+    async def gather(self, calls: dict[str, tuple[str, dict]], budgets: dict[str, float] | None = None) -> dict[str, dict]:
+        """
+        Sends every call concurrently; total latency is that of the slowest call.
+
+        Args:
+            calls (dict): name -> (operation, kwargs), e.g.
+                ``{"risk": ("risk_summarize", {"issuer": "NVDA", "year": 2023})}``.
+            budgets (dict, optional): name -> seconds allowed for that call.
+
+        Returns:
+            dict: name -> {"ok": bool, "result" | "error": ..., "elapsed_s": float}.
+            A failed or timed-out call never cancels the others.
+        """
+        budgets = budgets or {}
+
+        async def one(name: str, op: str, kwargs: dict) -> tuple[str, dict]:
+            t0 = time.perf_counter()
+            try:
+                res = await self._call(op, budgets.get(name), **kwargs)
+                out = {"ok": True, "result": res}
+            except asyncio.TimeoutError:
+                out = {"ok": False, "error": f"timed out after {budgets.get(name) or _DEFAULT_BUDGETS[op]}s"}
+            except Exception as e:
+                out = {"ok": False, "error": str(e)}
+            out["elapsed_s"] = time.perf_counter() - t0
+            return name, out
+
+        done = await asyncio.gather(*(one(name, op, kwargs) for name, (op, kwargs) in calls.items()))
+        return dict(done)
+
+    def gather_sync(self, calls: dict[str, tuple[str, dict]], budgets: dict[str, float] | None = None) -> dict[str, dict]:
+        """Runs :meth:`gather` from synchronous code such as a Streamlit script."""
+        return asyncio.run(self.gather(calls, budgets))
+
+    def close(self) -> None:
+        self.client.close()
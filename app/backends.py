@@ -0,0 +1,56 @@
+# research_copilot/app/backends.py
+"""
+Lazy access to the three domain packages.
+
+Importing them pulls in torch, transformers, chromadb and langchain, so the UI only probes
+whether they are installed (``find_spec`` does not execute the package) and imports each
+one the first time a query actually needs it.
+"""
+
+import importlib
+import importlib.util
+import inspect
+from typing import Any
+
+from app.resources import REGISTRY
+
+# tool -> (public API module, label shown in the UI)
+BACKENDS = {
+    "sentiment": ("market_sentiment_analyzer.public_api", "Sentiment API"),
+    "risk": ("risk_analysis_agent.public_api", "Risk API"),
+    "strategy": ("strategy_simulator.public_api", "Strategy API"),
+}
+
+
+def probe(tool: str) -> str | None:
+    """
+    Cheap availability check: returns None if the tool's package is installed, else an error message.
+    Only the top-level package is looked up, so nothing is imported.
+    """
+    module, label = BACKENDS[tool]
+    top = module.split(".", 1)[0]
+    try:
+        found = importlib.util.find_spec(top) is not None
+    except (ImportError, ValueError) as e:
+        return f"{label} import failed: {e}"
+    return None if found else f"{label} import failed: No module named '{top}'"
+
+
+def load(tool: str) -> Any:
+    """Imports and returns the tool's public API module, once per process (``backend.<tool>`` in the registry)."""
+    module = BACKENDS[tool][0]
+    return REGISTRY.get(f"backend.{tool}", lambda: importlib.import_module(module))
+
+
+def get(tool: str, name: str) -> Any:
+    """Returns one function of the tool's public API, importing the backend on first use."""
+    return getattr(load(tool), name)
+
+
+def accepts(fn: Any, name: str) -> bool:
+    """True if ``fn`` names a parameter ``name`` that can be passed by keyword (``**kwargs`` does not count)."""
+    try:
+        p = inspect.signature(fn).parameters.get(name)
+    except (TypeError, ValueError):  # callables without a signature
+        return False
+    return p is not None and p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY)
@@ -0,0 +1,81 @@
+# research_copilot/app/cache.py
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from app.config import S
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire ``ttl`` seconds after insertion.
+
+    Args:
+        maxsize (int): Max number of entries; the least recently used one is evicted first.
+        ttl (float): Entry lifetime in seconds; 0 disables expiry.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 300.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is not _MISSING and (not self.ttl or time.monotonic() - item[0] < self.ttl):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return item[1]
+            if item is not _MISSING:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, Any]:
+        """Returns hit/miss counters and current size."""
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0, "size": len(self._data), "maxsize": self.maxsize}
+
+
+def file_mtime(path: str | None) -> int | None:
+    """Modification time (ns) of ``path``, or None if it does not exist."""
+    try:
+        return os.stat(path).st_mtime_ns if path else None
+    except OSError:
+        return None
+
+
+def panel_stats_key(tickers: list[str], date_from: str, date_to: str, panel_path: str | None) -> tuple:
+    """
+    Cache key for a panel_stats call: rewriting the panel file changes its mtime, which
+    changes the key, so stale results are never served.
+    """
+    return tuple(sorted(tickers)), date_from, date_to, panel_path, file_mtime(panel_path)
+
+
+# Process-wide, so every Streamlit session and rerun shares it.
+SENTIMENT_CACHE = TTLCache(maxsize=S.SENTIMENT_CACHE_SIZE, ttl=S.SENTIMENT_CACHE_TTL)
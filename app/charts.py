@@ -0,0 +1,111 @@
+# research_copilot/app/charts.py
+"""
+Sentiment chart rendering.
+
+Series are pivoted once into a date x ticker frame and decimated to the chart's pixel width
+with min/max binning (each bin keeps its extreme values, so spikes survive), then drawn
+natively by Streamlit. PNG export renders the same decimated frame on a standalone
+matplotlib ``Figure`` (no pyplot global state, nothing to close) and is cached.
+"""
+
+import hashlib
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from app.cache import TTLCache
+from app.tracing import span
+
+DEFAULT_WIDTH = 800  # px; ~2 points per pixel column
+
+_PNG_CACHE = TTLCache(maxsize=32, ttl=3600)
+
+
+def to_wide(series: list[dict] | pd.DataFrame) -> pd.DataFrame:
+    """Pivots ``date, ticker, avg_sentiment`` records into a date-indexed frame with one column per ticker."""
+    df = pd.DataFrame(series)
+    if df.empty:
+        return pd.DataFrame()
+    df["date"] = pd.to_datetime(df["date"], format="ISO8601")
+    if df.duplicated(["date", "ticker"]).any():
+        df = df.groupby(["date", "ticker"], as_index=False, observed=True)["avg_sentiment"].mean()
+    return df.pivot(index="date", columns="ticker", values="avg_sentiment").sort_index()
+
+
+def minmax_decimate(wide: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """
+    Reduces ``wide`` to at most ``max_points`` rows: rows are split into max_points/2 bins and
+    each bin contributes its per-ticker min and max, in the order they occur.
+    """
+    n, k = wide.shape
+    if n <= max_points or k == 0:
+        return wide
+    nbins = max(1, max_points // 2)
+    size = -(-n // nbins)
+    nbins = -(-n // size)
+    y = np.full((nbins * size, k), np.nan)
+    y[:n] = wide.to_numpy(dtype=float)
+    y = y.reshape(nbins, size, k)
+
+    empty = np.isnan(y).all(axis=1)  # (nbins, k)
+    imin = np.argmin(np.where(np.isnan(y), np.inf, y), axis=1)
+    imax = np.argmax(np.where(np.isnan(y), -np.inf, y), axis=1)
+    vmin = np.take_along_axis(y, imin[:, None, :], axis=1)[:, 0, :]
+    vmax = np.take_along_axis(y, imax[:, None, :], axis=1)[:, 0, :]
+    min_first = imin <= imax
+    first = np.where(min_first, vmin, vmax)
+    second = np.where(min_first, vmax, vmin)
+    first[empty] = second[empty] = np.nan
+
+    out = np.empty((nbins * 2, k))
+    out[0::2], out[1::2] = first, second
+    starts = np.arange(nbins) * size
+    mids = np.minimum(starts + size // 2, n - 1)
+    idx = np.empty(nbins * 2, dtype=np.int64)
+    idx[0::2], idx[1::2] = starts, mids
+    dates = wide.index.to_numpy()[idx]
+    return pd.DataFrame(out, index=pd.DatetimeIndex(dates, name=wide.index.name), columns=wide.columns)
+
+
+def chart_frame(series: list[dict] | pd.DataFrame, width: int = DEFAULT_WIDTH) -> pd.DataFrame:
+    """Decimated date x ticker frame, ready for ``st.line_chart``."""
+    with span("charts.chart_frame"):
+        return minmax_decimate(to_wide(series), 2 * width)
+
+
+def _render_png(wide: pd.DataFrame) -> bytes:
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(7, 3))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    for t in wide.columns:
+        col = wide[t].dropna()
+        ax.plot(col.index, col.to_numpy(), label=t)
+    ax.set_title("Daily Sentiment Trend")
+    ax.set_ylabel("avg_sentiment")
+    ax.grid(True)
+    ax.legend(loc="upper left", ncol=3, fontsize=8)
+    fig.tight_layout()
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=120)
+    return buf.getvalue()
+
+
+def png(series: list[dict] | pd.DataFrame, width: int = DEFAULT_WIDTH) -> BytesIO | None:
+    """
+    PNG export of the decimated chart, or None for an empty series.
+    Identical charts are rendered once and served from a cache afterwards.
+    """
+    wide = chart_frame(series, width)
+    if wide.empty:
+        return None
+    key = hashlib.sha1(pd.util.hash_pandas_object(wide, index=True).to_numpy().tobytes() + "|".join(map(str, wide.columns)).encode()).hexdigest()
+    data = _PNG_CACHE.get(key)
+    with span("charts.png", cached=data is not None):
+        if data is None:
+            data = _render_png(wide)
+            _PNG_CACHE.set(key, data)
+    return BytesIO(data)
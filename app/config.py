@@ -17,15 +17,26 @@ class Settings:
     DEFAULT_TICKERS = os.getenv("DEFAULT_TICKERS", "AAPL,MSFT,NVDA")
     DEFAULT_DATE_FROM = os.getenv("DEFAULT_DATE_FROM", "2024-01-01")
     DEFAULT_DATE_TO = os.getenv("DEFAULT_DATE_TO", "2024-12-31")
+    SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "128"))
+    SENTIMENT_CACHE_TTL = float(os.getenv("SENTIMENT_CACHE_TTL", "600"))
 
     RISK_DATA_DIR = _abs(os.getenv("RISK_DATA_DIR"))
     RISK_DEFAULT_ISSUER = os.getenv("RISK_DEFAULT_ISSUER", "AAPL")
     RISK_DEFAULT_YEAR = int(os.getenv("RISK_DEFAULT_YEAR", "2023"))
+    RISK_CACHE_DIR = _abs(os.getenv("RISK_CACHE_DIR"))  # unset = no persistent risk cache
+    RISK_FINGERPRINT_TTL = float(os.getenv("RISK_FINGERPRINT_TTL", "30"))
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0"))  # cosine similarity; 0 = off
+    SEMANTIC_CACHE_MODEL = os.getenv("SEMANTIC_CACHE_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
 
     STRAT_REPORT_DIR = _abs(os.getenv("STRAT_REPORT_DIR", "samples/strategy_reports"))
     STRAT_PANEL_PATH = _abs(os.getenv("STRAT_SENTIMENT_PANEL_PATH", SENTIMENT_PANEL_PATH))
     STRAT_DEFAULT_FACTOR = os.getenv("STRAT_DEFAULT_FACTOR", "SENT_L1")
     STRAT_DEFAULT_HORIZON = int(os.getenv("STRAT_DEFAULT_HORIZON", "1"))
+    JOBS_DB = _abs(os.getenv("JOBS_DB", ".cache/jobs.sqlite"))
+    JOBS_WORKERS = int(os.getenv("JOBS_WORKERS", "2"))
+
+    TRACING = os.getenv("TRACING", "0") == "1"  # export every request's stage timings
+    TRACE_FILE = _abs(os.getenv("TRACE_FILE", ".cache/traces.jsonl"))
 
 
 S = Settings()
@@ -0,0 +1,99 @@
+# research_copilot/app/context.py
+"""
+Per-request configuration for risk queries.
+
+The risk data dir, issuer/year defaults and timeout travel with each request in an immutable
+``RiskContext`` instead of through ``os.environ``, so concurrent requests (threads, Streamlit
+sessions) with different settings cannot see each other's values.
+"""
+
+import os
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Any
+
+from app.backends import accepts
+from app.config import S
+
+# Environment fallback for backends that only read RISK_DATA_DIR from os.environ: calls that
+# need the same value share it, a call needing another value waits until they are done.
+_ENV = threading.Condition()
+_env_users = 0
+_env_dir: str | None = None  # override set by the active calls, None = environment as is
+_env_prev: str | None = None  # RISK_DATA_DIR before the override
+
+
+@dataclass(frozen=True)
+class RiskContext:
+    """
+    Args:
+        data_dir (str, optional): Filings directory the risk backend should read.
+        issuer (str): Issuer used when a request does not name one.
+        year (int): Year used when a request does not name one.
+        timeout (float, optional): Seconds to wait for the risk service; None = client default.
+    """
+
+    data_dir: str | None = None
+    issuer: str = S.RISK_DEFAULT_ISSUER
+    year: int = S.RISK_DEFAULT_YEAR
+    timeout: float | None = None
+
+    @classmethod
+    def from_settings(cls, **overrides: Any) -> "RiskContext":
+        """Context built from ``app.config.S``, with ``overrides`` applied."""
+        return replace(cls(data_dir=S.RISK_DATA_DIR), **overrides)
+
+    def resolve(self, issuer: str | None, year: int | None) -> tuple[str, int]:
+        """Request issuer/year, falling back to this context's defaults."""
+        return (issuer or self.issuer), int(year or self.year)
+
+
+@contextmanager
+def risk_env(data_dir: str | None) -> Iterator[None]:
+    """
+    Exposes ``data_dir`` as RISK_DATA_DIR for the duration of the block, for backends that take
+    no ``data_dir`` argument and read the environment instead.
+
+    Calls that need the same value run concurrently: with no data dir (or the one already in
+    the environment) nothing is changed. A call needing a different value waits until the
+    running ones have finished, so no call observes another request's override. The previous
+    value is restored when the last call sharing an override exits.
+    """
+    global _env_users, _env_dir, _env_prev
+    with _ENV:
+        base = _env_prev if _env_dir is not None else os.environ.get("RISK_DATA_DIR")
+        want = data_dir if data_dir and data_dir != base else None
+        _ENV.wait_for(lambda: _env_users == 0 or _env_dir == want)
+        if _env_users == 0 and want is not None:
+            _env_prev, _env_dir = os.environ.get("RISK_DATA_DIR"), want
+            os.environ["RISK_DATA_DIR"] = want
+        _env_users += 1
+    try:
+        yield
+    finally:
+        with _ENV:
+            _env_users -= 1
+            if _env_users == 0:
+                if _env_dir is not None:
+                    if _env_prev is None:
+                        os.environ.pop("RISK_DATA_DIR", None)
+                    else:
+                        os.environ["RISK_DATA_DIR"] = _env_prev
+                _env_dir = _env_prev = None
+                _ENV.notify_all()
+
+
+def call_risk_backend(risk_summarize: Callable[..., Any], issuer: str, year: int, question: str, ctx: RiskContext) -> Any:
+    """
+    Calls an in-process summarize_risk with the context's data dir and timeout as arguments when
+    its signature accepts them (concurrent calls run in parallel), otherwise through :func:`risk_env`.
+    """
+    kwargs: dict[str, Any] = {"issuer": issuer, "year": int(year), "question": question}
+    if ctx.timeout is not None and accepts(risk_summarize, "timeout"):
+        kwargs["timeout"] = ctx.timeout
+    if accepts(risk_summarize, "data_dir"):
+        return risk_summarize(**kwargs, data_dir=ctx.data_dir)
+    with risk_env(ctx.data_dir):
+        return risk_summarize(**kwargs)
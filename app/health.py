@@ -0,0 +1,217 @@
+# research_copilot/app/health.py
+"""
+Per-service health for the HTTP transport: rolling latency percentiles, a circuit breaker
+and adaptive timeouts.
+
+Every ``MCPClient`` call goes through :meth:`ServiceHealth.call`, which records its outcome:
+
+- latencies of successful calls are kept per endpoint in a rolling window (p50/p95/p99);
+- after ``failures`` consecutive failures (connection errors, timeouts, HTTP 5xx) the circuit
+  opens and calls fail at once with :class:`CircuitOpen` instead of waiting for a dead
+  service; after ``reset_after_s`` one trial call is let through (half-open), which closes
+  the circuit on success and re-opens it on failure;
+- with adaptive timeouts (off by default, ``MCP_ADAPTIVE_TIMEOUTS=1``), once an endpoint has
+  enough samples its timeout is ``p99 * factor`` (at least ``min_timeout_s``, at most the
+  endpoint's default), so a hung server costs seconds rather than the full default timeout.
+  A call that runs into its timeout enters the window at the timeout value, so the learned
+  timeout grows again when the service legitimately slows down.
+
+State is kept per base URL in the process-wide ``HEALTH`` registry, shared by every client
+and Streamlit session.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+BREAKER_FAILURES = int(os.getenv("MCP_BREAKER_FAILURES", "5"))
+BREAKER_RESET_S = float(os.getenv("MCP_BREAKER_RESET_S", "30"))
+ADAPTIVE_TIMEOUTS = os.getenv("MCP_ADAPTIVE_TIMEOUTS", "0") == "1"
+TIMEOUT_P99_FACTOR = float(os.getenv("MCP_TIMEOUT_P99_FACTOR", "3"))
+TIMEOUT_MIN_S = float(os.getenv("MCP_TIMEOUT_MIN_S", "10"))
+LATENCY_WINDOW = int(os.getenv("MCP_LATENCY_WINDOW", "200"))
+
+# Successful calls an endpoint needs before its timeout adapts.
+MIN_SAMPLES = 20
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpen(RuntimeError):
+    """Raised instead of calling a service whose circuit is open."""
+
+    def __init__(self, service: str, retry_in_s: float) -> None:
+        super().__init__(f"{service} service unavailable after repeated failures; retrying in {retry_in_s:.0f}s")
+        self.service, self.retry_in_s = service, retry_in_s
+
+
+def percentile(values: list[float], p: float) -> float | None:
+    """``p``-th percentile (0-100) of ``values``, linearly interpolated like numpy's default."""
+    if not values:
+        return None
+    s = sorted(values)
+    k = (len(s) - 1) * p / 100
+    lo = math.floor(k)
+    return s[lo] + (s[min(lo + 1, len(s) - 1)] - s[lo]) * (k - lo)
+
+
+class Call:
+    """Outcome of one guarded request (see :meth:`ServiceHealth.call`)."""
+
+    __slots__ = ("ok",)
+
+    def __init__(self) -> None:
+        self.ok = True
+
+    def status(self, code: int) -> None:
+        """Server errors count against the service; client errors (4xx) do not."""
+        self.ok = not (isinstance(code, int) and code >= 500)
+
+
+class ServiceHealth:
+    """
+    Args:
+        service (str): Service name, for messages.
+        failures (int): Consecutive failures that open the circuit.
+        reset_after_s (float): Seconds the circuit stays open before a trial call.
+        window (int): Latencies kept per endpoint.
+        factor (float): Adaptive timeout = observed p99 x ``factor``.
+        min_timeout_s (float): Lower bound of the adaptive timeout.
+        clock (callable): Monotonic clock, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        service: str,
+        failures: int = BREAKER_FAILURES,
+        reset_after_s: float = BREAKER_RESET_S,
+        window: int = LATENCY_WINDOW,
+        factor: float = TIMEOUT_P99_FACTOR,
+        min_timeout_s: float = TIMEOUT_MIN_S,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.service = service
+        self.failures, self.reset_after_s, self.window = failures, reset_after_s, window
+        self.factor, self.min_timeout_s = factor, min_timeout_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._latency: dict[str, deque[float]] = {}
+        self.state = CLOSED
+        self.calls = self.errors = self.rejected = self.consecutive = 0
+        self._opened_at = 0.0
+        self._probing = False  # the half-open trial call is in flight
+
+    def _retry_in(self) -> float:
+        return max(0.0, self.reset_after_s - (self._clock() - self._opened_at))
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self.state == OPEN and self._retry_in() > 0:
+                self.rejected += 1
+                raise CircuitOpen(self.service, self._retry_in())
+            if self.state == OPEN:
+                self.state, self._probing = HALF_OPEN, False
+            if self.state == HALF_OPEN:
+                if self._probing:
+                    self.rejected += 1
+                    raise CircuitOpen(self.service, 0.0)
+                self._probing = True
+
+    def _record(self, path: str, latency_s: float, ok: bool, timed_out: bool = False) -> None:
+        with self._lock:
+            self.calls += 1
+            self._probing = False
+            if ok or timed_out:
+                self._latency.setdefault(path, deque(maxlen=self.window)).append(latency_s)
+            if ok:
+                self.consecutive = 0
+                self.state = CLOSED
+            else:
+                self.errors += 1
+                self.consecutive += 1
+                if self.state == HALF_OPEN or self.consecutive >= self.failures:
+                    self.state, self._opened_at = OPEN, self._clock()
+
+    @contextmanager
+    def call(self, path: str, timeout: float | None = None) -> Iterator[Call]:
+        """
+        Wraps one request to ``path``: raises :class:`CircuitOpen` up front while the circuit is
+        open, and records the latency and outcome. An exception in the block is a failure; so is
+        a 5xx passed to ``call.status()``. A failure after ``timeout`` seconds or more is a
+        timeout, recorded in the latency window as ``timeout``.
+        """
+        self._admit()
+        call, t0 = Call(), time.perf_counter()
+        try:
+            yield call
+        except BaseException:
+            elapsed = time.perf_counter() - t0
+            timed_out = timeout is not None and elapsed >= timeout
+            self._record(path, timeout if timed_out else elapsed, False, timed_out)
+            raise
+        self._record(path, time.perf_counter() - t0, call.ok)
+
+    def latencies(self, path: str | None = None) -> list[float]:
+        """Recent latencies (seconds) of ``path``, or of every endpoint: successes and timeouts."""
+        with self._lock:
+            if path is not None:
+                return list(self._latency.get(path, ()))
+            return [x for d in self._latency.values() for x in d]
+
+    def timeout(self, path: str, default: float) -> float:
+        """``default``, or p99 x factor (clamped) once ``path`` has :data:`MIN_SAMPLES` samples."""
+        lat = self.latencies(path)
+        if len(lat) < MIN_SAMPLES:
+            return default
+        return min(default, max(self.min_timeout_s, percentile(lat, 99) * self.factor))
+
+    def snapshot(self) -> dict[str, Any]:
+        """State, counters and latency percentiles (ms) over all endpoints."""
+        lat = self.latencies()
+        with self._lock:
+            ms = {f"p{p}_ms": None if not lat else percentile(lat, p) * 1e3 for p in (50, 95, 99)}
+            return {
+                "service": self.service,
+                "state": self.state,
+                "calls": self.calls,
+                "errors": self.errors,
+                "error_rate": self.errors / self.calls if self.calls else 0.0,
+                "rejected": self.rejected,
+                **ms,
+                "retry_in_s": self._retry_in() if self.state == OPEN else None,
+            }
+
+
+class HealthRegistry:
+    """
+    One :class:`ServiceHealth` per base URL.
+
+    Args:
+        **options: Passed to every ServiceHealth (``failures``, ``reset_after_s``, ...).
+    """
+
+    def __init__(self, **options: Any) -> None:
+        self._options = options
+        self._by_url: dict[str, ServiceHealth] = {}
+        self._lock = threading.Lock()
+
+    def get(self, service: str, url: str) -> ServiceHealth:
+        h = self._by_url.get(url)
+        if h is None:
+            with self._lock:
+                h = self._by_url.setdefault(url, ServiceHealth(service, **self._options))
+        return h
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """url -> :meth:`ServiceHealth.snapshot` for every service called so far."""
+        with self._lock:
+            items = list(self._by_url.items())
+        return {url: h.snapshot() for url, h in items}
+
+
+HEALTH = HealthRegistry()
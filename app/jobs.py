@@ -0,0 +1,231 @@
+# research_copilot/app/jobs.py
+"""
+Background jobs for long-running backtests.
+
+Jobs are rows in a SQLite table (durable across restarts) and run on a bounded thread pool,
+so a backtest no longer holds the Streamlit script thread: the UI submits, gets a job id,
+and polls. States: queued -> running -> done | failed | cancelled. Cancelling a queued job
+removes it from the pool; a running job is cancelled cooperatively (progress callbacks
+raise, and a result that still arrives is discarded).
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from app.config import S
+from app.resources import REGISTRY
+
+STATES = ("queued", "running", "done", "failed", "cancelled")
+FINAL_STATES = frozenset({"done", "failed", "cancelled"})
+
+
+class JobCancelled(Exception):
+    """Raised inside a runner (from :meth:`JobHandle.progress`) once its job is cancelled."""
+
+
+class JobHandle:
+    """What a runner sees of its job: report progress, check for cancellation."""
+
+    def __init__(self, queue: "JobQueue", job_id: str) -> None:
+        self._queue = queue
+        self.id = job_id
+
+    @property
+    def cancelled(self) -> bool:
+        return self.id in self._queue._cancelled
+
+    def progress(self, fraction: float, message: str | None = None) -> None:
+        """Records progress in [0, 1]; raises JobCancelled if the job was cancelled meanwhile."""
+        if self.cancelled:
+            raise JobCancelled(self.id)
+        self._queue._update(self.id, progress=min(max(float(fraction), 0.0), 1.0), message=message)
+
+
+Runner = Callable[[dict, JobHandle], Any]
+
+
+class JobQueue:
+    """
+    Args:
+        db_path (str): SQLite file holding the job table; created if missing.
+        max_workers (int): Jobs running at the same time; the rest wait as ``queued``.
+        runners (dict, optional): kind -> ``fn(params, handle)``; defaults to :data:`RUNNERS`.
+    """
+
+    def __init__(self, db_path: str, max_workers: int = 2, runners: dict[str, Runner] | None = None) -> None:
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.runners = dict(RUNNERS if runners is None else runners)
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="job")
+        self._futures: dict[str, Future] = {}
+        self._cancelled: set[str] = set()
+        self._lock = threading.Lock()
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, kind TEXT, params TEXT, state TEXT, progress REAL, message TEXT,"
+                " result TEXT, error TEXT, submitted REAL, started REAL, finished REAL)"
+            )
+            # a previous process died mid-run: those results are lost, queued jobs are resumed
+            db.execute("UPDATE jobs SET state = 'failed', error = 'interrupted by restart', finished = ? WHERE state = 'running'", (time.time(),))
+            queued = [r[0] for r in db.execute("SELECT id FROM jobs WHERE state = 'queued' ORDER BY submitted")]
+        for job_id in queued:
+            self._schedule(job_id)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.db_path, timeout=30)
+        db.row_factory = sqlite3.Row
+        try:
+            with db:  # commit / rollback
+                yield db
+        finally:
+            db.close()
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        cols = ", ".join(f"{k} = ?" for k in fields)
+        with self._connect() as db:
+            db.execute(f"UPDATE jobs SET {cols} WHERE id = ?", (*fields.values(), job_id))
+
+    def submit(self, kind: str, params: dict) -> str:
+        """Queues a job and returns its id."""
+        if kind not in self.runners:
+            raise ValueError(f"unknown job kind {kind!r}; expected one of {sorted(self.runners)}")
+        job_id = uuid.uuid4().hex[:12]
+        with self._connect() as db:
+            db.execute(
+                "INSERT INTO jobs (id, kind, params, state, progress, submitted) VALUES (?, ?, ?, 'queued', 0, ?)",
+                (job_id, kind, json.dumps(params, default=str), time.time()),
+            )
+        self._schedule(job_id)
+        return job_id
+
+    def _schedule(self, job_id: str) -> None:
+        fut = self._pool.submit(self._run, job_id)
+        with self._lock:
+            self._futures[job_id] = fut
+        fut.add_done_callback(lambda _: self._futures.pop(job_id, None))
+
+    def _run(self, job_id: str) -> None:
+        with self._connect() as db:
+            row = db.execute("SELECT kind, params, state FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None or row["state"] != "queued":
+                return
+            db.execute("UPDATE jobs SET state = 'running', started = ? WHERE id = ?", (time.time(), job_id))
+        handle = JobHandle(self, job_id)
+        try:
+            result = self.runners[row["kind"]](json.loads(row["params"]), handle)
+            if handle.cancelled:
+                raise JobCancelled(job_id)
+            self._update(job_id, state="done", progress=1.0, result=json.dumps(result, default=str), finished=time.time())
+        except JobCancelled:
+            self._update(job_id, state="cancelled", finished=time.time())
+        except Exception as e:
+            self._update(job_id, state="failed", error=f"{type(e).__name__}: {e}", finished=time.time())
+        finally:
+            self._cancelled.discard(job_id)
+
+    def status(self, job_id: str) -> dict | None:
+        """Job row (without the result), or None for an unknown id."""
+        with self._connect() as db:
+            row = db.execute("SELECT id, kind, params, state, progress, message, error, submitted, started, finished FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return None if row is None else {**dict(row), "params": json.loads(row["params"])}
+
+    def result(self, job_id: str) -> Any:
+        """The job's result once it is done, else None."""
+        with self._connect() as db:
+            row = db.execute("SELECT result FROM jobs WHERE id = ? AND state = 'done'", (job_id,)).fetchone()
+        return None if row is None or row[0] is None else json.loads(row[0])
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancels a queued or running job; False if it already finished or does not exist."""
+        status = self.status(job_id)
+        if status is None or status["state"] in FINAL_STATES:
+            return False
+        self._cancelled.add(job_id)
+        with self._lock:
+            fut = self._futures.get(job_id)
+        with self._connect() as db:
+            # a queued job is final right away; a running one when its runner returns
+            db.execute("UPDATE jobs SET state = 'cancelled', finished = ? WHERE id = ? AND state = 'queued'", (time.time(), job_id))
+        if fut is not None and fut.cancel():  # never started
+            self._cancelled.discard(job_id)
+        return True
+
+    def recent(self, limit: int = 20, kind: str | None = None) -> list[dict]:
+        """Most recent jobs first."""
+        sql = "SELECT id, kind, params, state, progress, message, error, submitted, started, finished FROM jobs"
+        args: tuple = ()
+        if kind:
+            sql, args = sql + " WHERE kind = ?", (kind,)
+        with self._connect() as db:
+            rows = db.execute(sql + " ORDER BY submitted DESC LIMIT ?", (*args, limit)).fetchall()
+        return [{**dict(r), "params": json.loads(r["params"])} for r in rows]
+
+    def wait(self, job_id: str, timeout: float | None = None, poll: float = 0.05) -> dict | None:
+        """Blocks until the job reaches a final state (or ``timeout``) and returns its status."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            status = self.status(job_id)
+            if status is None or status["state"] in FINAL_STATES or (deadline is not None and time.monotonic() >= deadline):
+                return status
+            time.sleep(poll)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def _sweep_mode(params: dict, n_jobs: int) -> str:
+    from app import backends
+
+    if params.get("mode"):
+        return params["mode"]
+    if backends.probe("strategy") is not None:
+        return "http"
+    # safe from the queue's worker threads: sweep pools start processes with forkserver/spawn
+    return "process" if n_jobs > 1 else "thread"
+
+
+def run_backtest_job(params: dict, job: JobHandle) -> dict:
+    """
+    Runner for kind ``backtest``: one (factor, horizon, universe, costs_bps) backtest, via the
+    local strategy package when installed, else the strategy service. Returns metrics and curve.
+    """
+    from app.sweep import run_sweep
+
+    spec = {k: params[k] for k in ("factor", "horizon", "universe", "costs_bps")}
+    job.progress(0.0, "running backtest")
+    row = run_sweep([spec], mode=_sweep_mode(params, 1), panel_path=params.get("panel_path")).to_dict("records")[0]
+    if row["error"]:
+        raise RuntimeError(row["error"])
+    metrics = {k: v for k, v in row.items() if k not in (*spec, "equity_curve_path", "error", "elapsed_s", "cached")}
+    return {"metrics": metrics, "equity_curve_path": row["equity_curve_path"], "params": spec}
+
+
+def run_sweep_job(params: dict, job: JobHandle) -> dict:
+    """Runner for kind ``sweep``: ``params["jobs"]`` (see ``app.sweep.grid``), progress per finished backtest."""
+    from app.sweep import run_sweep
+
+    jobs = params["jobs"]
+
+    def progress(done: int, total: int, _row: dict) -> None:
+        job.progress(done / total, f"{done} / {total} backtests")
+
+    df = run_sweep(jobs, mode=_sweep_mode(params, len(jobs)), panel_path=params.get("panel_path"), on_progress=progress)
+    return {"rows": df.to_dict("records")}
+
+
+RUNNERS: dict[str, Runner] = {"backtest": run_backtest_job, "sweep": run_sweep_job}
+
+
+def get_queue() -> JobQueue:
+    """The process-wide queue (``JOBS_DB``, ``JOBS_WORKERS``), shared by every Streamlit session."""
+    return REGISTRY.get("jobs.queue", lambda: JobQueue(S.JOBS_DB, S.JOBS_WORKERS))
@@ -0,0 +1,231 @@
+# research_copilot/app/loadtest.py
+"""
+Replay load test.
+
+Logged queries (JSON lines) are replayed through ``route_query`` and then the routed tool's
+backend: ``MCPClient`` over HTTP (by default against local stub copies of the 8601-8603
+services, with injectable latency and errors), or the in-process public APIs. Requests
+arrive at a fixed or Poisson rate (open loop) or back to back (closed loop), with at most
+``concurrency`` in flight. Latency is measured from each request's scheduled arrival, so
+queueing behind a slow backend shows up in the percentiles.
+
+    python -m app.loadtest queries.jsonl --n 500 --rate 50 --concurrency 8 --latency risk=0.2
+
+The report has one row per tool (plus routing and the total): requests, errors, error rate,
+p50/p95/p99 latency in ms and completed requests per second.
+"""
+
+import argparse
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.config import S
+from app.querylog import load_queries
+from app.router import TOOLS, route_query
+from app.singleflight import SingleFlight
+
+SERVICES = ("sentiment", "risk", "strategy")
+REPORT_COLUMNS = ["tool", "requests", "errors", "error_rate", "p50_ms", "p95_ms", "p99_ms", "throughput_rps"]
+
+Call = Callable[[dict], Any]
+
+
+def http_calls(client: Any) -> dict[str, Call]:
+    """Per-tool calls through ``MCPClient`` (caches should be disabled on ``client``)."""
+    tickers = [t.strip() for t in S.DEFAULT_TICKERS.split(",") if t.strip()]
+    return {
+        "sentiment": lambda _q: client.sentiment_panel_stats(tickers, S.DEFAULT_DATE_FROM, S.DEFAULT_DATE_TO),
+        "risk": lambda q: client.risk_summarize(query=q["query"]),
+        "strategy": lambda _q: client.strategy_last_metrics(),
+    }
+
+
+def api_calls() -> dict[str, Call]:
+    """Per-tool calls through the installed domain packages (see ``app.backends``)."""
+    from app import backends
+    from app.context import RiskContext, call_risk_backend
+
+    tickers = [t.strip() for t in S.DEFAULT_TICKERS.split(",") if t.strip()]
+    ctx = RiskContext.from_settings(data_dir=S.RISK_DATA_DIR)
+    return {
+        "sentiment": lambda _q: backends.get("sentiment", "panel_stats")(tickers, S.DEFAULT_DATE_FROM, S.DEFAULT_DATE_TO),
+        "risk": lambda q: call_risk_backend(backends.get("risk", "summarize_risk"), ctx.issuer, ctx.year, q["query"], ctx),
+        "strategy": lambda _q: backends.get("strategy", "last_metrics")(),
+    }
+
+
+def _arrivals(n: int, rate: float | None, poisson: bool, seed: int) -> np.ndarray:
+    """Scheduled start offsets (s): all zero for a closed loop, else spaced at ``rate``/s."""
+    if not rate:
+        return np.zeros(n)
+    if poisson:
+        return np.cumsum(np.random.default_rng(seed).exponential(1 / rate, n)) - 1 / rate
+    return np.arange(n) / rate
+
+
+def run_load(
+    queries: list[dict], calls: dict[str, Call], n: int | None = None, concurrency: int = 8, rate: float | None = None, poisson: bool = False, seed: int = 0
+) -> pd.DataFrame:
+    """
+    Replays ``queries`` (cycled up to ``n`` requests) and returns one row per request:
+    tool, ok, error, route_ms (routing) and latency_ms (scheduled arrival to response).
+
+    Args:
+        queries (list): Records from ``app.querylog.load_queries``.
+        calls (dict): tool -> ``fn(record)``, e.g. :func:`http_calls` or :func:`api_calls`.
+        n (int, optional): Requests to send; defaults to one pass over ``queries``.
+        concurrency (int): Requests in flight at most.
+        rate (float, optional): Arrivals per second; None sends back to back (closed loop).
+        poisson (bool): Exponential inter-arrival times instead of a fixed interval.
+        seed (int): Seed for the arrival process.
+    """
+    if not queries:
+        raise ValueError("no queries to replay")
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be >= 1, got {concurrency}")
+    n = len(queries) if n is None else n
+    offsets = _arrivals(n, rate, poisson, seed)
+    gate = threading.BoundedSemaphore(concurrency)
+    rows: list[dict | None] = [None] * n
+
+    def one(i: int, q: dict, scheduled: float) -> None:
+        tool, route_ms, error = None, np.nan, None  # routing failures only count in the total
+        try:
+            t0 = time.perf_counter()
+            tool, _, _ = route_query(q["query"], q.get("tool"))
+            route_ms = (time.perf_counter() - t0) * 1e3
+            calls[tool](q)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            rows[i] = {"tool": tool, "ok": error is None, "error": error, "route_ms": route_ms, "latency_ms": (time.perf_counter() - scheduled) * 1e3}
+            gate.release()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as ex:
+        for i in range(n):
+            scheduled = start + offsets[i]
+            if (wait := scheduled - time.perf_counter()) > 0:
+                time.sleep(wait)
+            gate.acquire()  # closed loop: the next request waits for a free slot
+            if not rate:
+                scheduled = time.perf_counter()
+            ex.submit(one, i, queries[i % len(queries)], scheduled)
+    wall = time.perf_counter() - start
+    df = pd.DataFrame(rows)
+    df.attrs["wall_s"] = wall
+    return df
+
+
+def _summary(tool: str, latency_ms: pd.Series, ok: pd.Series, wall_s: float) -> dict:
+    p50, p95, p99 = np.percentile(latency_ms, [50, 95, 99]) if len(latency_ms) else (np.nan,) * 3
+    errors = int((~ok).sum())
+    return {
+        "tool": tool,
+        "requests": len(ok),
+        "errors": errors,
+        "error_rate": errors / len(ok) if len(ok) else 0.0,
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "p99_ms": p99,
+        "throughput_rps": int(ok.sum()) / wall_s if wall_s else np.nan,
+    }
+
+
+def report(results: pd.DataFrame) -> pd.DataFrame:
+    """Per-tool latency percentiles, error rate and throughput, plus ``router`` and ``total`` rows."""
+    wall = results.attrs.get("wall_s", 0.0)
+    rows = [_summary(tool, g["latency_ms"], g["ok"], wall) for tool, g in results.groupby("tool", sort=False)]
+    rows.sort(key=lambda r: r["tool"])
+    routed = results["route_ms"].notna()
+    rows.append(_summary("router", results.loc[routed, "route_ms"], routed, wall))
+    rows.append(_summary("total", results["latency_ms"], results["ok"], wall))
+    return pd.DataFrame(rows, columns=REPORT_COLUMNS)
+
+
+def _per_service(values: list[str], default: float) -> dict[str, float]:
+    # "0.05" applies to every service, "risk=0.2" to one
+    out = dict.fromkeys(SERVICES, default)
+    for v in values:
+        name, _, val = v.rpartition("=")
+        for svc in [name] if name else SERVICES:
+            if svc not in SERVICES:
+                raise ValueError(f"unknown service {svc!r}; expected one of {SERVICES}")
+            out[svc] = float(val)
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[1], formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("log", help="JSON-lines query log")
+    ap.add_argument("--n", type=int, help="requests to send (cycles the log); default one pass")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--rate", type=float, help="arrivals per second; omit for a closed loop")
+    ap.add_argument("--poisson", action="store_true", help="exponential inter-arrival times")
+    ap.add_argument("--target", choices=("stub", "http", "api"), default="stub", help="local stubs, the *_BASE_URL services, or the in-process packages")
+    ap.add_argument("--latency", action="append", default=[], metavar="[SERVICE=]SECONDS", help="stub latency, e.g. 0.02 or risk=0.3 (repeatable)")
+    ap.add_argument("--jitter", action="append", default=[], metavar="[SERVICE=]SECONDS", help="extra uniform stub latency")
+    ap.add_argument("--error-rate", action="append", default=[], metavar="[SERVICE=]SHARE", help="share of stub requests answered 503")
+    ap.add_argument("--stub-ports", action="store_true", help="bind the stubs to 8601-8603 instead of free ports")
+    ap.add_argument("--coalesce", action="store_true", help="join identical in-flight HTTP calls (app.singleflight) instead of sending each")
+    ap.add_argument("--out", help="write the per-request results to this CSV")
+    ap.add_argument("--max-p99-ms", type=float, help="exit 1 if any tool's p99 exceeds this")
+    ap.add_argument("--max-error-rate", type=float, help="exit 1 if any tool's error rate exceeds this")
+    args = ap.parse_args(argv)
+
+    queries = load_queries(args.log)
+    unknown = {q["tool"] for q in queries if q["tool"] and q["tool"].lower() not in TOOLS}
+    if unknown:
+        ap.error(f"unknown tool(s) in log: {sorted(unknown)}")
+    flight = None
+    with ExitStack() as stack:
+        if args.target == "api":
+            calls = api_calls()
+        else:
+            from app.mcp_client import MCPClient
+            from app.stub_server import StubServer
+
+            base_urls = None
+            if args.target == "stub":
+                try:
+                    latency, jitter, errors = (_per_service(v, 0.0) for v in (args.latency, args.jitter, args.error_rate))
+                except ValueError as e:
+                    ap.error(str(e))
+                base_urls = {}
+                for port, svc in enumerate(SERVICES, 8601):
+                    srv = StubServer(latency[svc], port if args.stub_ports else 0, jitter=jitter[svc], error_rate=errors[svc])
+                    base_urls[svc] = stack.enter_context(srv).url
+            flight = SingleFlight() if args.coalesce else None
+            client = MCPClient(base_urls=base_urls, pool_size=args.concurrency, cache=None, risk_cache=None, semantic_cache=None, single_flight=flight)
+            calls = http_calls(stack.enter_context(client))
+        results = run_load(queries, calls, args.n, args.concurrency, args.rate, args.poisson)
+
+    rep = report(results)
+    print(f"{len(results):,} requests in {results.attrs['wall_s']:.2f}s ({args.target}, concurrency {args.concurrency}, rate {args.rate or 'closed loop'})")
+    print(rep.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+    if flight is not None:
+        fs = flight.stats()
+        print(f"coalesced: {fs['coalesced']:,} of {fs['coalesced'] + fs['executions']:,} HTTP calls joined an identical call in flight")
+    if args.out:
+        results.to_csv(args.out, index=False)
+    tools = rep[~rep["tool"].isin(["router", "total"])]
+    failed = []
+    if args.max_p99_ms is not None:
+        failed += [f"{t}: p99 {v:.1f} ms > {args.max_p99_ms:g} ms" for t, v in zip(tools["tool"], tools["p99_ms"], strict=True) if v > args.max_p99_ms]
+    if args.max_error_rate is not None:
+        failed += [f"{t}: error rate {v:.1%} > {args.max_error_rate:.1%}" for t, v in zip(tools["tool"], tools["error_rate"], strict=True) if v > args.max_error_rate]
+    for msg in failed:
+        print(f"FAIL {msg}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
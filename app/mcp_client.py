@@ -1,8 +1,24 @@
 import os
+import time
+from collections.abc import Callable, Iterator
+from contextlib import nullcontext
 from typing import Any
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app import wire
+from app.cache import TTLCache, panel_stats_key
+from app.config import S
+from app.context import RiskContext
+from app.health import ADAPTIVE_TIMEOUTS, HEALTH, Call, HealthRegistry
+from app.risk_cache import RISK_CACHE, RiskCache
+from app.semantic_cache import SEMANTIC_CACHE, SemanticCache
+from app.singleflight import SINGLE_FLIGHT, SingleFlight
+from app.streaming import Event, collect, iter_sse, payload_events
+from app.tracing import span
 
 load_dotenv()
 
@@ -10,52 +26,287 @@ SENT_URL = os.getenv("SENTIMENT_BASE_URL", "http://localhost:8601")
 RISK_URL = os.getenv("RISK_BASE_URL", "http://localhost:8602")
 STRAT_URL = os.getenv("STRATEGY_BASE_URL", "http://localhost:8603")
 
+# Connection pooling: one keep-alive pool per service.
+POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", "10"))
+RETRIES = int(os.getenv("MCP_RETRIES", "0"))
+BACKOFF = float(os.getenv("MCP_BACKOFF", "0.3"))
+# panel_stats series encoding to ask for: "arrow" (columnar, JSON fallback) or "json"
+WIRE = os.getenv("MCP_WIRE", "arrow")
+
+# Default per-call timeouts (seconds); with adaptive timeouts, upper bounds (see app.health).
+TIMEOUTS = {"panel_stats": 60, "summarize_risk": 120, "last_metrics": 30, "run_backtest": 180}
+
+# Only these methods are retried; POSTs may trigger expensive server-side work.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+
+def _make_session(pool_size: int, retries: int, backoff: float) -> requests.Session:
+    """
+    Builds a keep-alive session whose adapter holds up to ``pool_size`` connections.
+
+    Retries (with exponential backoff) apply to connection errors and 502/503/504
+    responses on idempotent methods only.
+    """
+    retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=(502, 503, 504), allowed_methods=IDEMPOTENT_METHODS, raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    s = requests.Session()
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
 
 class MCPClient:
-    def sentiment_panel_stats(self, tickers: list, date_from: str, date_to: str) -> Any:
+    """
+    HTTP client for the sentiment, risk and strategy services.
+
+    Each service gets its own pooled ``requests.Session`` so TCP connections are reused
+    across calls instead of being opened per request.
+
+    Args:
+        pool_size (int, optional): Max kept-alive connections per service. Defaults to ``MCP_POOL_SIZE``.
+        retries (int, optional): Retries for idempotent calls. Defaults to ``MCP_RETRIES`` (0 = off).
+        backoff (float, optional): Backoff factor between retries. Defaults to ``MCP_BACKOFF``.
+        base_urls (dict, optional): Per-service URL overrides, keyed by "sentiment", "risk", "strategy".
+        cache (TTLCache, optional): Cache for sentiment_panel_stats results; none by default.
+            Pass ``SENTIMENT_CACHE`` to share the process-wide cache with run_sentiment.
+        risk_cache (RiskCache, optional): Persistent cache for risk_summarize results, keyed on
+            the request's data dir. Defaults to ``RISK_CACHE`` (None unless RISK_CACHE_DIR is set).
+        wire (str, optional): "arrow" or "json" for panel_stats series. Defaults to ``MCP_WIRE``.
+        semantic_cache (SemanticCache, optional): Near-duplicate question cache consulted after
+            ``risk_cache``. Defaults to ``SEMANTIC_CACHE`` (None unless SEMANTIC_CACHE_THRESHOLD > 0).
+        health (HealthRegistry, optional): Latency / circuit-breaker state per service. Defaults
+            to the process-wide ``HEALTH``; pass None to disable.
+        adaptive_timeouts (bool, optional): Shorten default timeouts to the observed p99 x factor.
+            Defaults to ``MCP_ADAPTIVE_TIMEOUTS`` (off). Explicit ``timeout`` arguments are always kept.
+        single_flight (SingleFlight, optional): Joins identical calls already in flight (from any
+            client in the process) instead of repeating them. Defaults to ``SINGLE_FLIGHT``; None disables.
+    """
+
+    def __init__(
+        self,
+        pool_size: int | None = None,
+        retries: int | None = None,
+        backoff: float | None = None,
+        base_urls: dict[str, str] | None = None,
+        cache: TTLCache | None = None,
+        risk_cache: RiskCache | None = RISK_CACHE,
+        semantic_cache: SemanticCache | None = SEMANTIC_CACHE,
+        wire: str | None = None,
+        health: HealthRegistry | None = HEALTH,
+        adaptive_timeouts: bool | None = None,
+        single_flight: SingleFlight | None = SINGLE_FLIGHT,
+    ) -> None:
+        self.base_urls = {"sentiment": SENT_URL, "risk": RISK_URL, "strategy": STRAT_URL, **(base_urls or {})}
+        self.pool_size = POOL_SIZE if pool_size is None else pool_size
+        self.retries = RETRIES if retries is None else retries
+        self.backoff = BACKOFF if backoff is None else backoff
+        self._sessions: dict[str, requests.Session] = {}
+        self.cache = cache
+        self.risk_cache = risk_cache
+        self.semantic_cache = semantic_cache
+        self.wire = WIRE if wire is None else wire
+        self.health = health
+        self.adaptive_timeouts = ADAPTIVE_TIMEOUTS if adaptive_timeouts is None else adaptive_timeouts
+        self.single_flight = single_flight
+
+    def session(self, service: str) -> requests.Session:
+        """Returns the pooled session for ``service``, creating it on first use."""
+        s = self._sessions.get(service)
+        if s is None:
+            s = self._sessions[service] = _make_session(self.pool_size, self.retries, self.backoff)
+        return s
+
+    def _guard(self, service: str, path: str, timeout: float | None = None) -> Any:
+        """Circuit breaker and latency recording for one call (no-op without a registry)."""
+        return self.health.get(service, self.base_urls[service]).call(path, timeout) if self.health is not None else nullcontext(Call())
+
+    def _timeout(self, service: str, path: str, default: float) -> float:
+        """``default``, or the adaptive timeout learned for this endpoint."""
+        if self.health is None or not self.adaptive_timeouts:
+            return default
+        return self.health.get(service, self.base_urls[service]).timeout(path, default)
+
+    def _once(self, key: tuple, fn: Callable[[], Any]) -> Any:
+        return fn() if self.single_flight is None else self.single_flight.do(("http", *key), fn)
+
+    def _request(self, service: str, method: str, path: str, timeout: float, json: dict | None = None, headers: dict | None = None) -> Any:
+        s = self.session(service)
+        url = f"{self.base_urls[service]}{path}"
+        with span(f"http.{service}", method=method, path=path) as sp:
+            with self._guard(service, path, timeout) as call:
+                r = s.get(url, timeout=timeout, headers=headers) if method == "GET" else s.post(url, json=json, timeout=timeout, headers=headers)
+                call.status(r.status_code)
+            if sp is not None:
+                sp.set(status=r.status_code)
+            r.raise_for_status()
+        ctype = wire.media_type(r.headers.get("Content-Type"))
+        with span("http.decode", content_type=ctype or "unknown"):
+            if ctype == wire.ARROW_STREAM:
+                return wire.decode_panel_stats(r.content)
+            return r.json()
+
+    def close(self) -> None:
+        """Closes every pooled connection."""
+        for s in self._sessions.values():
+            s.close()
+        self._sessions.clear()
+
+    def __enter__(self) -> "MCPClient":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def sentiment_panel_stats(self, tickers: list, date_from: str, date_to: str, timeout: float | None = None) -> Any:
         """
         Fetches sentiment panel statistics for the given tickers and date range.
+        Results are cached per (service, tickers, dates, panel file version). ``series`` is a
+        DataFrame (see :func:`app.wire.series_frame`) whether it came as Arrow or JSON.
 
         Args:
             tickers (list): List of ticker symbols.
             date_from (str): Start date in YYYY-MM-DD format.
             date_to (str): End date in YYYY-MM-DD format.
+            timeout (float, optional): Seconds to wait. Defaults to 60, or the adaptive timeout.
 
         Returns:
-            dict: JSON response containing panel statistics.
+            dict: Response containing panel statistics and the daily series.
         """
-        r = requests.post(f"{SENT_URL}/panel_stats", json={"tickers": tickers, "date_from": date_from, "date_to": date_to}, timeout=60)
-        r.raise_for_status()
-        return r.json()
+        key = (self.base_urls["sentiment"], *panel_stats_key(tickers, date_from, date_to, S.SENTIMENT_PANEL_PATH))
+        if self.cache is not None and (hit := self.cache.get(key)) is not None:
+            return hit
+        body = {"tickers": tickers, "date_from": date_from, "date_to": date_to}
+        headers = {"Accept": wire.accept_header(self.wire)}
+        timeout = timeout or self._timeout("sentiment", "/panel_stats", TIMEOUTS["panel_stats"])
+
+        def fetch() -> Any:
+            res = self._request("sentiment", "POST", "/panel_stats", timeout=timeout, json=body, headers=headers)
+            if isinstance(res, dict) and isinstance(res.get("series"), list):
+                res = {**res, "series": wire.series_frame(res["series"])}
+            if self.cache is not None:
+                self.cache.set(key, res)
+            return res
+
+        return self._once((*key, self.wire), fetch)
 
-    def risk_summarize(self, issuer: str, year: int, query: str = "top risks") -> Any:
+    def risk_summarize(
+        self, issuer: str | None = None, year: int | None = None, query: str = "top risks", timeout: float | None = None, ctx: RiskContext | None = None
+    ) -> Any:
         """
         Summarizes risk information for a given issuer and year.
+        Served from the persistent risk cache when the filings have not changed, or from the
+        semantic cache when a similar question was already answered for this issuer/year.
 
         Args:
-            issuer (str): The issuer's name or identifier.
-            year (int): The year for risk summarization.
+            issuer (str, optional): The issuer's name or identifier. Defaults to ``ctx.issuer``.
+            year (int, optional): The year for risk summarization. Defaults to ``ctx.year``.
             query (str, optional): The risk query to execute. Defaults to "top risks".
+            timeout (float, optional): Seconds to wait. Defaults to ``ctx.timeout``, then 120 or the adaptive timeout.
+            ctx (RiskContext, optional): Per-request data dir, defaults and timeout. When given
+                with a data dir, it is sent to the service as ``data_dir``. Defaults to settings.
 
         Returns:
             dict: JSON response containing summarized risk data.
         """
-        r = requests.post(f"{RISK_URL}/summarize_risk", json={"issuer": issuer, "year": year, "query": query}, timeout=120)
-        r.raise_for_status()
-        return r.json()
+        issuer, year, body, timeout, data_dir = self._risk_request(issuer, year, query, timeout, ctx)
+        if (hit := self._cached_risk(issuer, year, query, data_dir)) is not None:
+            return hit
+        timeout = timeout or self._timeout("risk", "/summarize_risk", TIMEOUTS["summarize_risk"])
+
+        def summarize() -> Any:
+            t0 = time.perf_counter()
+            res = self._request("risk", "POST", "/summarize_risk", timeout=timeout, json=body)
+            self._store_risk(issuer, year, query, data_dir, res, time.perf_counter() - t0)
+            return res
+
+        return self._once((self.base_urls["risk"], "/summarize_risk", issuer, year, query, data_dir), summarize)
 
-    def strategy_last_metrics(self) -> Any:
+    def risk_summarize_stream(
+        self, issuer: str | None = None, year: int | None = None, query: str = "top risks", timeout: float | None = None, ctx: RiskContext | None = None
+    ) -> Iterator[Event]:
+        """
+        Streaming variant of :meth:`risk_summarize`: yields ``(event, data)`` pairs as the
+        server sends them (see :mod:`app.streaming`), so sources and categories can be shown
+        before the summary is complete. Servers that answer plain JSON are replayed as events.
+
+        The last event is ``("metrics", {...})`` with ``ttfb_s`` (request to response headers),
+        ``ttft_s`` (request to first summary token), ``total_s`` and ``cached``.
+
+        Args:
+            issuer (str, optional): The issuer's name or identifier. Defaults to ``ctx.issuer``.
+            year (int, optional): The year for risk summarization. Defaults to ``ctx.year``.
+            query (str, optional): The risk query to execute. Defaults to "top risks".
+            timeout (float, optional): Seconds to wait between bytes. Defaults to ``ctx.timeout``, then 120.
+            ctx (RiskContext, optional): Per-request settings, as in :meth:`risk_summarize`.
+        """
+        t0 = time.perf_counter()
+        issuer, year, body, timeout, data_dir = self._risk_request(issuer, year, query, timeout, ctx)
+        timeout = timeout or TIMEOUTS["summarize_risk"]  # between bytes: not adapted to whole-call latency
+        if (hit := self._cached_risk(issuer, year, query, data_dir)) is not None:
+            yield from payload_events(hit)
+            yield "metrics", {"ttfb_s": 0.0, "ttft_s": 0.0, "total_s": time.perf_counter() - t0, "cached": True}
+            return
+        url = f"{self.base_urls['risk']}/summarize_risk"
+        headers = {"Accept": "text/event-stream"}
+        seen: list[Event] = []
+        ttft, done = None, False
+        with span("http.risk", method="POST", path="/summarize_risk", stream=True), self._guard("risk", "/summarize_risk (stream)") as call:  # until the response headers
+            resp = self.session("risk").post(url, json=body, headers=headers, stream=True, timeout=timeout)
+            call.status(resp.status_code)
+        with resp as r:
+            r.raise_for_status()
+            ttfb = time.perf_counter() - t0
+            streamed = r.headers.get("Content-Type", "").startswith("text/event-stream")
+            events = iter_sse(r.iter_lines()) if streamed else payload_events(r.json())
+            for event, data in events:
+                if event == "token" and ttft is None:
+                    ttft = time.perf_counter() - t0
+                done = done or event == "done"
+                seen.append((event, data))
+                yield event, data
+        total = time.perf_counter() - t0
+        if done:  # a stream cut short (no "done" event) must not be cached as the answer
+            self._store_risk(issuer, year, query, data_dir, collect(seen), total)
+        yield "metrics", {"ttfb_s": ttfb, "ttft_s": total if ttft is None else ttft, "total_s": total, "cached": False}
+
+    @staticmethod
+    def _risk_request(issuer: str | None, year: int | None, query: str, timeout: float | None, ctx: RiskContext | None) -> tuple[str, int, dict, float | None, str | None]:
+        """Resolves (issuer, year, request body, timeout or None for the default, data dir) for one risk call."""
+        body_dir = ctx.data_dir if ctx is not None else None
+        ctx = ctx or RiskContext.from_settings()
+        issuer, year = ctx.resolve(issuer, year)
+        body: dict[str, Any] = {"issuer": issuer, "year": year, "query": query}
+        if body_dir:
+            body["data_dir"] = body_dir
+        return issuer, year, body, timeout or ctx.timeout, ctx.data_dir
+
+    def _cached_risk(self, issuer: str, year: int, query: str, data_dir: str | None) -> Any:
+        if self.risk_cache is not None and (hit := self.risk_cache.get(issuer, year, query, data_dir)) is not None:
+            return hit
+        if self.semantic_cache is not None:
+            return self.semantic_cache.lookup(issuer, year, query, data_dir)
+        return None
+
+    def _store_risk(self, issuer: str, year: int, query: str, data_dir: str | None, res: Any, latency_s: float) -> None:
+        if self.risk_cache is not None:
+            self.risk_cache.put(issuer, year, query, data_dir, res)
+        if self.semantic_cache is not None:
+            self.semantic_cache.store(issuer, year, query, res, latency_s, data_dir)
+
+    def strategy_last_metrics(self, timeout: float | None = None) -> Any:
         """
         Fetches the latest strategy metrics.
 
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to 30, or the adaptive timeout.
+
         Returns:
             dict: JSON response containing the latest strategy metrics.
         """
-        r = requests.get(f"{STRAT_URL}/last_metrics", timeout=30)
-        r.raise_for_status()
-        return r.json()
+        timeout = timeout or self._timeout("strategy", "/last_metrics", TIMEOUTS["last_metrics"])
+        return self._once((self.base_urls["strategy"], "/last_metrics"), lambda: self._request("strategy", "GET", "/last_metrics", timeout=timeout))
 
-    def strategy_run_backtest(self, factor: str = "SENT_L1", horizon: int = 1, universe: str = "SP500", costs_bps: int = 10) -> Any:
+    def strategy_run_backtest(self, factor: str = "SENT_L1", horizon: int = 1, universe: str = "SP500", costs_bps: int = 10, timeout: float | None = None) -> Any:
         """
         Runs a backtest for a given strategy factor and parameters.
 
@@ -64,10 +315,12 @@ class MCPClient:
             horizon (int): The investment horizon in days. Defaults to 1.
             universe (str): The universe of securities. Defaults to "SP500".
             costs_bps (int): Transaction costs in basis points. Defaults to 10.
+            timeout (float, optional): Seconds to wait. Defaults to 180, or the adaptive timeout.
 
         Returns:
             dict: JSON response containing backtest results.
         """
-        r = requests.post(f"{STRAT_URL}/run_backtest", json={"factor": factor, "horizon": horizon, "universe": universe, "costs_bps": costs_bps}, timeout=180)
-        r.raise_for_status()
-        return r.json()
+        body = {"factor": factor, "horizon": horizon, "universe": universe, "costs_bps": costs_bps}
+        timeout = timeout or self._timeout("strategy", "/run_backtest", TIMEOUTS["run_backtest"])
+        key = (self.base_urls["strategy"], "/run_backtest", factor, int(horizon), universe, float(costs_bps))
+        return self._once(key, lambda: self._request("strategy", "POST", "/run_backtest", timeout=timeout, json=body))
@@ -0,0 +1,348 @@
+# research_copilot/app/notebook.py
+"""
+Headless "Research Notebook" export.
+
+Queries from a JSON-lines log (see ``app.querylog``) are routed with ``route_query`` and
+run through the same tool functions as the UI (``app.tools``, so the process-wide caches
+and backtest store are shared), with at most ``concurrency`` queries in flight. Each result
+is written as soon as it completes to any of:
+
+- ``notebook.md``: one section per query, charts under ``assets/``;
+- ``notebook.ipynb``: the same sections as Markdown cells (nbformat 4);
+- ``results.parquet``: one row per query, written in row groups of ``batch_rows``.
+
+Nothing is kept per query once it is written, so memory does not grow with the log.
+
+    python -m app.notebook queries.jsonl --out reports/nightly --concurrency 8
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+from typing import Any, ClassVar
+
+import pandas as pd
+
+from app.config import S
+from app.context import RiskContext
+from app.querylog import iter_queries
+from app.risk_cache import RISK_CACHE
+from app.router import route_query
+from app.strategy_store import STRATEGY_STORE
+from app.symbols import SymbolIndex, get_index
+from app.tools import STRAT_DEF_COSTS, STRAT_DEF_UNIVERSE, run_risk, run_sentiment, run_strategy
+
+FORMATS = ("md", "ipynb", "parquet")
+VIAS = ("api", "http")
+
+ToolCall = Callable[[dict], dict]
+
+
+def _tickers(q: dict) -> str:
+    t = q.get("tickers", S.DEFAULT_TICKERS)
+    return ",".join(t) if isinstance(t, list | tuple) else str(t)
+
+
+def tool_calls(via: str = "api", client: Any = None) -> dict[str, ToolCall]:
+    """
+    tool -> ``fn(query record)`` returning the result fields written per query.
+
+    Args:
+        via (str): "api" for the in-process packages (``app.backends``), "http" for the services.
+        client (MCPClient, optional): Client for "http"; a new one is created if omitted.
+    """
+    if via not in VIAS:
+        raise ValueError(f"via must be one of {VIAS}, got {via!r}")
+    if via == "http":
+        from app.mcp_client import MCPClient
+
+        client = client or MCPClient()
+
+        def sentiment_fn():
+            return client.sentiment_panel_stats
+
+        def strategy_fns():
+            return client.strategy_last_metrics, client.strategy_run_backtest
+
+    else:
+        from app import backends
+
+        def sentiment_fn():
+            return backends.get("sentiment", "panel_stats")
+
+        def risk_fn():
+            return backends.get("risk", "summarize_risk")
+
+        def strategy_fns():
+            return backends.get("strategy", "last_metrics"), backends.get("strategy", "run_backtest_from_panel")
+
+    def with_entities(q: dict) -> tuple[dict, SymbolIndex]:
+        # tickers / issuer / year named in the query text fill the fields the record leaves out
+        index = get_index(S.SENTIMENT_PANEL_PATH, S.RISK_DATA_DIR)
+        found = index.extract(q["query"])
+        extra = {"tickers": list(found.tickers), "issuer": found.tickers[0]} if found.tickers else {}
+        if found.years:
+            extra["year"] = found.years[0]
+        return {**extra, **q}, index
+
+    def sentiment(q: dict) -> dict:
+        q, index = with_entities(q)
+        stats, img, df = run_sentiment(
+            sentiment_fn(), _tickers(q), q.get("date_from", S.DEFAULT_DATE_FROM), q.get("date_to", S.DEFAULT_DATE_TO), S.SENTIMENT_PANEL_PATH, index=index
+        )
+        return {"stats": stats, "series_rows": len(df), "chart_png": img() if img else None}
+
+    def risk(q: dict) -> dict:
+        q, index = with_entities(q)
+        ctx = RiskContext(data_dir=S.RISK_DATA_DIR, issuer=q.get("issuer", S.RISK_DEFAULT_ISSUER), year=int(q.get("year", S.RISK_DEFAULT_YEAR)))
+        if via == "http":
+            # ctx.data_dir is sent with the request; the client checks the risk caches itself
+            payload = client.risk_summarize(index.resolve(ctx.issuer, "issuer").symbol, ctx.year, q["query"], ctx=ctx)
+            summary, categories, sources = payload.get("summary", "(no summary)"), pd.DataFrame(payload.get("categories", [])), payload.get("sources", [])
+        else:
+            summary, categories, sources = run_risk(risk_fn(), None, None, q["query"], cache=RISK_CACHE, ctx=ctx, index=index)
+        return {"summary": summary, "categories": categories.to_dict("records"), "sources": sources}
+
+    def strategy(q: dict) -> dict:
+        last_metrics, run_backtest = strategy_fns()
+        factor, horizon = q.get("factor", S.STRAT_DEFAULT_FACTOR), int(q.get("horizon", S.STRAT_DEFAULT_HORIZON))
+        universe, costs = q.get("universe", STRAT_DEF_UNIVERSE), float(q.get("costs_bps", STRAT_DEF_COSTS))
+        metrics, curve = run_strategy(last_metrics, run_backtest, factor, horizon, S.STRAT_PANEL_PATH, universe, costs, store=STRATEGY_STORE)
+        return {"metrics": metrics, "equity_curve_path": curve}
+
+    return {"sentiment": sentiment, "risk": risk, "strategy": strategy}
+
+
+def run_query(n: int, q: dict, calls: dict[str, ToolCall]) -> dict:
+    """Routes and runs one query; failures are returned as ``status="error"`` records."""
+    t0 = time.perf_counter()
+    tool, conf, reason = route_query(q["query"], q.get("tool"))
+    rec = {"n": n, "query": q["query"], "tool": tool, "confidence": conf, "reason": reason, "status": "ok", "error": None}
+    try:
+        rec.update(calls[tool](q))
+    except Exception as e:
+        rec.update(status="error", error=f"{type(e).__name__}: {e}")
+    rec["elapsed_s"] = time.perf_counter() - t0
+    return rec
+
+
+def _md_table(rows: list[dict]) -> str:
+    if not rows:
+        return "_(none)_\n"
+    cols = list(dict.fromkeys(k for r in rows for k in r))
+    lines = ["| " + " | ".join(cols) + " |", "|" + "---|" * len(cols)]
+    lines += ["| " + " | ".join(str(r.get(c, "")).replace("|", "\\|").replace("\n", " ") for c in cols) + " |" for r in rows]
+    return "\n".join(lines) + "\n"
+
+
+def markdown(rec: dict) -> str:
+    """One query's section (heading, routing line, tool output)."""
+    out = [f"## {rec['n'] + 1}. {rec['query']}\n", f"*{rec['tool']}* (confidence {rec['confidence']:.2f}) · {rec['elapsed_s']:.2f}s\n"]
+    if rec["status"] == "error":
+        out.append(f"> **Error:** {rec['error']}\n")
+    elif rec["tool"] == "sentiment":
+        out.append(_md_table([rec["stats"]]) if rec.get("stats") else "_(no stats)_\n")
+        if rec.get("chart"):
+            out.append(f"![sentiment]({rec['chart']})\n")
+    elif rec["tool"] == "risk":
+        out += [(rec.get("summary") or "(no summary)") + "\n", "**Categories**\n", _md_table(rec.get("categories") or []), "**Sources**\n"]
+        out += [f"- `{json.dumps(s, default=str)}`" for s in rec.get("sources") or []] + [""]
+    else:
+        out.append(_md_table([rec["metrics"]]) if rec.get("metrics") else "_(no metrics)_\n")
+        if rec.get("equity_curve_path"):
+            out.append(f"![equity curve]({Path(rec['equity_curve_path']).as_posix()})\n")
+    return "\n".join(out) + "\n"
+
+
+class MarkdownWriter:
+    def __init__(self, path: Path, title: str) -> None:
+        self._f = open(path, "w", encoding="utf-8")  # noqa: SIM115 - closed by close()
+        self._f.write(f"# {title}\n\n")
+
+    def write(self, rec: dict) -> None:
+        self._f.write(markdown(rec))
+        self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class NotebookWriter:
+    """nbformat 4 notebook written cell by cell: the JSON is streamed, never held as a whole."""
+
+    def __init__(self, path: Path, title: str) -> None:
+        self._f = open(path, "w", encoding="utf-8")  # noqa: SIM115 - closed by close()
+        self._f.write('{"cells": [\n')
+        self._write_cell("title", f"# {title}\n")
+
+    def _write_cell(self, cell_id: str, text: str) -> None:
+        cell = {"cell_type": "markdown", "id": cell_id, "metadata": {}, "source": text.splitlines(keepends=True)}
+        self._f.write(("" if cell_id == "title" else ",\n") + json.dumps(cell))
+
+    def write(self, rec: dict) -> None:
+        self._write_cell(f"q{rec['n']}", markdown(rec))
+        self._f.flush()
+
+    def close(self) -> None:
+        meta = {"kernelspec": {"display_name": "Python 3", "language": "python", "name": "python3"}, "language_info": {"name": "python"}}
+        self._f.write(f'\n], "metadata": {json.dumps(meta)}, "nbformat": 4, "nbformat_minor": 5}}\n')
+        self._f.close()
+
+
+class ParquetWriter:
+    """One row per query; nested fields as JSON strings. Rows are flushed every ``batch_rows``."""
+
+    SCALARS: ClassVar[dict[str, str]] = {
+        "n": "int64",
+        "query": "string",
+        "tool": "string",
+        "confidence": "float64",
+        "reason": "string",
+        "status": "string",
+        "error": "string",
+        "elapsed_s": "float64",
+    }
+    EXTRA: ClassVar[dict[str, str]] = {"summary": "string", "series_rows": "int64", "chart": "string", "equity_curve_path": "string"}
+    NESTED = ("stats", "categories", "sources", "metrics")
+
+    def __init__(self, path: Path, batch_rows: int = 256) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        fields = [pa.field(k, getattr(pa, t)()) for k, t in {**self.SCALARS, **self.EXTRA}.items()] + [pa.field(k, pa.string()) for k in self.NESTED]
+        self._schema = pa.schema(fields)
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._batch_rows = batch_rows
+        self._rows: list[dict] = []
+
+    def write(self, rec: dict) -> None:
+        row = {k: rec.get(k) for k in (*self.SCALARS, *self.EXTRA)}
+        row.update({k: None if rec.get(k) is None else json.dumps(rec[k], default=str) for k in self.NESTED})
+        self._rows.append(row)
+        if len(self._rows) >= self._batch_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._rows:
+            self._writer.write_table(self._pa.Table.from_pylist(self._rows, schema=self._schema))
+            self._rows = []
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+def _save_chart(rec: dict, assets: Path) -> dict:
+    png = rec.pop("chart_png", None)
+    if png:
+        assets.mkdir(exist_ok=True)
+        name = f"{rec['n']:06d}_sentiment.png"
+        (assets / name).write_bytes(png)
+        rec["chart"] = f"{assets.name}/{name}"
+    return rec
+
+
+def export(
+    queries: Iterable[dict],
+    out_dir: str,
+    formats: Iterable[str] = FORMATS,
+    concurrency: int = 4,
+    calls: dict[str, ToolCall] | None = None,
+    title: str = "Research notebook",
+    on_result: Callable[[dict], None] | None = None,
+) -> dict:
+    """
+    Runs every query and streams the results into ``out_dir``. Results are written in
+    completion order; ``n`` (shown as the section number) is the query's position in the log.
+
+    Args:
+        queries (iterable): Query records, e.g. ``app.querylog.iter_queries(path)``; consumed lazily.
+        out_dir (str): Bundle directory, created if missing.
+        formats (iterable): Any of "md", "ipynb", "parquet".
+        concurrency (int): Queries running at once (at most twice that are submitted).
+        calls (dict, optional): tool -> ``fn(record)``; defaults to :func:`tool_calls` ("api").
+        title (str): Notebook heading.
+        on_result (callable, optional): Called with each record after it is written.
+
+    Returns:
+        dict: {"queries", "ok", "errors", "elapsed_s", "files"}.
+    """
+    formats = list(formats)
+    if bad := sorted(set(formats) - set(FORMATS)):
+        raise ValueError(f"unknown format(s) {bad}; expected any of {FORMATS}")
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be >= 1, got {concurrency}")
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    calls = calls or tool_calls()
+    files = {"md": out / "notebook.md", "ipynb": out / "notebook.ipynb", "parquet": out / "results.parquet"}
+    counts = {"queries": 0, "ok": 0, "errors": 0}
+    t0 = time.perf_counter()
+
+    with ExitStack() as stack, ThreadPoolExecutor(concurrency, thread_name_prefix="notebook") as ex:
+        writers = []
+        for fmt in formats:
+            w = MarkdownWriter(files[fmt], title) if fmt == "md" else NotebookWriter(files[fmt], title) if fmt == "ipynb" else ParquetWriter(files[fmt])
+            stack.callback(w.close)
+            writers.append(w)
+
+        def emit(done: Iterable[Future]) -> None:
+            for fut in done:
+                rec = _save_chart(fut.result(), out / "assets")
+                for w in writers:
+                    w.write(rec)
+                counts["queries"] += 1
+                counts["ok" if rec["status"] == "ok" else "errors"] += 1
+                if on_result:
+                    on_result(rec)
+
+        pending: set[Future] = set()
+        for n, q in enumerate(queries):
+            if len(pending) >= 2 * concurrency:  # bounded: the log is never read ahead further
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                emit(done)
+            pending.add(ex.submit(run_query, n, q, calls))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            emit(done)
+
+    return {**counts, "elapsed_s": time.perf_counter() - t0, "files": [str(files[f]) for f in formats]}
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Run a query log headlessly and export a research notebook bundle.")
+    ap.add_argument("log", help="JSON-lines query log")
+    ap.add_argument("--out", default=f"reports/notebook-{datetime.now():%Y%m%d-%H%M%S}", help="bundle directory")
+    ap.add_argument("--formats", default=",".join(FORMATS), help="comma-separated: md, ipynb, parquet")
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--via", choices=VIAS, default="api", help="in-process packages or the *_BASE_URL services")
+    ap.add_argument("--title", default="Research notebook")
+    args = ap.parse_args(argv)
+
+    def progress(rec: dict) -> None:
+        if rec["status"] == "error":
+            print(f"[{rec['n'] + 1}] {rec['tool']}: {rec['error']}", file=sys.stderr)
+
+    with ExitStack() as stack:
+        client = None
+        if args.via == "http":
+            from app.mcp_client import MCPClient
+
+            client = stack.enter_context(MCPClient(pool_size=args.concurrency))
+        try:
+            summary = export(iter_queries(args.log), args.out, args.formats.split(","), args.concurrency, tool_calls(args.via, client), args.title, progress)
+        except ValueError as e:
+            ap.error(str(e))
+    print(f"{summary['queries']:,} queries ({summary['errors']:,} failed) in {summary['elapsed_s']:.1f}s -> " + ", ".join(summary["files"]))
+    return 1 if summary["queries"] and not summary["ok"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
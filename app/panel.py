@@ -0,0 +1,139 @@
+# research_copilot/app/panel.py
+"""
+Selective reads of the parquet sentiment panel.
+
+The file is memory-mapped, only the needed columns are decoded, and row groups whose
+min/max statistics cannot match the ticker/date filters are skipped entirely, so the cost
+of a query follows the size of the selection rather than the size of the panel.
+"""
+
+import datetime as dt
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from app.tracing import span
+
+PANEL_COLUMNS = ("date", "ticker", "avg_sentiment")
+
+
+def open_panel(path: str) -> pq.ParquetFile:
+    """Opens the panel memory-mapped; only the footer is read here."""
+    return pq.ParquetFile(path, memory_map=True)
+
+
+def can_serve(path: str | None, columns: tuple[str, ...] = PANEL_COLUMNS) -> bool:
+    """True if ``path`` is a local parquet file that has every column in ``columns``."""
+    if not path or not Path(path).is_file():
+        return False
+    try:
+        names = set(pq.read_schema(path, memory_map=True).names)
+    except (OSError, pa.ArrowInvalid):
+        return False
+    return set(columns) <= names
+
+
+def _as_type(value: str, typ: pa.DataType, end: bool = False) -> object:
+    """Converts a YYYY-MM-DD bound to the python type parquet statistics use for ``typ``."""
+    if pa.types.is_timestamp(typ):
+        ts = pd.Timestamp(value)
+        if typ.tz is not None:
+            ts = ts.tz_localize(typ.tz)
+        return (ts + pd.Timedelta(days=1)).to_pydatetime() if end else ts.to_pydatetime()
+    if pa.types.is_date(typ):
+        return dt.date.fromisoformat(value)
+    return value
+
+
+def _date_filter(col: pa.ChunkedArray, date_from: str | None, date_to: str | None) -> pa.ChunkedArray | None:
+    mask = None
+    if date_from:
+        mask = pc.greater_equal(col, pa.scalar(_as_type(date_from, col.type), col.type))
+    if date_to:
+        # timestamps: strictly before the next midnight; dates/strings: inclusive
+        hi = pa.scalar(_as_type(date_to, col.type, end=True), col.type)
+        upper = pc.less(col, hi) if pa.types.is_timestamp(col.type) else pc.less_equal(col, hi)
+        mask = upper if mask is None else pc.and_(mask, upper)
+    return mask
+
+
+def select_row_groups(pf: pq.ParquetFile, tickers: list[str] | None = None, date_from: str | None = None, date_to: str | None = None) -> list[int]:
+    """
+    Indices of the row groups whose ticker/date statistics overlap the filters.
+    Row groups without statistics are always kept.
+    """
+    schema = pf.schema_arrow
+    names = schema.names
+    ticker_idx = names.index("ticker") if "ticker" in names else None
+    date_idx = names.index("date") if "date" in names else None
+    lo = _as_type(date_from, schema.field("date").type) if date_from and date_idx is not None else None
+    hi = _as_type(date_to, schema.field("date").type, end=True) if date_to and date_idx is not None else None
+    hi_open = date_idx is not None and pa.types.is_timestamp(schema.field("date").type)  # hi is the next midnight
+    wanted = sorted(tickers) if tickers else None
+
+    keep = []
+    for i in range(pf.metadata.num_row_groups):
+        rg = pf.metadata.row_group(i)
+        if wanted and ticker_idx is not None:
+            st = rg.column(ticker_idx).statistics
+            if st is not None and st.has_min_max and not any(st.min <= t <= st.max for t in wanted):
+                continue
+        if date_idx is not None and (lo is not None or hi is not None):
+            st = rg.column(date_idx).statistics
+            if st is not None and st.has_min_max:
+                before = lo is not None and st.max < lo
+                after = hi is not None and (st.min >= hi if hi_open else st.min > hi)
+                if before or after:
+                    continue
+        keep.append(i)
+    return keep
+
+
+def read_table(path: str, tickers: list[str] | None = None, date_from: str | None = None, date_to: str | None = None, columns: tuple[str, ...] = PANEL_COLUMNS) -> pa.Table:
+    """
+    Reads ``columns`` for the given tickers and date range as an Arrow table.
+
+    Args:
+        path (str): Parquet panel path.
+        tickers (list, optional): Tickers to keep; all if omitted.
+        date_from (str, optional): Inclusive start date, YYYY-MM-DD.
+        date_to (str, optional): Inclusive end date, YYYY-MM-DD.
+        columns (tuple): Columns to decode.
+
+    Returns:
+        pa.Table: The matching rows only.
+    """
+    pf = open_panel(path)
+    cols = [c for c in columns if c in pf.schema_arrow.names]
+    groups = select_row_groups(pf, tickers, date_from, date_to)
+    with span("panel.read", row_groups=len(groups), of=pf.num_row_groups):
+        table = pf.read_row_groups(groups, columns=cols) if groups else pf.schema_arrow.empty_table().select(cols)
+    mask = pc.is_in(table["ticker"], value_set=pa.array(list(tickers), table.schema.field("ticker").type)) if tickers and "ticker" in cols else None
+    if "date" in cols and (dmask := _date_filter(table["date"], date_from, date_to)) is not None:
+        mask = dmask if mask is None else pc.and_(mask, dmask)
+    return table.filter(mask) if mask is not None else table
+
+
+def read_panel(
+    path: str, tickers: list[str] | None = None, date_from: str | None = None, date_to: str | None = None, columns: tuple[str, ...] = PANEL_COLUMNS
+) -> pd.DataFrame:
+    """Same as :func:`read_table`, returned as a DataFrame."""
+    return read_table(path, tickers, date_from, date_to, columns).to_pandas()
+
+
+def panel_stats(path: str, tickers: list[str], date_from: str, date_to: str) -> dict:
+    """
+    Same payload shape as the sentiment service's panel_stats, computed from a pruned read.
+
+    Returns:
+        dict: {"stats": {"avg_sentiment", "n_news"}, "series": [{"date", "ticker", "avg_sentiment"}, ...]}
+    """
+    df = read_panel(path, tickers, date_from, date_to)
+    if df.empty:
+        return {"stats": {"avg_sentiment": None, "n_news": 0}, "series": []}
+    df["date"] = pd.to_datetime(df["date"]).dt.strftime("%Y-%m-%d")
+    daily = df.groupby(["date", "ticker"], as_index=False, sort=True)["avg_sentiment"].mean()
+    return {"stats": {"avg_sentiment": float(df["avg_sentiment"].mean()), "n_news": len(df)}, "series": daily.to_dict("records")}
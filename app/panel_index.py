@@ -0,0 +1,206 @@
+# research_copilot/app/panel_index.py
+"""
+Materialized daily (ticker, date) aggregates of the sentiment panel.
+
+The store lives next to the panel as ``<panel>.daily/``: parquet parts holding
+``ticker, date, sum, count`` sorted by ticker and date, plus ``meta.json`` recording which
+panel row groups have been folded in and the panel's size and mtime. Row groups are identified
+by their footer metadata (row count, column chunk offsets and sizes, min/max statistics), so
+checking the indexed prefix reads no data. When rows are appended to the panel (new row
+groups), only those row groups are read and aggregated into a new part; a rewritten panel
+triggers a full rebuild. A rewrite leaving every one of those footer fields unchanged is not
+detected; delete the store to force a rebuild. Because sum/count are additive, parts never
+need merging to answer a query, and they are compacted once there are more than ``MAX_PARTS``.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from app import panel
+
+VALUE_COLUMNS = ("avg_sentiment", "sentiment", "score")
+MAX_PARTS = 16
+ROW_GROUP_SIZE = 64_000
+
+_locks: dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def store_dir(panel_path: str) -> Path:
+    """Directory of the aggregate store for ``panel_path``."""
+    p = Path(panel_path)
+    return p.with_name(p.name + ".daily")
+
+
+def value_column(panel_path: str) -> str | None:
+    """The sentiment column the store aggregates, or None if the panel has none."""
+    names = set(pq.read_schema(panel_path, memory_map=True).names)
+    return next((c for c in VALUE_COLUMNS if c in names), None) if {"date", "ticker"} <= names else None
+
+
+def can_index(panel_path: str | None) -> bool:
+    """True if ``panel_path`` is a local parquet panel with date, ticker and a sentiment column."""
+    return panel.can_serve(panel_path, ("date", "ticker")) and value_column(panel_path) is not None
+
+
+def _lock(path: Path) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(str(path), threading.Lock())
+
+
+def _file_sig(panel_path: str) -> list[int]:
+    st = os.stat(panel_path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _row_group_sig(pf: pq.ParquetFile) -> list[list]:
+    """
+    Per row group, from the footer alone: row count, byte size, and each column chunk's offsets,
+    sizes and min/max/null-count statistics. No data pages are read, so checking the indexed
+    prefix costs nothing however large the panel grows.
+    """
+    md, sig = pf.metadata, []
+    for i in range(md.num_row_groups):
+        rg = md.row_group(i)
+        cols = []
+        for j in range(rg.num_columns):
+            cc = rg.column(j)
+            st = cc.statistics
+            stats = [str(st.min), str(st.max), st.null_count] if st is not None and st.has_min_max else None
+            cols.append([cc.dictionary_page_offset, cc.data_page_offset, cc.total_compressed_size, cc.total_uncompressed_size, stats])
+        sig.append([rg.num_rows, rg.total_byte_size, cols])
+    return sig
+
+
+def _to_day(col: pa.ChunkedArray) -> pa.ChunkedArray:
+    if pa.types.is_date32(col.type):
+        return col
+    if pa.types.is_timestamp(col.type):
+        return pc.cast(pc.floor_temporal(col, unit="day"), pa.date32())
+    # ISO strings, possibly with a time part
+    return pc.cast(pc.strptime(pc.utf8_slice_codeunits(col, 0, 10), format="%Y-%m-%d", unit="s"), pa.date32())
+
+
+def _aggregate(pf: pq.ParquetFile, groups: list[int], value_col: str) -> pa.Table:
+    """Daily sum/count per (ticker, date) over ``groups``, one row group at a time."""
+    partials = []
+    for i in groups:
+        t = pf.read_row_group(i, columns=["date", "ticker", value_col])
+        t = pa.table({"ticker": pc.cast(t["ticker"], pa.string()), "date": _to_day(t["date"]), "v": pc.cast(t[value_col], pa.float64())})
+        partials.append(t.group_by(["ticker", "date"]).aggregate([("v", "sum"), ("v", "count")]))
+    if not partials:
+        return pa.table({"ticker": pa.array([], pa.string()), "date": pa.array([], pa.date32()), "sum": pa.array([], pa.float64()), "count": pa.array([], pa.int64())})
+    merged = pa.concat_tables(partials).group_by(["ticker", "date"]).aggregate([("v_sum", "sum"), ("v_count", "sum")])
+    return _sorted(merged.select(["ticker", "date", "v_sum_sum", "v_count_sum"]).rename_columns(["ticker", "date", "sum", "count"]))
+
+
+def _sorted(t: pa.Table) -> pa.Table:
+    return t.sort_by([("ticker", "ascending"), ("date", "ascending")])
+
+
+def _write_part(d: Path, n: int, table: pa.Table) -> str:
+    name = f"part-{n:05d}.parquet"
+    tmp = d / f".{name}.tmp"
+    pq.write_table(table, tmp, row_group_size=ROW_GROUP_SIZE)
+    os.replace(tmp, d / name)
+    return name
+
+
+def _write_meta(d: Path, meta: dict) -> None:
+    tmp = d / ".meta.json.tmp"
+    tmp.write_text(json.dumps(meta))
+    os.replace(tmp, d / "meta.json")
+
+
+def _read_meta(d: Path) -> dict | None:
+    try:
+        return json.loads((d / "meta.json").read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def update(panel_path: str) -> dict:
+    """
+    Brings the store up to date with the panel and returns its metadata.
+
+    Nothing is read if the panel's size and mtime are unchanged. Otherwise the footer is
+    compared with the indexed row groups and only row groups added since the last update are
+    read and aggregated; if an already-indexed row group changed, the store is rebuilt from
+    scratch.
+    """
+    d = store_dir(panel_path)
+    with _lock(d):
+        fsig = _file_sig(panel_path)
+        meta = _read_meta(d)
+        if meta is not None and meta.get("file") == fsig:
+            return meta
+        pf = panel.open_panel(panel_path)
+        sig = _row_group_sig(pf)
+        vcol = value_column(panel_path)
+        done = len(meta["row_groups"]) if meta else 0
+        if meta is None or meta.get("value_col") != vcol or meta["row_groups"] != sig[:done]:
+            for f in d.glob("part-*.parquet"):
+                f.unlink()
+            d.mkdir(exist_ok=True)
+            meta = {"value_col": vcol, "row_groups": [], "parts": [], "next_part": 0}
+            done = 0
+        if done == len(sig):
+            meta["file"] = fsig
+            _write_meta(d, meta)
+            return meta
+
+        new = _aggregate(pf, list(range(done, len(sig))), vcol)
+        meta["parts"].append(_write_part(d, meta["next_part"], new))
+        meta["next_part"] += 1
+        if len(meta["parts"]) > MAX_PARTS:
+            meta = _compact(d, meta)
+        meta["row_groups"], meta["file"] = sig, fsig
+        _write_meta(d, meta)
+        return meta
+
+
+def _compact(d: Path, meta: dict) -> dict:
+    tables = [pq.read_table(d / p, memory_map=True) for p in meta["parts"]]
+    merged = pa.concat_tables(tables).group_by(["ticker", "date"]).aggregate([("sum", "sum"), ("count", "sum")])
+    merged = _sorted(merged.select(["ticker", "date", "sum_sum", "count_sum"]).rename_columns(["ticker", "date", "sum", "count"]))
+    name = _write_part(d, meta["next_part"], merged)
+    for p in meta["parts"]:
+        (d / p).unlink(missing_ok=True)
+    return {**meta, "parts": [name], "next_part": meta["next_part"] + 1}
+
+
+def query(panel_path: str, tickers: list[str] | None, date_from: str | None, date_to: str | None) -> pa.Table:
+    """Daily ``ticker, date, sum, count`` rows for the selection, read from the store."""
+    d = store_dir(panel_path)
+    meta = update(panel_path)
+    cols = ("date", "ticker", "sum", "count")
+    tables = [panel.read_table(str(d / p), tickers, date_from, date_to, cols) for p in meta["parts"]]
+    tables = [t for t in tables if t.num_rows]
+    if not tables:
+        return pa.table({"date": pa.array([], pa.date32()), "ticker": pa.array([], pa.string()), "sum": pa.array([], pa.float64()), "count": pa.array([], pa.int64())})
+    t = pa.concat_tables(tables)
+    if len(tables) > 1:
+        t = t.group_by(["date", "ticker"]).aggregate([("sum", "sum"), ("count", "sum")])
+        t = t.select(["date", "ticker", "sum_sum", "count_sum"]).rename_columns(["date", "ticker", "sum", "count"])
+    return t.sort_by([("date", "ascending"), ("ticker", "ascending")])
+
+
+def panel_stats(panel_path: str, tickers: list[str], date_from: str, date_to: str) -> dict:
+    """
+    Same payload shape as the sentiment service's panel_stats, served from the store.
+
+    Returns:
+        dict: {"stats": {"avg_sentiment", "n_news"}, "series": [{"date", "ticker", "avg_sentiment"}, ...]}
+    """
+    t = query(panel_path, tickers, date_from, date_to)
+    if not t.num_rows:
+        return {"stats": {"avg_sentiment": None, "n_news": 0}, "series": []}
+    total, n = pc.sum(t["sum"]).as_py(), pc.sum(t["count"]).as_py()
+    series = pa.table({"date": pc.strftime(t["date"], format="%Y-%m-%d"), "ticker": t["ticker"], "avg_sentiment": pc.divide(t["sum"], pc.cast(t["count"], pa.float64()))})
+    return {"stats": {"avg_sentiment": total / n if n else None, "n_news": n}, "series": series.to_pylist()}
@@ -0,0 +1,39 @@
+# research_copilot/app/querylog.py
+"""
+JSON-lines query logs, as replayed by ``app.loadtest`` and exported by ``app.notebook``.
+
+One object per line. The query text is the first of ``query``, ``q``, ``question`` or
+``title``; ``tool`` forces a route, and per-query tool inputs (``PARAMS``) override the
+defaults. Lines are read lazily, so a log of any size streams in constant memory.
+"""
+
+import json
+from collections.abc import Iterator
+
+QUERY_FIELDS = ("query", "q", "question", "title")  # first one present is the query text
+PARAMS = ("tickers", "date_from", "date_to", "issuer", "year", "factor", "horizon", "universe", "costs_bps")
+
+
+def iter_queries(path: str) -> Iterator[dict]:
+    """
+    Yields ``{"query", "tool", **params}`` per line with query text; other lines are skipped.
+
+    Raises:
+        ValueError: On a line that is not valid JSON (with its line number).
+    """
+    with open(path, encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{n}: not valid JSON ({e.msg})") from e
+            text = next((rec[k] for k in QUERY_FIELDS if isinstance(rec.get(k), str) and rec[k].strip()), None)
+            if text is not None:
+                yield {"query": text, "tool": rec.get("tool"), **{k: rec[k] for k in PARAMS if rec.get(k) is not None}}
+
+
+def load_queries(path: str) -> list[dict]:
+    """All of :func:`iter_queries`, as a list."""
+    return list(iter_queries(path))
@@ -0,0 +1,117 @@
+# research_copilot/app/resources.py
+"""
+Process-wide registry of heavy objects (backend modules, the symbol index, the job queue).
+
+Streamlit re-executes the UI script on every rerun and for every session, but modules under
+``app`` are imported once per process, so objects held here are loaded once and shared by
+all analysts. Each resource is created lazily by its loader under a per-resource lock.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+
+def rss_bytes() -> int | None:
+    """Resident set size of this process, or None where it cannot be read cheaply."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024  # peak, not current
+    except ImportError:  # Windows
+        return None
+
+
+class _Entry:
+    def __init__(self, loader: Callable[[], Any]) -> None:
+        self.loader = loader
+        self.lock = threading.Lock()
+        self.value: Any = None
+        self.loaded = False
+        self.load_time_s: float | None = None
+        self.rss_delta_bytes: int | None = None
+        self.loaded_at: float | None = None
+        self.hits = 0
+
+
+class ResourceRegistry:
+    """
+    Named, lazily loaded, shared resources.
+
+    Example:
+        REGISTRY.register("risk.embedder", lambda: SentenceTransformer(name))
+        model = REGISTRY.get("risk.embedder")  # loaded on first call only
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        """Declares a resource; registering an existing name keeps the loaded value."""
+        with self._lock:
+            if name not in self._entries:
+                self._entries[name] = _Entry(loader)
+
+    def get(self, name: str, loader: Callable[[], Any] | None = None) -> Any:
+        """
+        Returns the resource, loading it on first use. Concurrent first calls load it once.
+
+        Args:
+            name (str): Resource name.
+            loader (callable, optional): Registers the resource if it is not known yet.
+        """
+        if loader is not None:
+            self.register(name, loader)
+        entry = self._entries[name]
+        if not entry.loaded:
+            with entry.lock:
+                if not entry.loaded:
+                    rss0, t0 = rss_bytes(), time.perf_counter()
+                    entry.value = entry.loader()
+                    entry.load_time_s = time.perf_counter() - t0
+                    rss1 = rss_bytes()
+                    entry.rss_delta_bytes = rss1 - rss0 if rss0 is not None and rss1 is not None else None
+                    entry.loaded_at = time.time()
+                    entry.loaded = True
+                    return entry.value
+        with entry.lock:
+            entry.hits += 1
+            return entry.value
+
+    def evict(self, name: str | None = None) -> None:
+        """
+        Drops the loaded value of ``name`` (or of every resource); the next get() reloads it.
+        Used to rebuild values whose inputs changed. It does not reclaim memory of imported
+        modules, which stay in ``sys.modules``.
+        """
+        with self._lock:
+            entries = [self._entries[name]] if name else list(self._entries.values())
+        for e in entries:
+            with e.lock:
+                e.value, e.loaded = None, False
+                e.load_time_s = e.rss_delta_bytes = e.loaded_at = None
+                e.hits = 0
+
+    def is_loaded(self, name: str) -> bool:
+        e = self._entries.get(name)
+        return bool(e and e.loaded)
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Per-resource load state, load time, memory delta at load (RSS) and reuse count."""
+        return [
+            {"name": n, "loaded": e.loaded, "load_time_s": e.load_time_s, "rss_delta_mb": None if e.rss_delta_bytes is None else e.rss_delta_bytes / 2**20, "hits": e.hits}
+            for n, e in sorted(self._entries.items())
+        ]
+
+
+REGISTRY = ResourceRegistry()
@@ -0,0 +1,144 @@
+# research_copilot/app/risk_cache.py
+"""
+Persistent cache of summarize_risk results.
+
+Entries are keyed by issuer, year, normalized question and a fingerprint of the risk data
+directory (relative path, size and mtime of every file), so they survive restarts and stop
+matching as soon as a filing is added or changed. Results are only cached when the data
+directory is available locally; without it changes could not be detected.
+
+The SQLite file is created on first use, not at import: if the cache dir cannot be created or
+opened (read-only working directory, locked file), the cache turns itself off and every call
+behaves as a miss.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from app.cache import TTLCache
+from app.config import S
+
+# Walking a large data dir on every request would defeat the cache; re-check at most this often.
+_FINGERPRINTS = TTLCache(maxsize=16, ttl=S.RISK_FINGERPRINT_TTL)
+
+
+def normalize_question(q: str) -> str:
+    """Lowercases, collapses whitespace and drops surrounding punctuation."""
+    return re.sub(r"\s+", " ", (q or "").lower()).strip(" ?!.,;:")
+
+
+def data_dir_fingerprint(data_dir: str | None) -> str | None:
+    """Content fingerprint of ``data_dir``, or None if it is not a local directory."""
+    if not data_dir or not os.path.isdir(data_dir):
+        return None
+    fp = _FINGERPRINTS.get(data_dir)
+    if fp is None:
+        h = hashlib.sha256()
+        for root, dirs, files in os.walk(data_dir):
+            dirs.sort()
+            for name in sorted(files):
+                p = os.path.join(root, name)
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                h.update(f"{os.path.relpath(p, data_dir)}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+        fp = h.hexdigest()
+        _FINGERPRINTS.set(data_dir, fp)
+    return fp
+
+
+class RiskCache:
+    """
+    SQLite-backed summarize_risk cache.
+
+    Args:
+        cache_dir (str): Directory holding ``risk_cache.sqlite``; created on first use.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.path = str(Path(cache_dir) / "risk_cache.sqlite")
+        self.hits = 0
+        self.misses = 0
+        self.error: str | None = None  # why the cache is off, once opening it failed
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def _open(self) -> bool:
+        """Creates the dir and table on first call; False (cache off) if that fails."""
+        if self._ready or self.error is not None:
+            return self._ready
+        with self._lock:
+            if not self._ready and self.error is None:
+                try:
+                    Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                    with self._connect() as db:
+                        db.execute("PRAGMA journal_mode=WAL")
+                        db.execute(
+                            "CREATE TABLE IF NOT EXISTS risk_summaries "
+                            "(key TEXT PRIMARY KEY, issuer TEXT, year INTEGER, question TEXT, fingerprint TEXT, payload TEXT, created REAL)"
+                        )
+                        db.execute("CREATE INDEX IF NOT EXISTS risk_issuer_year ON risk_summaries (issuer, year)")
+                    self._ready = True
+                except (OSError, sqlite3.Error) as e:
+                    self.error = f"{type(e).__name__}: {e}"
+        return self._ready
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:  # commit / rollback
+                yield db
+        finally:
+            db.close()
+
+    @staticmethod
+    def key(issuer: str, year: int, question: str, fingerprint: str) -> str:
+        raw = json.dumps([issuer.strip().upper(), int(year), normalize_question(question), fingerprint])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, issuer: str, year: int, question: str, data_dir: str | None) -> dict | None:
+        """Cached payload, or None on a miss, when the data dir cannot be fingerprinted or the cache is off."""
+        fp = data_dir_fingerprint(data_dir)
+        if fp is None or not self._open():
+            return None
+        with self._connect() as db:
+            row = db.execute("SELECT payload FROM risk_summaries WHERE key = ?", (self.key(issuer, year, question, fp),)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, issuer: str, year: int, question: str, data_dir: str | None, payload: Any) -> None:
+        """Stores ``payload`` and drops entries for the same issuer/year built from older filings."""
+        fp = data_dir_fingerprint(data_dir)
+        if fp is None or not self._open():
+            return
+        iss = issuer.strip().upper()
+        with self._connect() as db:
+            db.execute("DELETE FROM risk_summaries WHERE issuer = ? AND year = ? AND fingerprint != ?", (iss, int(year), fp))
+            db.execute(
+                "INSERT OR REPLACE INTO risk_summaries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.key(issuer, year, question, fp), iss, int(year), normalize_question(question), fp, json.dumps(payload), time.time()),
+            )
+
+    def stats(self) -> dict[str, int]:
+        if not self._open():
+            return {"hits": self.hits, "misses": self.misses, "size": 0}
+        with self._connect() as db:
+            (size,) = db.execute("SELECT COUNT(*) FROM risk_summaries").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "size": size}
+
+
+RISK_CACHE = RiskCache(S.RISK_CACHE_DIR) if S.RISK_CACHE_DIR else None
@@ -1,4 +1,9 @@
 # research_copilot/app/router.py
+import re
+from collections.abc import Iterable
+from functools import lru_cache
+
+from app.tracing import span
 
 INTENT_RULES = [
     ("risk", ["risk", "10-k", "item 1a", "regulatory", "liquidity", "cybersecurity", "credit", "counterparty"]),
@@ -6,22 +11,85 @@ INTENT_RULES = [
     ("strategy", ["sharpe", "backtest", "ic", "returns", "equity curve", "performance", "alpha"]),
 ]
 
+TOOLS = {tool for tool, _ in INTENT_RULES}
 
-def route_query(q: str, override: str | None = None) -> tuple[str, float, str]:
+# Minimum share of matched keywords for a tool to be part of a multi-tool plan.
+PLAN_THRESHOLD = 0.2
+
+
+def compile_rules(rules: list[tuple[str, list[str]]]) -> tuple[re.Pattern, dict[str, str]]:
     """
-    Returns: (tool_name, confidence, reason)
-    tool_name ∈ {"sentiment","risk","strategy"}
+    Compiles intent rules into one word-boundary-aware alternation and a keyword -> tool map.
+
+    Keywords match whole words only (so "ic" does not fire inside "critical"), with an
+    optional plural "s" ("risks" counts as "risk"). Longer keywords are tried first.
     """
-    if override and override.lower() in {"sentiment", "risk", "strategy"}:
-        return override.lower(), 1.0, f"Forced tool = {override}"
+    kw_tool = {kw: tool for tool, kws in rules for kw in kws}
+    alt = "|".join(re.escape(kw) for kw in sorted(kw_tool, key=len, reverse=True))
+    return re.compile(rf"\b({alt})s?\b"), kw_tool
+
 
-    ql = (q or "").lower()
+_KEYWORD_RE, _KEYWORD_TOOL = compile_rules(INTENT_RULES)
+
+
+def _keyword_scores(q: str) -> dict[str, int]:
+    """Number of distinct keywords matched per tool, in INTENT_RULES order."""
+    return _scores_from_hits(frozenset(_KEYWORD_RE.findall((q or "").lower())))
+
+
+def _scores_from_hits(hits: frozenset[str]) -> dict[str, int]:
     scores = {tool: 0 for tool, _ in INTENT_RULES}
-    for tool, kws in INTENT_RULES:
-        scores[tool] = sum(1 for kw in kws if kw in ql)
+    for kw in hits:
+        scores[_KEYWORD_TOOL[kw]] += 1
+    return scores
 
+
+@lru_cache(maxsize=4096)
+def _route_hits(hits: frozenset[str]) -> tuple[str, float, str]:
+    # Routing depends only on which keywords matched, and there are few distinct hit sets.
+    scores = _scores_from_hits(hits)
     tool = max(scores, key=lambda t: scores[t])
     nonzero = sum(1 for v in scores.values() if v > 0)
     conf = (scores[tool] / max(1, nonzero)) if nonzero else 0.0
     reason = f"Matched {scores[tool]} keywords for '{tool}'."
     return tool, conf, reason
+
+
+def route_query(q: str, override: str | None = None) -> tuple[str, float, str]:
+    """
+    Returns: (tool_name, confidence, reason)
+    tool_name ∈ {"sentiment","risk","strategy"}
+    """
+    with span("router.route_query"):
+        if override and override.lower() in TOOLS:
+            return override.lower(), 1.0, f"Forced tool = {override}"
+        return _route_hits(frozenset(_KEYWORD_RE.findall((q or "").lower())))
+
+
+def route_queries(batch: Iterable[str], override: str | None = None) -> list[tuple[str, float, str]]:
+    """
+    Routes a batch of queries (e.g. an offline query log); same output as route_query per item.
+    """
+    if override and override.lower() in TOOLS:
+        return [route_query("", override) for _ in batch]
+    findall = _KEYWORD_RE.findall
+    return [_route_hits(frozenset(findall(q.lower() if q else ""))) for q in batch]
+
+
+def route_plan(q: str, override: str | None = None, threshold: float = PLAN_THRESHOLD) -> list[tuple[str, float, str]]:
+    """
+    Returns every tool whose share of matched keywords is >= threshold, best first.
+
+    Returns: [(tool_name, confidence, reason), ...] with confidences summing to <= 1.
+    Falls back to the single route_query answer when an override is given or nothing matched.
+    """
+    with span("router.route_plan") as sp:
+        scores = _keyword_scores(q)
+        total = sum(scores.values())
+        if (override and override.lower() in TOOLS) or not total:
+            return [route_query(q, override)]
+
+        plan = [(tool, n / total, f"Matched {n} keywords for '{tool}'.") for tool, n in scores.items() if n and n / total >= threshold]
+        if sp is not None:
+            sp.set(tools=",".join(t for t, _, _ in plan))
+        return sorted(plan, key=lambda p: -p[1])
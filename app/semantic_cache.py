@@ -0,0 +1,147 @@
+# research_copilot/app/semantic_cache.py
+"""
+Similarity-based answer cache for risk questions.
+
+"top risks", "key risk factors" and "Item 1A summary" are the same request for a given
+issuer/year. Questions are embedded (sentence-transformers when installed, otherwise a
+hashed character-trigram vector), stored per (issuer, year, data dir) in a fixed-size
+normalized matrix, and a new question reuses the stored answer whose cosine similarity is
+highest, if it clears the threshold. Lookup is one matrix-vector product.
+
+Each bucket records the data dir's content fingerprint (as the persistent risk cache does),
+so answers are dropped once the filings change. Like the risk cache, nothing is looked up or
+stored when the data dir cannot be fingerprinted (not a local directory): such answers could
+never be invalidated.
+"""
+
+import hashlib
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any
+
+import numpy as np
+
+from app.config import S
+from app.resources import REGISTRY
+from app.risk_cache import data_dir_fingerprint
+
+Embedder = Callable[[list[str]], np.ndarray]
+
+
+def hashing_embedder(dim: int = 512) -> Embedder:
+    """Dependency-free fallback: L2-normalized counts of hashed character trigrams."""
+
+    def embed(texts: list[str]) -> np.ndarray:
+        out = np.zeros((len(texts), dim), dtype=np.float32)
+        for i, t in enumerate(texts):
+            s = f"  {' '.join(t.lower().split())} "
+            for j in range(len(s) - 2):
+                out[i, int.from_bytes(hashlib.blake2b(s[j : j + 3].encode(), digest_size=4).digest(), "little") % dim] += 1.0
+        return out
+
+    return embed
+
+
+def default_embedder() -> Embedder:
+    """sentence-transformers model ``SEMANTIC_CACHE_MODEL`` (loaded once per process), else the hashing fallback."""
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return hashing_embedder()
+    model = REGISTRY.get(f"semantic_cache.{S.SEMANTIC_CACHE_MODEL}", lambda: SentenceTransformer(S.SEMANTIC_CACHE_MODEL))
+    return lambda texts: np.asarray(model.encode(texts, normalize_embeddings=True), dtype=np.float32)
+
+
+class _Bucket:
+    """Ring buffer of (normalized embedding, answer, backend latency) for one issuer/year."""
+
+    def __init__(self, dim: int, capacity: int, fingerprint: str) -> None:
+        self.fingerprint = fingerprint
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.answers: list[Any] = [None] * capacity
+        self.latencies = np.zeros(capacity)
+        self.n = 0
+
+    def add(self, vec: np.ndarray, answer: Any, latency_s: float) -> None:
+        i = self.n % len(self.answers)
+        self.vectors[i], self.answers[i], self.latencies[i] = vec, answer, latency_s
+        self.n += 1
+
+    def nearest(self, vec: np.ndarray) -> tuple[int, float]:
+        sims = self.vectors[: min(self.n, len(self.answers))] @ vec
+        i = int(np.argmax(sims))
+        return i, float(sims[i])
+
+
+class SemanticCache:
+    """
+    Args:
+        threshold (float): Minimum cosine similarity for a stored answer to be reused.
+        embed (callable, optional): texts -> (n, d) array. Defaults to :func:`default_embedder`, resolved on first use.
+        capacity (int): Answers kept per issuer/year; the oldest is overwritten first.
+    """
+
+    def __init__(self, threshold: float, embed: Embedder | None = None, capacity: int = 256) -> None:
+        self.threshold = threshold
+        self.capacity = capacity
+        self._embed = embed
+        self._buckets: dict[Hashable, _Bucket] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.latency_saved_s = 0.0
+
+    def _vector(self, question: str) -> np.ndarray:
+        if self._embed is None:
+            self._embed = default_embedder()
+        v = np.asarray(self._embed([question]), dtype=np.float32)[0]
+        norm = float(np.linalg.norm(v))
+        return v / norm if norm else v
+
+    @staticmethod
+    def _key(issuer: str, year: int, data_dir: str | None) -> tuple:
+        return issuer.strip().upper(), int(year), data_dir
+
+    def lookup(self, issuer: str, year: int, question: str, data_dir: str | None = None) -> Any:
+        """
+        The stored answer closest to ``question`` for this issuer/year, or None below the threshold
+        or when the data dir cannot be fingerprinted.
+        """
+        fp = data_dir_fingerprint(data_dir)
+        if fp is None:
+            return None
+        bucket = self._buckets.get(self._key(issuer, year, data_dir))
+        if bucket is not None and bucket.n and bucket.fingerprint == fp:
+            vec = self._vector(question)
+            with self._lock:
+                i, sim = bucket.nearest(vec)
+                if sim >= self.threshold:
+                    self.hits += 1
+                    self.latency_saved_s += float(bucket.latencies[i])
+                    return bucket.answers[i]
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def store(self, issuer: str, year: int, question: str, answer: Any, latency_s: float = 0.0, data_dir: str | None = None) -> None:
+        """
+        Remembers ``answer`` for ``question``; ``latency_s`` is what a later hit saves. Nothing is
+        stored when the data dir cannot be fingerprinted.
+        """
+        fp = data_dir_fingerprint(data_dir)
+        if fp is None:
+            return
+        vec = self._vector(question)
+        with self._lock:
+            key = self._key(issuer, year, data_dir)
+            bucket = self._buckets.get(key)
+            if bucket is None or bucket.fingerprint != fp:  # answers for older filings are dropped
+                bucket = self._buckets[key] = _Bucket(vec.shape[0], self.capacity, fp)
+            bucket.add(vec, answer, latency_s)
+
+    def stats(self) -> dict[str, float]:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0, "latency_saved_s": self.latency_saved_s}
+
+
+SEMANTIC_CACHE = SemanticCache(S.SEMANTIC_CACHE_THRESHOLD) if S.SEMANTIC_CACHE_THRESHOLD > 0 else None
@@ -0,0 +1,79 @@
+# research_copilot/app/singleflight.py
+"""
+Request coalescing for identical in-flight backend calls.
+
+When several sessions ask for the same thing at the same time (same tickers and dates, same
+issuer/year/question, same backtest parameters), only the first caller runs the backend;
+the others wait for it and receive the same result, or the same exception. Once the call
+has finished the key is forgotten, so later callers go through the caches as usual.
+
+Results are shared, not copied: callers must treat them as read-only.
+"""
+
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from app.tracing import current_span
+
+
+class _Flight:
+    __slots__ = ("done", "error", "result")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Example:
+        flight = SingleFlight()
+        payload = flight.do(("risk", issuer, year, question), lambda: summarize(issuer, year, question))
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[Hashable, _Flight] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Runs ``fn()`` unless a call with the same ``key`` is already running, in which case its
+        result is awaited and returned instead (its exception re-raised).
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        if (sp := current_span()) is not None:
+            sp.set(coalesced=not leader)
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def stats(self) -> dict[str, int]:
+        """Backend executions, calls served by another caller's execution, and keys in flight."""
+        with self._lock:
+            return {"executions": self.executions, "coalesced": self.coalesced, "in_flight": len(self._flights)}
+
+
+SINGLE_FLIGHT = SingleFlight()
@@ -0,0 +1,107 @@
+# research_copilot/app/strategy_store.py
+"""
+Parameter-keyed store of backtest results.
+
+Each result lives in ``<STRAT_REPORT_DIR>/backtests/<key>/`` (``result.json`` plus a private
+copy of the equity curve), where the key hashes factor, horizon, universe, costs and a
+fingerprint (size, mtime) of the panel the backtest ran on. A backtest is therefore computed
+once per parameter set and panel version; editing the panel makes old entries unreachable.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any
+
+from app.config import S
+
+
+def panel_fingerprint(panel_path: str | None) -> str | None:
+    """Version of the panel file (path, size, mtime), or None if it is not a local file."""
+    if not panel_path or not os.path.isfile(panel_path):
+        return None
+    st = os.stat(panel_path)
+    return f"{os.path.abspath(panel_path)}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def _same(a: Any, b: Any) -> bool:
+    try:
+        return float(a) == float(b)
+    except (TypeError, ValueError):
+        return str(a) == str(b)
+
+
+def params_match(res: dict, factor: str, horizon: int, universe: str | None = None, costs_bps: float | None = None) -> bool:
+    """
+    True only if ``res`` (a last_metrics / backtest payload) confirms every requested parameter.
+    Parameters are read from ``res["params"]`` or ``res["metrics"]``; one that is not reported
+    counts as a mismatch, since the payload may be for anything.
+    """
+    reported = {**(res.get("metrics") or {}), **(res.get("params") or {})}
+    wanted = {"factor": factor, "horizon": horizon, "universe": universe, "costs_bps": costs_bps}
+    return all(reported.get(k) is not None and _same(reported[k], v) for k, v in wanted.items() if v is not None)
+
+
+class StrategyStore:
+    """
+    Args:
+        root (str): Directory holding one subdirectory per stored backtest; created on first put.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(factor: str, horizon: int, universe: str, costs_bps: float, fingerprint: str) -> str:
+        raw = json.dumps([factor, int(horizon), universe, float(costs_bps), fingerprint])
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def get(self, factor: str, horizon: int, universe: str, costs_bps: float, panel_path: str | None) -> dict | None:
+        """Stored ``{"metrics", "equity_curve_path", "params"}``, or None on a miss or unversioned panel."""
+        fp = panel_fingerprint(panel_path)
+        if fp is None:
+            return None
+        try:
+            with open(self.root / self.key(factor, horizon, universe, costs_bps, fp) / "result.json") as f:
+                res = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        curve = res.get("equity_curve_path")
+        if curve and not os.path.exists(curve):
+            res["equity_curve_path"] = None
+        self.hits += 1
+        return res
+
+    def put(self, factor: str, horizon: int, universe: str, costs_bps: float, panel_path: str | None, res: dict) -> dict:
+        """
+        Stores a backtest result and returns it as stored: the equity curve is copied next to it,
+        since the backend overwrites its own report files on the next run.
+        """
+        fp = panel_fingerprint(panel_path)
+        if fp is None:
+            return res
+        d = self.root / self.key(factor, horizon, universe, costs_bps, fp)
+        d.mkdir(parents=True, exist_ok=True)
+        curve = res.get("equity_curve_path")
+        if curve and os.path.isfile(curve):
+            dst = d / f"equity_curve{Path(curve).suffix}"
+            shutil.copyfile(curve, dst)
+            curve = str(dst)
+        params = {"factor": factor, "horizon": int(horizon), "universe": universe, "costs_bps": costs_bps, "panel": fp}
+        stored: dict[str, Any] = {"metrics": res.get("metrics", {}), "equity_curve_path": curve, "params": params}
+        tmp = d / "result.json.tmp"
+        tmp.write_text(json.dumps(stored, default=str))
+        os.replace(tmp, d / "result.json")
+        return stored
+
+    def stats(self) -> dict[str, int]:
+        size = sum(1 for _ in self.root.glob("*/result.json")) if self.root.is_dir() else 0
+        return {"hits": self.hits, "misses": self.misses, "size": size}
+
+
+STRATEGY_STORE = StrategyStore(os.path.join(S.STRAT_REPORT_DIR, "backtests")) if S.STRAT_REPORT_DIR else None
@@ -0,0 +1,78 @@
+# research_copilot/app/streaming.py
+"""
+Server-sent events for streamed risk summaries.
+
+A streamed ``/summarize_risk`` answers ``text/event-stream`` with one JSON ``data:`` line per
+event: ``sources`` and ``categories`` as soon as retrieval finishes, then one ``token`` per
+summary fragment, then ``done`` (remaining payload fields, e.g. issuer/year). An ``error``
+event carries ``{"detail": ...}``. Servers that do not stream answer plain JSON, which is
+replayed as the same event sequence so consumers have a single code path.
+"""
+
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+Event = tuple[str, Any]
+
+
+class StreamError(RuntimeError):
+    """Raised when the server reports an ``error`` event mid-stream."""
+
+
+def iter_sse(lines: Iterable[bytes | str]) -> Iterator[Event]:
+    """
+    Parses SSE lines (as from ``Response.iter_lines``) into (event, decoded JSON data) pairs.
+    Comment lines and fields other than ``event``/``data`` are ignored.
+    """
+    event, data = "message", []
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        line = line.rstrip("\r\n")
+        if not line:
+            if data:
+                yield event, json.loads("\n".join(data))
+            event, data = "message", []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if field == "event":
+            event = value
+        elif field == "data":
+            data.append(value)
+    if data:
+        yield event, json.loads("\n".join(data))
+
+
+def format_sse(event: str, data: Any) -> bytes:
+    """Encodes one event; the inverse of :func:`iter_sse`."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+def payload_events(payload: dict) -> Iterator[Event]:
+    """Replays a complete summarize_risk payload as a stream (one token for the whole summary)."""
+    yield "sources", payload.get("sources", [])
+    yield "categories", payload.get("categories", [])
+    if payload.get("summary"):
+        yield "token", payload["summary"]
+    yield "done", {k: v for k, v in payload.items() if k not in ("sources", "categories", "summary")}
+
+
+def collect(events: Iterable[Event]) -> dict:
+    """Assembles streamed events back into the payload ``risk_summarize`` would have returned."""
+    out: dict[str, Any] = {}
+    tokens: list[str] = []
+    for event, data in events:
+        if event == "token":
+            tokens.append(data)
+        elif event in ("sources", "categories"):
+            out[event] = data
+        elif event == "done":
+            out.update(data or {})
+        elif event == "error":
+            raise StreamError((data or {}).get("detail", "stream error"))
+    out["summary"] = "".join(tokens)
+    return out
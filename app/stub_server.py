@@ -0,0 +1,203 @@
+# research_copilot/app/stub_server.py
+"""
+Local stand-ins for the sentiment (8601), risk (8602) and strategy (8603) services.
+
+They answer the same endpoints as the real servers with canned payloads, so benchmarks
+and tests can exercise MCPClient over real HTTP without the domain packages installed.
+``/summarize_risk`` streams server-sent events (chunked) when asked for ``text/event-stream``,
+and ``/panel_stats`` answers Arrow IPC when asked for ``application/vnd.apache.arrow.stream``.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from app import wire
+from app.streaming import format_sse, payload_events
+
+
+def _sentiment_payload(body: dict) -> dict:
+    tickers = body.get("tickers") or ["AAPL"]
+    series = [{"date": body.get("date_from", "2024-01-01"), "ticker": t, "avg_sentiment": 0.1} for t in tickers]
+    return {"stats": {"avg_sentiment": 0.1, "n_news": len(series)}, "series": series}
+
+
+def _risk_payload(body: dict) -> dict:
+    return {
+        "issuer": body.get("issuer"),
+        "year": body.get("year"),
+        "summary": f"Stub summary for {body.get('issuer')} {body.get('year')}: {body.get('query')}",
+        "categories": [{"label": "Cybersecurity", "confidence": 0.8}],
+        "sources": [{"path": "stub/item_1a.txt", "chunk_id": "0"}],
+    }
+
+
+def _strategy_payload(body: dict) -> dict:
+    return {"metrics": {"IC": 0.03, "Sharpe": 0.7, "MaxDD": -0.1, "Turnover": 0.4, **{k: body[k] for k in ("factor", "horizon") if k in body}}, "equity_curve_path": None}
+
+
+ROUTES = {
+    ("POST", "/panel_stats"): _sentiment_payload,
+    ("POST", "/summarize_risk"): _risk_payload,
+    ("GET", "/last_metrics"): _strategy_payload,
+    ("POST", "/run_backtest"): _strategy_payload,
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like uvicorn
+    disable_nagle_algorithm = True
+    wbufsize = 1 << 16  # send headers and body in one segment; flushed after each request
+    server: "_StubHTTPServer"
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format: str, *args: Any) -> None:  # silence per-request stderr logging
+        pass
+
+    def _handle(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        body = json.loads(raw) if raw else {}
+        with self.server.lock:
+            self.server.requests += 1
+            fail = self.server.fail_next > 0
+            self.server.fail_next -= int(fail)
+            stall = self.server.slow_next > 0
+            self.server.slow_next -= int(stall)
+        fail = fail or (self.server.error_rate > 0 and random.random() < self.server.error_rate)
+        path = self.path.split("?", 1)[0]
+        route = ROUTES.get((method, path))
+        delay = self.server.latency + (random.uniform(0, self.server.jitter) if self.server.jitter else 0.0)
+        delay += self.server.slow_s if stall else 0.0
+        if delay:
+            time.sleep(delay)
+        if fail:
+            self._send(503, {"detail": "injected failure"})
+            return
+        if route is None:
+            self._send(404, {"detail": "not found"})
+            return
+        if path == "/summarize_risk" and "text/event-stream" in self.headers.get("Accept", ""):
+            self._stream(route(body))
+            return
+        if path == "/panel_stats" and wire.ARROW_STREAM in self.headers.get("Accept", ""):
+            self._send_bytes(200, wire.encode_panel_stats(route(body)), wire.ARROW_STREAM)
+            return
+        self._send(200, route(body))
+
+    def _stream(self, payload: dict) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for event, data in payload_events(payload):
+            if event == "token":  # one token per word, like an LLM would emit
+                words = data.split(" ")
+                for i, w in enumerate(words):
+                    if self.server.token_latency:
+                        time.sleep(self.server.token_latency)
+                    self._chunk(format_sse("token", w if i == len(words) - 1 else w + " "))
+            else:
+                self._chunk(format_sse(event, data))
+        self._chunk(b"")
+
+    def _chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%X\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _send(self, status: int, payload: dict) -> None:
+        self._send_bytes(status, json.dumps(payload).encode(), "application/json")
+
+    def _send_bytes(self, status: int, data: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr: tuple[str, int], latency: float, token_latency: float, jitter: float, error_rate: float) -> None:
+        super().__init__(addr, _Handler)
+        self.latency = latency
+        self.token_latency = token_latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.fail_next = 0
+        self.slow_next = 0
+        self.slow_s = 0.0
+
+
+class StubServer:
+    """
+    A threaded HTTP server on 127.0.0.1 answering every copilot endpoint.
+
+    Args:
+        latency (float): Seconds to sleep before answering each request.
+        port (int): Port to bind; 0 picks a free one.
+        token_latency (float): Seconds to sleep before each streamed summary token.
+        jitter (float): Extra seconds, uniform in [0, jitter], added to ``latency`` per request.
+        error_rate (float): Share of requests answered with HTTP 503 at random.
+    """
+
+    def __init__(self, latency: float = 0.0, port: int = 0, token_latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0) -> None:
+        self._httpd = _StubHTTPServer(("127.0.0.1", port), latency, token_latency, jitter, error_rate)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def connections(self) -> int:
+        """Number of TCP connections accepted so far."""
+        return self._httpd.connections
+
+    @property
+    def requests(self) -> int:
+        """Number of HTTP requests answered so far."""
+        return self._httpd.requests
+
+    def fail_next(self, n: int = 1) -> None:
+        """Answer the next ``n`` requests with HTTP 503."""
+        with self._httpd.lock:
+            self._httpd.fail_next = n
+
+    def slow_next(self, n: int = 1, seconds: float = 5.0) -> None:
+        """Delay the next ``n`` requests by an extra ``seconds`` (a hung or overloaded service)."""
+        with self._httpd.lock:
+            self._httpd.slow_next, self._httpd.slow_s = n, seconds
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
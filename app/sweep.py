@@ -0,0 +1,201 @@
+# research_copilot/app/sweep.py
+"""
+Parameter-sweep backtests.
+
+A grid of (factor, horizon, universe, costs_bps) jobs is spread over a local process (or
+thread) pool calling the strategy package, or over concurrent HTTP calls to the strategy
+service. Locally the sentiment panel is read once through the panel layer (pruned to the panel
+columns) and handed to backtests that take an in-memory ``panel``: once for a thread pool,
+once per worker process in the pool initializer, never once per job. Backtests that only take
+``panel_path`` (such as the strategy package's run_backtest_from_panel) read the file
+themselves on every call. Worker processes are started with forkserver (spawn where it is
+unavailable). Results already in the strategy store are not recomputed.
+
+Parameters the local backtest does not accept cannot be swept: a grid varying ``universe`` or
+``costs_bps`` for such a backtest is rejected instead of returning the same metrics under
+different labels.
+"""
+
+import itertools
+import multiprocessing as mp
+import os
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from typing import Any
+
+import pandas as pd
+
+from app import backends, panel
+from app.strategy_store import STRATEGY_STORE, StrategyStore
+
+MODES = ("process", "thread", "http")
+PARAMS = ("factor", "horizon", "universe", "costs_bps")
+
+Backtest = Callable[..., dict]
+Progress = Callable[[int, int, dict], None]
+
+# Worker-process state, set by _init_worker: the backend and the panel (None when the backend
+# reads the file itself).
+_BACKTEST: Backtest | None = None
+_PANEL: pd.DataFrame | None = None
+
+
+def grid(factors: Iterable[str], horizons: Iterable[int], costs_bps: Iterable[float] = (10,), universe: str = "SP500") -> list[dict]:
+    """Every combination of the given parameters, as job dicts."""
+    return [{"factor": f, "horizon": int(h), "universe": universe, "costs_bps": c} for f, h, c in itertools.product(factors, horizons, costs_bps)]
+
+
+def unsupported_params(fn: Backtest) -> list[str]:
+    """The optional backtest parameters (universe, costs_bps) ``fn`` does not accept."""
+    return [k for k in ("universe", "costs_bps") if not backends.accepts(fn, k)]
+
+
+def call_backtest(fn: Backtest, panel_path: str | None, factor: str, horizon: int, universe: str, costs_bps: float, panel_df: pd.DataFrame | None = None) -> dict:
+    """
+    Calls a run_backtest_from_panel-like function with whatever its signature accepts: an
+    in-memory ``panel`` (``panel_df``, or a pruned read of ``panel_path``), else ``panel_path``.
+    universe and costs_bps are passed where accepted (see :func:`unsupported_params`).
+    """
+    kwargs = {"factor": factor, "horizon": int(horizon), **{k: v for k, v in (("universe", universe), ("costs_bps", costs_bps)) if backends.accepts(fn, k)}}
+    if backends.accepts(fn, "panel") and (panel_df is not None or panel.can_serve(panel_path)):
+        return fn(panel=panel_df if panel_df is not None else panel.read_panel(panel_path), **kwargs)
+    if backends.accepts(fn, "panel_path"):
+        return fn(panel_path=panel_path, **kwargs)
+    return fn(**kwargs)
+
+
+def _load_panel(fn: Backtest, panel_path: str | None) -> pd.DataFrame | None:
+    return panel.read_panel(panel_path) if backends.accepts(fn, "panel") and panel.can_serve(panel_path) else None
+
+
+def _timed(fn: Backtest, panel_path: str | None, job: dict, panel_df: pd.DataFrame | None) -> dict:
+    t0 = time.perf_counter()
+    res = call_backtest(fn, panel_path, job["factor"], job["horizon"], job["universe"], job["costs_bps"], panel_df)
+    return {**res, "elapsed_s": time.perf_counter() - t0}
+
+
+def _init_worker(backtest: Backtest, panel_path: str | None) -> None:
+    global _BACKTEST, _PANEL
+    _BACKTEST = backtest
+    _PANEL = _load_panel(backtest, panel_path)
+
+
+def _run_job(job: dict, panel_path: str | None) -> dict:
+    return _timed(_BACKTEST, panel_path, job, _PANEL)
+
+
+def process_context() -> mp.context.BaseContext:
+    """
+    Start method for worker processes: forkserver where available, else spawn. Never fork, which
+    copies the caller's threads' locks (Streamlit's server, thread pools) and can deadlock.
+    """
+    return mp.get_context("forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn")
+
+
+def _submit_local(mode: str, jobs: list[dict], fn: Backtest, panel_path: str | None, max_workers: int) -> tuple[Executor, dict[Future, dict]]:
+    if mode == "thread":
+        df = _load_panel(fn, panel_path)
+        ex: Executor = ThreadPoolExecutor(max_workers)
+        return ex, {ex.submit(_timed, fn, panel_path, job, df): job for job in jobs}
+    # each worker reads the panel once, in its initializer
+    ex = ProcessPoolExecutor(max_workers, mp_context=process_context(), initializer=_init_worker, initargs=(fn, panel_path))
+    return ex, {ex.submit(_run_job, job, panel_path): job for job in jobs}
+
+
+def _row(job: dict, res: dict | None, error: str | None = None, cached: bool = False) -> dict:
+    res = res or {}
+    metrics = {k: v for k, v in (res.get("metrics") or {}).items() if k not in PARAMS}
+    return {**job, **metrics, "equity_curve_path": res.get("equity_curve_path"), "error": error, "elapsed_s": res.get("elapsed_s"), "cached": cached}
+
+
+def run_sweep(
+    jobs: list[dict],
+    mode: str = "process",
+    panel_path: str | None = None,
+    backtest: Backtest | None = None,
+    client: Any = None,
+    max_workers: int | None = None,
+    on_progress: Progress | None = None,
+    store: StrategyStore | None = STRATEGY_STORE,
+) -> pd.DataFrame:
+    """
+    Runs every job and returns one row per job: its parameters, metrics, equity curve path,
+    ``error`` (None on success), ``elapsed_s`` and ``cached``.
+
+    Args:
+        jobs (list): Job dicts with factor, horizon, universe, costs_bps (see :func:`grid`).
+        mode (str): "process" or "thread" for the local strategy package, "http" for the service.
+        panel_path (str, optional): Sentiment panel for local runs; also versions stored results.
+        backtest (callable, optional): Local backtest function; must be picklable (module level)
+            in "process" mode. Defaults to the strategy package's run_backtest_from_panel.
+            A ``panel`` parameter gets the panel read once; otherwise ``panel_path`` is passed.
+        client (MCPClient, optional): Client for "http" mode; a new one is created if omitted.
+        max_workers (int, optional): Concurrency. Defaults to the CPU count locally, the
+            client's connection pool size over HTTP.
+        on_progress (callable, optional): Called as ``(done, total, row)`` after each job.
+        store (StrategyStore, optional): Stored results are reused and new ones added (local modes).
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+    if mode != "http":
+        backtest = backtest or backends.get("strategy", "run_backtest_from_panel")
+        swept = [k for k in unsupported_params(backtest) if len({job[k] for job in jobs}) > 1]
+        if swept:
+            raise ValueError(f"the local backtest does not accept {', '.join(swept)}; these parameters cannot be swept")
+    rows: list[dict] = []
+    todo: list[dict] = []
+    if mode != "http" and store is not None:
+        for job in jobs:
+            hit = store.get(job["factor"], job["horizon"], job["universe"], job["costs_bps"], panel_path)
+            if hit is None:
+                todo.append(job)
+            else:
+                rows.append(_row(job, {**hit, "elapsed_s": 0.0}, cached=True))
+                if on_progress:
+                    on_progress(len(rows), len(jobs), rows[-1])
+    else:
+        todo = list(jobs)
+
+    if todo:
+        stack = ExitStack()
+        if mode == "http":
+            from app.mcp_client import MCPClient
+
+            client = client or stack.enter_context(MCPClient())  # a client created here is closed here
+            ex: Executor = ThreadPoolExecutor(max_workers or client.pool_size)
+            futs = {ex.submit(_http_job, client, job): job for job in todo}
+        else:
+            ex, futs = _submit_local(mode, todo, backtest, panel_path, max_workers or min(len(todo), os.cpu_count() or 1))
+        with stack, ex:
+            try:
+                for fut in as_completed(futs):
+                    job = futs[fut]
+                    try:
+                        res = fut.result()
+                        if mode != "http" and store is not None:
+                            res = {**store.put(job["factor"], job["horizon"], job["universe"], job["costs_bps"], panel_path, res), "elapsed_s": res["elapsed_s"]}
+                        rows.append(_row(job, res))
+                    except Exception as e:
+                        rows.append(_row(job, None, error=f"{type(e).__name__}: {e}"))
+                    if on_progress:
+                        on_progress(len(rows), len(jobs), rows[-1])
+            except BaseException:  # e.g. a progress callback aborting the sweep: drop what has not started
+                for f in futs:
+                    f.cancel()
+                raise
+
+    if not rows:
+        return pd.DataFrame(columns=[*PARAMS, "equity_curve_path", "error", "elapsed_s", "cached"])
+    df = pd.DataFrame(rows)
+    # parameters first, then metrics, then bookkeeping
+    tail = ["equity_curve_path", "error", "elapsed_s", "cached"]
+    df = df[[*PARAMS, *(c for c in df.columns if c not in PARAMS and c not in tail), *tail]]
+    return df.sort_values(list(PARAMS), ignore_index=True)
+
+
+def _http_job(client: Any, job: dict) -> dict:
+    t0 = time.perf_counter()
+    res = client.strategy_run_backtest(factor=job["factor"], horizon=job["horizon"], universe=job["universe"], costs_bps=job["costs_bps"])
+    return {**res, "elapsed_s": time.perf_counter() - t0}
@@ -0,0 +1,223 @@
+# research_copilot/app/symbols.py
+"""
+Ticker / issuer resolution.
+
+A :class:`SymbolIndex` is built once per process from the sentiment panel's ``ticker``
+column and the issuers found in the risk data dir, so requests can be checked before any
+backend is called:
+
+- exact lookups are one dict probe (case-insensitive);
+- misspellings are corrected with rapidfuzz when exactly one symbol is a close match
+  (``NVDIA`` -> ``NVDA``), and rejected with suggestions otherwise;
+- :meth:`SymbolIndex.extract` pulls the tickers and years named in a free-text query.
+
+Fuzzy results are memoized, so repeated bad inputs are rejected in microseconds.
+An empty index (no panel, no data dir) validates nothing and passes names through.
+"""
+
+import os
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from app.resources import REGISTRY
+
+# Minimum similarity (0-100) for a correction, and lead over the runner-up it needs.
+FUZZY_CUTOFF = 75.0
+FUZZY_MARGIN = 10.0
+
+# Upper-case words that are far more often jargon than tickers in a research question.
+STOPWORDS = frozenset(
+    "A I AI API CEO CFO CPI EPS ESG ETF EU FED FX FY GDP IC IPO IR IT KPI LLM MD Q1 Q2 Q3 Q4 RAG ROE ROI SEC TTM UK US USA USD YOY QOQ".split()  # noqa: SIM905
+)
+
+_TOKEN_RE = re.compile(r"(\$)?\b([A-Za-z]{1,5}(?:[.\-][A-Za-z])?)\b")
+_YEAR_RE = re.compile(r"(?<!\d)((?:19|20)\d{2})(?!\d)")
+_ISSUER_RE = re.compile(r"^[A-Za-z][A-Za-z0-9.\-]{0,9}$")
+
+
+class UnknownSymbol(ValueError):
+    """Raised for a ticker or issuer that is not in the index and has no unambiguous correction."""
+
+    def __init__(self, name: str, kind: str, suggestions: tuple[str, ...] = ()) -> None:
+        hint = f" (did you mean {', '.join(suggestions)}?)" if suggestions else ""
+        super().__init__(f"Unknown {kind} {name!r}{hint}")
+        self.name, self.kind, self.suggestions = name, kind, suggestions
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """``query`` as typed, the ``symbol`` it resolved to and the match score (100 = exact)."""
+
+    query: str
+    symbol: str
+    score: float
+
+    @property
+    def corrected(self) -> bool:
+        return self.score < 100.0
+
+
+@dataclass(frozen=True)
+class QueryEntities:
+    """
+    Symbols and years named in a query; ``exact`` are the tickers spelled exactly (the rest come
+    from ``corrections``), ``unknown`` are ticker-like words left unresolved.
+    """
+
+    tickers: tuple[str, ...] = ()
+    years: tuple[int, ...] = ()
+    corrections: tuple[Resolution, ...] = ()
+    unknown: tuple[str, ...] = ()
+    exact: tuple[str, ...] = ()
+
+
+class SymbolIndex:
+    """
+    Args:
+        tickers (iterable of str): Tickers of the sentiment panel.
+        issuers (iterable of str): Issuers with risk filings; when empty, issuers are checked
+            against the tickers.
+        source (tuple, optional): Fingerprint of the inputs, used to detect a stale index.
+    """
+
+    def __init__(self, tickers: Iterable[str], issuers: Iterable[str] = (), source: tuple = ()) -> None:
+        self.tickers = tuple(sorted({t.strip().upper() for t in tickers if t and t.strip()}))
+        self.issuers = tuple(sorted({i.strip().upper() for i in issuers if i and i.strip()})) or self.tickers
+        self.source = source
+        self._exact = {"ticker": frozenset(self.tickers), "issuer": frozenset(self.issuers)}
+        self._choices = {"ticker": list(self.tickers), "issuer": list(self.issuers)}
+        self._symbols = self._exact["ticker"] | self._exact["issuer"]
+        self._fuzzy = lru_cache(maxsize=4096)(self._fuzzy_match)
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def _fuzzy_match(self, key: str, kind: str) -> tuple[tuple[str, float], ...]:
+        """Up to three (symbol, score) candidates for ``key``, best first."""
+        choices = self._choices[kind]
+        try:
+            from rapidfuzz import fuzz, process
+
+            return tuple((c, s) for c, s, _ in process.extract(key, choices, scorer=fuzz.ratio, limit=3, score_cutoff=FUZZY_CUTOFF - FUZZY_MARGIN))
+        except ImportError:  # same ratio, pure python
+            from difflib import SequenceMatcher
+
+            scored = sorted(((c, 100.0 * SequenceMatcher(None, key, c).ratio()) for c in choices), key=lambda cs: -cs[1])
+            return tuple(cs for cs in scored[:3] if cs[1] >= FUZZY_CUTOFF - FUZZY_MARGIN)
+
+    def resolve(self, name: str, kind: str = "ticker") -> Resolution:
+        """
+        Canonical symbol for ``name``.
+
+        Args:
+            name (str): Ticker or issuer as typed.
+            kind (str): "ticker" (panel tickers) or "issuer" (risk filings).
+
+        Raises:
+            UnknownSymbol: ``name`` is not indexed and no single symbol is a close match.
+        """
+        key = (name or "").strip().upper()
+        if key in self._exact[kind] or not self._choices[kind]:
+            return Resolution(name, key, 100.0)
+        cands = self._fuzzy(key, kind) if key else ()
+        if cands and cands[0][1] >= FUZZY_CUTOFF and (len(cands) == 1 or cands[0][1] - cands[1][1] >= FUZZY_MARGIN):
+            return Resolution(name, cands[0][0], cands[0][1])
+        raise UnknownSymbol(name, kind, tuple(c for c, _ in cands))
+
+    def resolve_tickers(self, tickers: str | Iterable[str]) -> list[str]:
+        """Canonical tickers for a comma-separated string or a list, duplicates dropped."""
+        names = tickers.split(",") if isinstance(tickers, str) else tickers
+        return list(dict.fromkeys(self.resolve(t).symbol for t in names if t and t.strip()))
+
+    def extract(self, query: str) -> QueryEntities:
+        """
+        Tickers and years named in ``query``. Upper-case words and ``$cashtags`` are looked up
+        (jargon in :data:`STOPWORDS` is skipped unless cashtagged) and corrected when close to
+        exactly one symbol; years are 19xx/20xx numbers, e.g. in "FY2023".
+        """
+        tickers: dict[str, None] = {}
+        exact: dict[str, None] = {}
+        corrections, unknown = [], []
+        for cash, word in _TOKEN_RE.findall(query or ""):
+            if not cash and (not word.isupper() or word in STOPWORDS):
+                continue
+            key = word.upper()
+            if key in self._symbols:
+                tickers[key] = exact[key] = None
+                continue
+            if not self._symbols or len(key) < 3:
+                continue
+            try:
+                res = self.resolve(key, "ticker" if self._choices["ticker"] else "issuer")
+            except UnknownSymbol:
+                unknown.append(word)
+                continue
+            tickers[res.symbol] = None
+            corrections.append(Resolution(word, res.symbol, res.score))
+        years = tuple(dict.fromkeys(int(y) for y in _YEAR_RE.findall(query or "")))
+        return QueryEntities(tuple(tickers), years, tuple(corrections), tuple(unknown), tuple(exact))
+
+
+def panel_tickers(panel_path: str | None) -> list[str]:
+    """Distinct values of the panel's ``ticker`` column, read one row group at a time."""
+    from app import panel  # pyarrow, loaded with the sentiment tool
+
+    if not panel.can_serve(panel_path, ("ticker",)):
+        return []
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    pf = panel.open_panel(panel_path)
+    out: set[str] = set()
+    for i in range(pf.num_row_groups):
+        col = pf.read_row_group(i, columns=["ticker"])["ticker"]
+        out.update(t for t in pc.unique(pc.cast(col, pa.string())).to_pylist() if t)
+    return sorted(out)
+
+
+def issuers_in(data_dir: str | None) -> list[str]:
+    """
+    Issuers with filings in the risk data dir: its sub-directory names and the leading
+    ``ISSUER`` of file names such as ``AAPL_2023_10K.txt``.
+    """
+    if not data_dir or not os.path.isdir(data_dir):
+        return []
+    out = set()
+    for p in Path(data_dir).iterdir():
+        if p.name.startswith("."):
+            continue
+        name = re.split(r"[_\s]", p.name if p.is_dir() else p.stem)[0]
+        if _ISSUER_RE.match(name):
+            out.add(name.upper())
+    return sorted(out)
+
+
+def _source(panel_path: str | None, data_dir: str | None) -> tuple:
+    def sig(path: str | None) -> tuple:
+        try:
+            st = os.stat(path) if path else None
+        except OSError:
+            st = None
+        return (path, st.st_mtime_ns, st.st_size) if st else (path, None, None)
+
+    return sig(panel_path) + sig(data_dir)
+
+
+def build_index(panel_path: str | None, data_dir: str | None) -> SymbolIndex:
+    return SymbolIndex(panel_tickers(panel_path), issuers_in(data_dir), _source(panel_path, data_dir))
+
+
+def get_index(panel_path: str | None, data_dir: str | None) -> SymbolIndex:
+    """
+    The shared index for this panel and data dir, built on first use and rebuilt when
+    either has changed on disk (a couple of ``stat`` calls per request).
+    """
+    name = f"symbols.{panel_path}|{data_dir}"
+    index = REGISTRY.get(name, lambda: build_index(panel_path, data_dir))
+    if index.source != _source(panel_path, data_dir):
+        REGISTRY.evict(name)
+        index = REGISTRY.get(name)
+    return index
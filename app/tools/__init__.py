@@ -0,0 +1,197 @@
+# research_copilot/app/tools/__init__.py
+"""
+The three research tools as plain functions, shared by the Streamlit UI and headless runs
+(``app.notebook``). Each takes its backend callable (in-process package function or an
+``MCPClient`` method) and goes through the process-wide caches before calling it.
+"""
+
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any
+
+import pandas as pd
+
+from app import charts
+from app.backends import accepts
+from app.cache import SENTIMENT_CACHE, panel_stats_key
+from app.context import RiskContext, call_risk_backend
+from app.risk_cache import RISK_CACHE
+from app.semantic_cache import SEMANTIC_CACHE
+from app.singleflight import SINGLE_FLIGHT, SingleFlight
+from app.strategy_store import STRATEGY_STORE, params_match
+from app.sweep import call_backtest
+from app.symbols import SymbolIndex
+from app.tracing import span, wrap
+
+STRAT_DEF_UNIVERSE = os.getenv("STRAT_DEFAULT_UNIVERSE", "SP500")
+STRAT_DEF_COSTS = float(os.getenv("STRAT_DEFAULT_COSTS_BPS", "10"))
+
+
+def _plot_sentiment(series_records: list[dict]) -> BytesIO | None:
+    # PNG export of the decimated chart; cached, no pyplot figures left open
+    return charts.png(series_records)
+
+
+def _once(flight: SingleFlight | None, key: tuple, fn: Callable[[], Any]) -> Any:
+    # identical calls already running in other sessions are joined instead of repeated
+    return fn() if flight is None else flight.do(key, fn)
+
+
+def run_sentiment(msa_panel_stats, tickers, dfrom, dto, panel_path, cache=SENTIMENT_CACHE, index: SymbolIndex | None = None, flight: SingleFlight | None = SINGLE_FLIGHT):
+    from app import panel, panel_index  # pyarrow, loaded with the sentiment tool
+
+    if index is not None:
+        # unknown tickers fail here, misspelled ones are corrected, before any cache or backend
+        with span("sentiment.symbols"):
+            symbols = index.resolve_tickers(tickers)
+    else:
+        symbols = [s.strip() for s in tickers.split(",") if s.strip()]
+    key = panel_stats_key(symbols, dfrom, dto, panel_path)
+    with span("sentiment.cache") as sp:
+        payload = cache.get(key) if cache is not None else None
+        if sp is not None:
+            sp.set(hit=payload is not None)
+
+    def fetch() -> dict:
+        indexed = panel_index.can_index(panel_path)
+        with span("sentiment.panel_stats", source="index" if indexed else "package"):
+            if indexed:
+                # served from the incrementally maintained daily-aggregate store
+                try:
+                    payload = panel_index.panel_stats(panel_path, symbols, dfrom, dto)
+                except OSError:  # store dir not writable: pruned read of the raw panel instead
+                    payload = panel.panel_stats(panel_path, symbols, dfrom, dto)
+            elif accepts(msa_panel_stats, "panel_path"):
+                payload = msa_panel_stats(symbols, dfrom, dto, panel_path=panel_path)
+            else:
+                payload = msa_panel_stats(symbols, dfrom, dto)
+        if cache is not None:
+            cache.set(key, payload)
+        return payload
+
+    if payload is None:
+        payload = _once(flight, ("sentiment", *key), fetch)
+    stats = payload.get("stats", {})
+    series = payload.get("series", [])
+    with span("sentiment.dataframe"):
+        df = pd.DataFrame(series)
+    return stats, _chart_export(series) if len(series) else None, df
+
+
+def _chart_export(series: list[dict] | pd.DataFrame) -> Callable[[], bytes]:
+    # the PNG is only rendered when asked for (e.g. when the download button is clicked)
+    def render() -> bytes:
+        with span("sentiment.plot"):
+            img = _plot_sentiment(series)
+        return img.getvalue() if img is not None else b""
+
+    return render
+
+
+def run_risk(
+    risk_summarize,
+    issuer,
+    year,
+    question,
+    risk_data_dir=None,
+    cache=RISK_CACHE,
+    semantic_cache=SEMANTIC_CACHE,
+    ctx: RiskContext | None = None,
+    index: SymbolIndex | None = None,
+    flight: SingleFlight | None = SINGLE_FLIGHT,
+):
+    # settings travel in ctx, never through os.environ, so runs on a thread pool do not race
+    ctx = ctx or RiskContext(data_dir=risk_data_dir)
+    issuer, year = ctx.resolve(issuer, year)
+    if index is not None:
+        with span("risk.symbols"):
+            issuer = index.resolve(issuer, "issuer").symbol
+    with span("risk.cache") as sp:
+        payload = cache.get(issuer, year, question, ctx.data_dir) if cache is not None else None
+        if payload is None and semantic_cache is not None:
+            payload = semantic_cache.lookup(issuer, year, question, ctx.data_dir)
+        if sp is not None:
+            sp.set(hit=payload is not None)
+
+    def summarize() -> dict:
+        t0 = time.perf_counter()
+        with span("risk.summarize", issuer=issuer, year=year):
+            payload = call_risk_backend(risk_summarize, issuer, year, question, ctx)
+        if cache is not None:
+            cache.put(issuer, year, question, ctx.data_dir, payload)
+        if semantic_cache is not None:
+            semantic_cache.store(issuer, year, question, payload, time.perf_counter() - t0, ctx.data_dir)
+        return payload
+
+    if payload is None:
+        payload = _once(flight, ("risk", issuer, year, question, ctx.data_dir), summarize)
+    summary = payload.get("summary", "(no summary)")
+    categories = pd.DataFrame(payload.get("categories", []))
+    sources = payload.get("sources", [])
+    return summary, categories, sources
+
+
+def run_strategy(
+    strat_last_metrics,
+    strat_run_bt_from_panel,
+    factor,
+    horizon,
+    panel_path,
+    universe=STRAT_DEF_UNIVERSE,
+    costs_bps=STRAT_DEF_COSTS,
+    store=STRATEGY_STORE,
+    flight: SingleFlight | None = SINGLE_FLIGHT,
+):
+    # results for these exact parameters and panel version, if already computed
+    with span("strategy.store") as sp:
+        stored = store.get(factor, horizon, universe, costs_bps, panel_path) if store is not None else None
+        if sp is not None:
+            sp.set(hit=stored is not None)
+    if stored is not None:
+        return stored["metrics"], stored["equity_curve_path"]
+
+    def backtest() -> tuple[dict, str | None]:
+        with span("strategy.last_metrics"):
+            res = strat_last_metrics()
+        metrics = res.get("metrics", {}) or {}
+        curve_path = res.get("equity_curve_path")
+        # "last" metrics are only shown when they are not for other parameters
+        if not metrics or metrics.get("IC") is None or not params_match(res, factor, int(horizon), universe, costs_bps):
+            with span("strategy.backtest", factor=factor, horizon=int(horizon)):
+                res = call_backtest(strat_run_bt_from_panel, panel_path, factor, horizon, universe, costs_bps)
+            if store is not None:
+                res = store.put(factor, horizon, universe, costs_bps, panel_path, res)
+            metrics = res.get("metrics", {})
+            curve_path = res.get("equity_curve_path")
+        return metrics, curve_path
+
+    return _once(flight, ("strategy", factor, int(horizon), universe, float(costs_bps), panel_path), backtest)
+
+
+def run_plan(plan: list[tuple[str, float, str]], runners: dict[str, Callable[[], object]]) -> dict[str, object]:
+    """
+    Runs the backend of every planned tool concurrently.
+
+    Returns tool -> result, or the raised exception, for each planned tool with a runner.
+    """
+    tools = [t for t, _, _ in plan if t in runners]
+    if not tools:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(tools)) as ex:
+        futs = {t: ex.submit(wrap(_traced_runner(t, runners[t]))) for t in tools}
+    out: dict[str, object] = {}
+    for t, f in futs.items():
+        exc = f.exception()
+        out[t] = exc if exc is not None else f.result()
+    return out
+
+
+def _traced_runner(tool: str, fn: Callable[[], object]) -> Callable[[], object]:
+    def run() -> object:
+        with span(f"{tool}.run"):
+            return fn()
+
+    return run
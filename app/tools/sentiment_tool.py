@@ -1,8 +1,9 @@
 from io import BytesIO
 
-import matplotlib.pyplot as plt
 import pandas as pd
 
+from app import charts
+
 
 def render_sentiment_result(payload: dict) -> tuple[pd.DataFrame, BytesIO]:
     """
@@ -12,17 +13,5 @@ def render_sentiment_result(payload: dict) -> tuple[pd.DataFrame, BytesIO]:
     }
     """
     df = pd.DataFrame(payload.get("series", []))
-    buf = BytesIO()
-    if not df.empty:
-        fig, ax = plt.subplots(figsize=(7, 3))
-        for t, g in df.groupby("ticker"):
-            tmp = g.sort_values("date")
-            ax.plot(pd.to_datetime(g["date"]), tmp["avg_sentiment"], label=t)
-        ax.set_title("Daily Sentiment Trend")
-        ax.set_ylabel("avg_sentiment")
-        ax.grid(True)
-        ax.legend(loc="upper left", ncol=3, fontsize=8)
-        fig.tight_layout()
-        fig.savefig(buf, format="png", dpi=120)
-        buf.seek(0)
-    return df, buf
+    buf = charts.png(df) if not df.empty else None
+    return df, buf or BytesIO()
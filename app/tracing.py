@@ -0,0 +1,182 @@
+# research_copilot/app/tracing.py
+"""
+Lightweight request tracing.
+
+``with span("stage", key=value):`` times a stage. Spans nest through contextvars and are
+grouped into a trace: either one opened explicitly with :func:`trace` (the UI debug panel
+does this per request) or, when TRACING=1, one started implicitly by the outermost span.
+Finished traces are appended to TRACE_FILE as JSON lines, one span per line, using the
+OpenTelemetry span field names (traceId, spanId, parentSpanId, start/endTimeUnixNano,
+attributes, status).
+
+With no active trace and TRACING unset, ``span()`` returns a shared no-op context manager
+after one contextvar lookup. Thread pools do not inherit contextvars; submit through
+:func:`wrap` to keep worker spans in the caller's trace.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any
+
+from app.config import S
+
+_TRACE: contextvars.ContextVar["Trace | None"] = contextvars.ContextVar("trace", default=None)
+_SPAN: contextvars.ContextVar["Span | None"] = contextvars.ContextVar("span", default=None)
+_NOOP = nullcontext()
+_EXPORT_LOCK = threading.Lock()
+
+
+def _id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+class Span:
+    """One timed stage. Attributes can be added while it is open via :meth:`set`."""
+
+    __slots__ = ("_t0", "_token", "attributes", "end_ns", "error", "name", "parent_id", "span_id", "start_ns", "trace")
+
+    def __init__(self, trace: "Trace", name: str, attributes: dict[str, Any]) -> None:
+        self.trace = trace
+        self.name = name
+        self.attributes = attributes
+        self.span_id = _id(8)
+        self.parent_id: str | None = None
+        self.start_ns = self.end_ns = 0
+        self.error: str | None = None
+        self._t0 = 0
+        self._token: contextvars.Token | None = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def __enter__(self) -> "Span":
+        parent = _SPAN.get()
+        self.parent_id = parent.span_id if parent is not None else None
+        self._token = _SPAN.set(self)
+        self.start_ns = time.time_ns()
+        self._t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: type | None, exc: BaseException | None, tb: object) -> None:
+        self.end_ns = self.start_ns + (time.perf_counter_ns() - self._t0)
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _SPAN.reset(self._token)
+        self.trace._finish(self)
+
+    def to_otel(self) -> dict[str, Any]:
+        return {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": {k: v if isinstance(v, str | int | float | bool) else str(v) for k, v in self.attributes.items()},
+            "status": {"code": "ERROR", "message": self.error} if self.error else {"code": "OK"},
+        }
+
+
+class Trace:
+    """
+    All spans of one request. Use as a context manager; the root span is opened on enter and
+    the trace is exported (if ``export``) when it closes.
+    """
+
+    def __init__(self, name: str, export: bool | None = None, **attributes: Any) -> None:
+        self.trace_id = _id(16)
+        self.export = S.TRACING if export is None else export
+        self.spans: list[Span] = []  # in finishing order
+        self.root = Span(self, name, attributes)
+        self._lock = threading.Lock()
+        self._token: contextvars.Token | None = None
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def __enter__(self) -> "Trace":
+        self._token = _TRACE.set(self)
+        self.root.__enter__()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.root.__exit__(*exc)
+        _TRACE.reset(self._token)
+        if self.export:
+            export_jsonl(self.spans)
+
+    def breakdown(self) -> list[dict[str, Any]]:
+        """Spans in start order with their depth, offset from the trace start and duration (ms)."""
+        by_id = {s.span_id: s for s in self.spans}
+
+        def depth(s: Span) -> int:
+            d = 0
+            while s.parent_id in by_id:
+                s, d = by_id[s.parent_id], d + 1
+            return d
+
+        t0 = self.root.start_ns
+        return [
+            {"stage": s.name, "depth": depth(s), "start_ms": (s.start_ns - t0) / 1e6, "duration_ms": s.duration_ms, "error": s.error, "attributes": dict(s.attributes)}
+            for s in sorted(self.spans, key=lambda s: (s.start_ns, -s.end_ns))
+        ]
+
+
+class _ImplicitRoot:
+    """Outermost span outside any trace when TRACING=1: opens a trace named after it."""
+
+    __slots__ = ("_trace",)
+
+    def __init__(self, name: str, attributes: dict[str, Any]) -> None:
+        self._trace = Trace(name, export=True, **attributes)
+
+    def __enter__(self) -> Span:
+        return self._trace.__enter__().root
+
+    def __exit__(self, *exc: Any) -> None:
+        self._trace.__exit__(*exc)
+
+
+def span(name: str, **attributes: Any) -> Any:
+    """Context manager timing ``name`` in the current trace; a no-op when nothing is traced."""
+    tr = _TRACE.get()
+    if tr is None:
+        return _ImplicitRoot(name, attributes) if S.TRACING else _NOOP
+    return Span(tr, name, attributes)
+
+
+def trace(name: str, export: bool | None = None, **attributes: Any) -> Trace:
+    """Starts a trace (e.g. one per UI request); spans opened inside are collected on it."""
+    return Trace(name, export, **attributes)
+
+
+def current_span() -> Span | None:
+    return _SPAN.get()
+
+
+def wrap(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Binds ``fn`` to the current context, for running it on other threads (each call gets its own copy)."""
+    if _TRACE.get() is None:
+        return fn
+    ctx = contextvars.copy_context()
+    return lambda *args, **kwargs: ctx.copy().run(fn, *args, **kwargs)
+
+
+def export_jsonl(spans: list[Span], path: str | None = None) -> None:
+    """Appends spans to ``path`` (default TRACE_FILE) as OpenTelemetry-style JSON lines."""
+    path = path or S.TRACE_FILE
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    lines = "".join(json.dumps(s.to_otel()) + "\n" for s in spans)
+    with _EXPORT_LOCK, open(path, "a", encoding="utf-8") as f:
+        f.write(lines)
@@ -1,10 +1,11 @@
 # research_copilot/app/ui_streamlit.py
 import os
 import sys
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import replace
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import pandas as pd
 import streamlit as st
 from dotenv import load_dotenv
@@ -15,33 +16,29 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from app.router import route_query
+from app import backends, charts
+from app.cache import SENTIMENT_CACHE
+from app.config import S
+from app.context import RiskContext
+from app.health import HEALTH
+from app.mcp_client import RISK_URL, SENT_URL, STRAT_URL, MCPClient
+from app.resources import REGISTRY
+from app.router import route_plan
+from app.semantic_cache import SEMANTIC_CACHE
+from app.singleflight import SINGLE_FLIGHT
+from app.strategy_store import STRATEGY_STORE
+from app.symbols import get_index
+from app.tools import STRAT_DEF_COSTS, STRAT_DEF_UNIVERSE, _plot_sentiment, run_plan, run_risk, run_sentiment, run_strategy  # noqa: F401
+from app.tracing import span, trace, wrap
 
-# ---- Import public APIs from your three repos ----
+# ---- Public APIs from your three repos ----
 # Make sure Copilot venv has installed them from GitHub:
 # pip install -r requirements.txt  (with git+https://... lines)
-SENT_ERR: str | None = None
-RISK_ERR: str | None = None
-STRAT_ERR: str | None = None
-try:
-    from market_sentiment_analyzer.public_api import panel_stats as msa_panel_stats
-except Exception as e:
-    msa_panel_stats = None
-    SENT_ERR = f"Sentiment API import failed: {e}"
-
-try:
-    from risk_analysis_agent.public_api import summarize_risk as risk_summarize
-except Exception as e:
-    risk_summarize = None
-    RISK_ERR = f"Risk API import failed: {e}"
-
-try:
-    # adjust the path if your module lives under a different root (src/public_api, app/public_api, etc.)
-    from strategy_simulator.public_api import last_metrics as strat_last_metrics, run_backtest_from_panel as strat_run_bt_from_panel
-except Exception as e:
-    strat_last_metrics = None
-    strat_run_bt_from_panel = None
-    STRAT_ERR = f"Strategy API import failed: {e}"
+# They pull in torch/transformers/chromadb, so only probe them here; each one is imported
+# on first use by app.backends.
+SENT_ERR: str | None = backends.probe("sentiment")
+RISK_ERR: str | None = backends.probe("risk")
+STRAT_ERR: str | None = backends.probe("strategy")
 
 
 # ---- Config / defaults from .env ----
@@ -49,10 +46,12 @@ PANEL_PATH = os.getenv("SENTIMENT_PANEL_PATH", "../market-sentiment-analyzer/dat
 DEF_TICKERS = os.getenv("DEFAULT_TICKERS", "AAPL,MSFT,NVDA")
 DEF_FROM = os.getenv("DEFAULT_DATE_FROM", "2024-01-01")
 DEF_TO = os.getenv("DEFAULT_DATE_TO", "2024-12-31")
+ANALYTICS_WINDOW = int(os.getenv("ANALYTICS_WINDOW", "20"))  # days, rolling mean / z-score
 
 RISK_DEF_ISS = os.getenv("RISK_DEFAULT_ISSUER", "AAPL")
 RISK_DEF_YR = int(os.getenv("RISK_DEFAULT_YEAR", "2023"))
 RISK_DATA_DIR = os.getenv("RISK_DATA_DIR")  # optional, only if your API uses it
+RISK_STREAM = os.getenv("RISK_STREAM", "0") == "1"  # stream summaries from RISK_BASE_URL
 
 STRAT_PANEL_PATH = os.getenv("STRAT_SENTIMENT_PANEL_PATH", PANEL_PATH)
 STRAT_DEF_FACTOR = os.getenv("STRAT_DEFAULT_FACTOR", "SENT_L1")
@@ -62,11 +61,26 @@ STRAT_DEF_HORIZ = int(os.getenv("STRAT_DEFAULT_HORIZON", "1"))
 st.set_page_config(page_title="🧭 Research Copilot", layout="wide")
 st.title("🧭 Research Copilot")
 
-# Health hints
+
+def _health_caption(h: dict) -> str:
+    # HTTP service state as seen by this process (app.health), across all sessions
+    if h["state"] == "open":
+        return f"HTTP 🔴 circuit open after {h['errors']} failures · retry in {h['retry_in_s']:.0f}s"
+    if h["state"] == "half_open":
+        return "HTTP 🟡 probing after failures"
+    lat = f"p50 {h['p50_ms']:.0f} ms · p99 {h['p99_ms']:.0f} ms" if h["p50_ms"] is not None else "no successful calls"
+    return f"HTTP 🟢 {h['calls']} call{'s' if h['calls'] != 1 else ''} · {lat} · {h['error_rate']:.0%} errors"
+
+
+# Health hints: package imports, then HTTP health once a service has been called
 cols = st.columns(3)
 cols[0].markdown("✅ **Sentiment API** ready" if not SENT_ERR else f"⚠️ **Sentiment API**: {SENT_ERR}")
 cols[1].markdown("✅ **Risk API** ready" if not RISK_ERR else f"⚠️ **Risk API**: {RISK_ERR}")
 cols[2].markdown("✅ **Strategy API** ready" if not STRAT_ERR else f"⚠️ **Strategy API**: {STRAT_ERR}")
+service_health = HEALTH.snapshot()
+for col, url in zip(cols, (SENT_URL, RISK_URL, STRAT_URL), strict=True):
+    if url in service_health:
+        col.caption(_health_caption(service_health[url]))
 
 with st.sidebar:
     st.header("Query")
@@ -80,64 +94,29 @@ with st.sidebar:
     st.caption("Risk inputs")
     issuer = st.text_input("Issuer", RISK_DEF_ISS)
     year = st.number_input("Year", min_value=2000, max_value=2100, value=RISK_DEF_YR, step=1)
+    stream_risk = st.checkbox("Stream from risk service", value=RISK_STREAM, help="Show sources and summary tokens as the risk service (RISK_BASE_URL) sends them.")
     st.caption("Strategy inputs")
     factor = st.text_input("Factor", STRAT_DEF_FACTOR)
     horizon = st.number_input("Horizon (days)", min_value=1, max_value=20, value=STRAT_DEF_HORIZ, step=1)
+    universe = st.text_input("Universe", STRAT_DEF_UNIVERSE)
+    costs_bps = st.number_input("Costs (bps)", min_value=0.0, max_value=100.0, value=STRAT_DEF_COSTS, step=1.0)
+    sweep_mode = st.checkbox("Parameter sweep", help="Backtest every factor x horizon x cost combination instead of a single run.")
+    background = st.checkbox("Run backtests in background", help="Queue the backtest as a job and keep using the app; progress is polled below.")
+    if sweep_mode:
+        sweep_factors = st.text_input("Factors (comma)", STRAT_DEF_FACTOR)
+        sweep_horizons = st.slider("Horizons (days)", min_value=1, max_value=20, value=(1, 20))
+        sweep_costs = st.text_input("Costs bps (comma)", f"{STRAT_DEF_COSTS:g}")
+    show_timings = st.checkbox("Show stage timings", help="Trace this request and show how long each stage (routing, HTTP, reads, charts, rendering) took.")
     go = st.button("Run")
-
-
-def _plot_sentiment(series_records: list[dict]) -> BytesIO | None:
-    df = pd.DataFrame(series_records)
-    if df.empty:
-        return None
-    buf = BytesIO()
-    fig, ax = plt.subplots(figsize=(7, 3))
-    for t, g in df.groupby("ticker"):
-        tmp = g.sort_values("date")
-        ax.plot(pd.to_datetime(g["date"]), tmp["avg_sentiment"], label=t)
-    ax.set_title("Daily Sentiment Trend")
-    ax.set_ylabel("avg_sentiment")
-    ax.grid(True)
-    ax.legend(loc="upper left", ncol=3, fontsize=8)
-    fig.tight_layout()
-    fig.savefig(buf, format="png", dpi=120)
-    buf.seek(0)
-    return buf
-
-
-def run_sentiment(msa_panel_stats, tickers, dfrom, dto, panel_path):
-    symbols = [s.strip() for s in tickers.split(",") if s.strip()]
-    payload = msa_panel_stats(symbols, dfrom, dto, panel_path=panel_path) if "panel_path" in msa_panel_stats.__code__.co_varnames else msa_panel_stats(symbols, dfrom, dto)
-    stats = payload.get("stats", {})
-    series = payload.get("series", [])
-    img = _plot_sentiment(series)
-    df = pd.DataFrame(series)
-    return stats, img, df
-
-
-def run_risk(risk_summarize, issuer, year, question, risk_data_dir=None):
-    if risk_data_dir:
-        os.environ["RISK_DATA_DIR"] = risk_data_dir
-    payload = risk_summarize(issuer=issuer, year=int(year), question=question)
-    summary = payload.get("summary", "(no summary)")
-    categories = pd.DataFrame(payload.get("categories", []))
-    sources = payload.get("sources", [])
-    return summary, categories, sources
-
-
-def run_strategy(strat_last_metrics, strat_run_bt_from_panel, factor, horizon, panel_path):
-    res = strat_last_metrics()
-    metrics = res.get("metrics", {}) or {}
-    curve_path = res.get("equity_curve_path")
-    if not metrics or metrics.get("IC") is None:
-        res = (
-            strat_run_bt_from_panel(panel_path=panel_path, factor=factor, horizon=int(horizon))
-            if "panel_path" in strat_run_bt_from_panel.__code__.co_varnames
-            else strat_run_bt_from_panel(factor=factor, horizon=int(horizon))
-        )
-        metrics = res.get("metrics", {})
-        curve_path = res.get("equity_curve_path")
-    return metrics, curve_path
+    with st.expander("Shared resources"):
+        # loaded once per process and shared by every session
+        res_stats = REGISTRY.stats()
+        if res_stats:
+            st.dataframe(pd.DataFrame(res_stats), use_container_width=True, hide_index=True)
+        else:
+            st.caption("Nothing loaded yet.")
+        fs = SINGLE_FLIGHT.stats()
+        st.caption(f"Backend calls: {fs['executions']} run, {fs['coalesced']} joined an identical call in flight")
 
 
 def get_api_status():
@@ -172,40 +151,289 @@ def main_block(tool, SENT_ERR, RISK_ERR, STRAT_ERR):
     return result
 
 
-if go:
-    tool, conf, reason = route_query(q, None if force == "Auto" else force)
-    st.caption(f"Routing → **{tool}** (confidence {conf:.2f}). {reason}")
+API_ERRORS = {
+    "sentiment": "Sentiment API not available. Check requirements/tags and reinstall.",
+    "risk": "Risk API not available. Check requirements/tags and reinstall.",
+    "strategy": "Strategy API not available. Check requirements/tags and reinstall.",
+}
 
-    if tool == "sentiment":
-        if SENT_ERR:
-            st.error("Sentiment API not available. Check requirements/tags and reinstall.")
-        else:
-            stats, img, df = run_sentiment(msa_panel_stats, tickers, dfrom, dto, PANEL_PATH)
-            st.subheader("Sentiment")
-            st.write(stats)
-            if img:
-                st.image(img)
-            st.dataframe(df.head(200), use_container_width=True)
 
-    elif tool == "risk":
-        if RISK_ERR:
-            st.error("Risk API not available. Check requirements/tags and reinstall.")
-        else:
-            summary, categories, sources = run_risk(risk_summarize, issuer, year, q, RISK_DATA_DIR)
-            st.subheader("Risk Summary")
-            st.write(summary)
-            st.subheader("Categories")
-            st.dataframe(categories, use_container_width=True)
-            st.subheader("Sources")
-            st.json(sources)
+def _render_sentiment(res):
+    stats, img, df = res
+    st.subheader("Sentiment")
+    cs = SENTIMENT_CACHE.stats()
+    st.caption(f"panel_stats cache: {cs['hits']} hits / {cs['misses']} misses")
+    st.write(stats)
+    if not df.empty:
+        st.line_chart(charts.chart_frame(df), y_label="avg_sentiment")
+    if img:
+        st.fragment(_chart_export)(img)
+    st.dataframe(df.head(200), use_container_width=True)
+    if not df.empty:
+        _render_analytics(df)
 
-    elif STRAT_ERR:
-        st.error("Strategy API not available. Check requirements/tags and reinstall.")
+
+def _chart_export(img):
+    # the PNG is rendered only once asked for; a fragment, so toggling it keeps the results on screen
+    if st.toggle("Export chart (PNG)"):
+        st.download_button("Download chart (PNG)", img(), file_name="sentiment.png", mime="image/png")
+
+
+def _render_analytics(df):
+    from app import analytics
+
+    with st.expander(f"Analytics ({ANALYTICS_WINDOW}-day window)"), span("sentiment.analytics"):
+        feats = analytics.features(df, ANALYTICS_WINDOW)
+        st.caption("Latest value per ticker: trailing mean and z-score, and percentile rank across the selected tickers that day")
+        st.dataframe(feats.groupby("ticker", observed=True).tail(1).set_index("ticker"), use_container_width=True)
+        st.caption("Correlation of daily sentiment (dates where both tickers have a value)")
+        st.dataframe(analytics.correlation_frame(df, min_periods=ANALYTICS_WINDOW).round(2), use_container_width=True)
+
+
+def _render_risk(res):
+    summary, categories, sources = res
+    st.subheader("Risk Summary")
+    if SEMANTIC_CACHE is not None:
+        c = SEMANTIC_CACHE.stats()
+        st.caption(f"Semantic cache: {c['hits']} hits / {c['misses']} misses ({c['hit_rate']:.0%}), {c['latency_saved_s']:.1f}s saved")
+    st.write(summary)
+    st.subheader("Categories")
+    st.dataframe(categories, use_container_width=True)
+    st.subheader("Sources")
+    st.json(sources)
+
+
+def _render_risk_stream(events):
+    # placeholders in the same layout as _render_risk, filled as events arrive
+    st.subheader("Risk Summary")
+    summary_slot = st.empty()
+    metrics_slot = st.empty()
+    st.subheader("Categories")
+    categories_slot = st.empty()
+    st.subheader("Sources")
+    sources_slot = st.empty()
+    summary_slot.caption("Retrieving filings…")
+    text, categories, sources = "", pd.DataFrame(), []
+    for event, data in events:
+        if event == "sources":
+            sources = data
+            sources_slot.json(data)
+        elif event == "categories":
+            categories = pd.DataFrame(data)
+            categories_slot.dataframe(categories, use_container_width=True)
+        elif event == "token":
+            text += data
+            summary_slot.markdown(text + "▌")
+        elif event == "error":
+            summary_slot.error(f"Risk failed: {(data or {}).get('detail', 'stream error')}")
+            return None
+        elif event == "metrics":
+            source = "cache" if data["cached"] else f"first byte {data['ttfb_s']:.2f}s, first token {data['ttft_s']:.2f}s"
+            metrics_slot.caption(f"Streamed: {source}, total {data['total_s']:.2f}s")
+    summary_slot.markdown(text or "(no summary)")
+    return text or "(no summary)", categories, sources
+
+
+def _render_sweep(jobs, mode):
+    from app.sweep import run_sweep
+
+    st.subheader("Strategy Sweep")
+    bar = st.progress(0.0, text=f"0 / {len(jobs)} backtests")
+
+    def progress(done, total, row):
+        label = f"{row['factor']} h={row['horizon']} {row['costs_bps']}bps" + (" (stored)" if row["cached"] else "")
+        bar.progress(done / total, text=f"{done} / {total} backtests · {label}")
+
+    df = run_sweep(jobs, mode=mode, panel_path=STRAT_PANEL_PATH, on_progress=progress)
+    _render_sweep_result(df)
+    return df
+
+
+def _render_sweep_result(df):
+    failed = df["error"].notna().sum()
+    if failed:
+        st.warning(f"{failed} of {len(df)} backtests failed; see the error column.")
+    st.dataframe(df, use_container_width=True, hide_index=True)
+    st.download_button("Download metrics (CSV)", df.to_csv(index=False), file_name="sweep.csv", mime="text/csv")
+
+
+def _render_strategy(res):
+    metrics, curve_path = res
+    st.subheader("Strategy Metrics")
+    if STRATEGY_STORE is not None:
+        cs = STRATEGY_STORE.stats()
+        st.caption(f"Backtest store: {cs['hits']} hits / {cs['misses']} misses, {cs['size']} stored")
+    st.write(metrics)
+    if curve_path and os.path.exists(curve_path):
+        st.image(curve_path, caption="Equity Curve")
     else:
-        metrics, curve_path = run_strategy(strat_last_metrics, strat_run_bt_from_panel, factor, horizon, STRAT_PANEL_PATH)
-        st.subheader("Strategy Metrics")
-        st.write(metrics)
-        if curve_path and os.path.exists(curve_path):
-            st.image(curve_path, caption="Equity Curve")
-        else:
-            st.info("No equity curve image found yet.")
+        st.info("No equity curve image found yet.")
+
+
+def _render_timings(request_trace):
+    rows = request_trace.breakdown()
+    with st.expander(f"Stage timings · {request_trace.root.duration_ms:.0f} ms total", expanded=True):
+        df = pd.DataFrame(rows)
+        df["stage"] = ["\u2003" * d + name for d, name in zip(df.pop("depth"), df["stage"], strict=True)]
+        df["attributes"] = [", ".join(f"{k}={v}" for k, v in a.items()) for a in df["attributes"]]
+        st.dataframe(df, use_container_width=True, hide_index=True, column_config={c: st.column_config.NumberColumn(format="%.1f") for c in ("start_ms", "duration_ms")})
+        if S.TRACING:
+            st.caption(f"Trace `{request_trace.trace_id}` exported to {S.TRACE_FILE}")
+
+
+def _shown(log, key, fn, *args):
+    # renders a part of the Run output and remembers it, so it can be shown again after the
+    # jobs panel reruns the app to stop polling
+    log.setdefault(key, []).append((fn, args))
+    return fn(*args)
+
+
+if go:
+    # one trace per request: shown below when asked for, exported when TRACING=1
+    request_trace = trace("ui.request", query=q) if show_timings or S.TRACING else nullcontext()
+    with request_trace:
+        plan = route_plan(q, None if force == "Auto" else force)
+        shown = {}
+        _shown(
+            shown,
+            "head",
+            st.caption,
+            "Routing → " + " · ".join(f"**{tool}** (confidence {conf:.2f})" for tool, conf, _ in plan) + ". " + " ".join(r for _, _, r in plan),
+        )
+
+        # tickers / years named exactly in the question take precedence over the sidebar;
+        # fuzzy corrections are only suggested, never applied over what the analyst picked
+        symbol_index = get_index(PANEL_PATH, RISK_DATA_DIR)
+        with span("symbols.extract"):
+            entities = symbol_index.extract(q)
+        if entities.exact:
+            tickers, issuer = ",".join(entities.exact), entities.exact[0]
+        if entities.years:
+            year = entities.years[0]
+        if entities.tickers or entities.years or entities.unknown:
+            found = " · ".join([*entities.exact, *map(str, entities.years)])
+            hint = ", ".join(f"{c.query} → {c.symbol}?" for c in entities.corrections if c.symbol not in entities.exact)
+            _shown(
+                shown,
+                "head",
+                st.caption,
+                f"Detected: {found or '—'}"
+                + (f"; did you mean {hint} (not applied, edit the question or sidebar to use it)" if hint else "")
+                + (f"; unrecognised: {', '.join(entities.unknown)}" if entities.unknown else ""),
+            )
+
+        errors = {"sentiment": SENT_ERR, "risk": RISK_ERR, "strategy": STRAT_ERR}
+        risk_ctx = RiskContext(data_dir=RISK_DATA_DIR, issuer=issuer, year=int(year))
+        runners = {
+            "sentiment": lambda: run_sentiment(backends.get("sentiment", "panel_stats"), tickers, dfrom, dto, PANEL_PATH, cache=SENTIMENT_CACHE, index=symbol_index),
+            "risk": lambda: run_risk(backends.get("risk", "summarize_risk"), None, None, q, ctx=risk_ctx, index=symbol_index),
+            "strategy": lambda: run_strategy(
+                backends.get("strategy", "last_metrics"), backends.get("strategy", "run_backtest_from_panel"), factor, horizon, STRAT_PANEL_PATH, universe, costs_bps
+            ),
+        }
+        streamed = stream_risk and any(t == "risk" for t, _, _ in plan)
+        if streamed:
+            errors["risk"] = None  # served over HTTP, the risk package is not needed locally
+        swept = sweep_mode and any(t == "strategy" for t, _, _ in plan)
+        queued = background and any(t == "strategy" for t, _, _ in plan)
+        renderers = {"sentiment": _render_sentiment, "risk": _render_risk, "strategy": _render_strategy}
+        slots = {tool: st.container() for tool, _, _ in plan}  # keep plan order while risk streams first
+
+        with ThreadPoolExecutor(max_workers=1) as ex:
+            inline = {"risk"} if streamed else set()
+            inline |= {"strategy"} if swept or queued else set()
+            pending = ex.submit(wrap(run_plan), plan, {t: fn for t, fn in runners.items() if not errors[t] and t not in inline})
+            if streamed:
+                with slots["risk"], MCPClient() as client, span("risk.stream"):
+                    try:
+                        stream_ctx = replace(risk_ctx, issuer=symbol_index.resolve(risk_ctx.issuer, "issuer").symbol)
+                        res = _render_risk_stream(client.risk_summarize_stream(query=q, ctx=stream_ctx))
+                        if res is not None:
+                            shown["risk"] = [(_render_risk, (res,))]
+                    except Exception as e:
+                        _shown(shown, "risk", st.error, f"Risk failed: {e}")
+            if swept or queued:
+                with slots["strategy"]:
+                    try:
+                        from app.sweep import grid
+
+                        if swept:
+                            factors = [f.strip() for f in sweep_factors.split(",") if f.strip()]
+                            costs = [float(c) for c in sweep_costs.split(",") if c.strip()]
+                            jobs = grid(factors, range(sweep_horizons[0], sweep_horizons[1] + 1), costs, universe)
+                        else:
+                            jobs = grid([factor], [int(horizon)], [costs_bps], universe)
+                        if queued:
+                            from app.jobs import get_queue
+
+                            kind, params = ("sweep", {"jobs": jobs}) if swept else ("backtest", jobs[0])
+                            job_id = get_queue().submit(kind, {**params, "panel_path": STRAT_PANEL_PATH})
+                            st.session_state.setdefault("strategy_jobs", []).append(job_id)
+                            _shown(shown, "strategy", st.info, f"Strategy {kind} queued as job `{job_id}`; see Background backtests below.")
+                        else:
+                            # local process pool when the strategy package is installed, else the strategy service
+                            with span("strategy.sweep", jobs=len(jobs)):
+                                df = _render_sweep(jobs, "process" if not STRAT_ERR else "http")
+                            shown["strategy"] = [(st.subheader, ("Strategy Sweep",)), (_render_sweep_result, (df,))]
+                    except Exception as e:
+                        _shown(shown, "strategy", st.error, f"Strategy sweep failed: {e}")
+            results = pending.result()
+
+        for tool, _, _ in plan:
+            if tool in inline:
+                continue
+            with slots[tool], span(f"{tool}.render"):
+                if errors[tool]:
+                    _shown(shown, tool, st.error, API_ERRORS[tool])
+                elif isinstance(results[tool], Exception):
+                    _shown(shown, tool, st.error, f"{tool.capitalize()} failed: {results[tool]}")
+                else:
+                    _shown(shown, tool, renderers[tool], results[tool])
+        # parts in display order: captions, then tools in plan order
+        st.session_state["last_run"] = {k: shown[k] for k in ["head", *(t for t, _, _ in plan)] if k in shown}
+
+    if show_timings:
+        _render_timings(request_trace)
+elif st.session_state.pop("replay_run", False):
+    # the jobs panel reran the app once its jobs finished: show the last Run again
+    for parts in st.session_state.get("last_run", {}).values():
+        for fn, args in parts:
+            fn(*args)
+
+
+def _jobs_view(polling: bool = False) -> None:
+    from app.jobs import FINAL_STATES, get_queue
+
+    queue = get_queue()
+    statuses = [j for j in (queue.status(i) for i in reversed(st.session_state["strategy_jobs"][-10:])) if j]
+    st.subheader("Background backtests")
+    for job in statuses:
+        p = job["params"]
+        label = f"`{job['id']}` {job['kind']}: " + (f"{len(p['jobs'])} backtests" if job["kind"] == "sweep" else f"{p['factor']} h={p['horizon']} {p['costs_bps']}bps")
+        cols = st.columns([4, 1])
+        cols[0].progress(job["progress"] or 0.0, text=f"{label} · {job['state']}" + (f" · {job['message']}" if job["message"] else ""))
+        if job["state"] not in FINAL_STATES and cols[1].button("Cancel", key=f"cancel-{job['id']}"):
+            queue.cancel(job["id"])
+        if job["state"] == "failed":
+            st.error(job["error"])
+        elif job["state"] == "done":
+            with st.expander(f"Result {job['id']}"):
+                res = queue.result(job["id"])
+                if job["kind"] == "sweep":
+                    st.dataframe(pd.DataFrame(res["rows"]), use_container_width=True, hide_index=True)
+                else:
+                    _render_strategy((res["metrics"], res["equity_curve_path"]))
+    if polling and all(job["state"] in FINAL_STATES for job in statuses):
+        # nothing left to poll: a full rerun declares this fragment again without run_every,
+        # and shows the last Run's output again instead of clearing it
+        st.session_state["replay_run"] = True
+        st.rerun()
+
+
+if st.session_state.get("strategy_jobs"):
+    from app.jobs import FINAL_STATES, get_queue
+
+    # poll only while something is still queued or running; reruns never block on a job, and
+    # the polling fragment stops itself once the last active job finishes
+    active = any((j := get_queue().status(i)) and j["state"] not in FINAL_STATES for i in st.session_state["strategy_jobs"][-10:])
+    st.fragment(_jobs_view, run_every=2 if active else None)(active)
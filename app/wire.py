@@ -0,0 +1,86 @@
+# research_copilot/app/wire.py
+"""
+Arrow IPC wire format for panel_stats payloads.
+
+JSON ships ``series`` as one dict per row and needs a dict-to-frame conversion on arrival.
+The Arrow stream format ships it as columns instead: dates as date32, tickers dictionary-
+encoded, values as float64, with the rest of the payload (``stats`` etc.) as JSON in the
+schema metadata. Decoding maps the received buffer without copying and converts each
+column to pandas in one step. Clients ask for it via ``Accept`` and fall back to JSON when
+the server (or a missing pyarrow) cannot provide it; JSON records are converted with
+:func:`series_frame`, so callers get the same DataFrame whichever format was used.
+"""
+
+import importlib.util
+import json
+from typing import Any
+
+import pandas as pd
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+JSON = "application/json"
+_META_KEY = b"payload"
+
+
+def available() -> bool:
+    """True if pyarrow is installed (checked without importing it)."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def accept_header(fmt: str = "arrow") -> str:
+    """``Accept`` value for ``fmt`` ("arrow" or "json"); Arrow is only offered when it can be decoded."""
+    return f"{ARROW_STREAM}, {JSON};q=0.9" if fmt == "arrow" and available() else JSON
+
+
+def media_type(content_type: Any) -> str:
+    """Bare media type of a Content-Type header value ("" if missing)."""
+    return content_type.split(";", 1)[0].strip().lower() if isinstance(content_type, str) else ""
+
+
+def encode_panel_stats(payload: dict) -> bytes:
+    """Encodes a panel_stats payload (``series`` as records or a DataFrame) as an Arrow IPC stream."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    series = payload.get("series")
+    df = series if isinstance(series, pd.DataFrame) else pd.DataFrame(series or [], columns=["date", "ticker", "avg_sentiment"])
+    dates = df["date"] if pd.api.types.is_datetime64_any_dtype(df["date"]) else pd.to_datetime(df["date"], format="ISO8601")
+    table = pa.table(
+        {
+            "date": pa.array(dates.to_numpy().astype("datetime64[D]")),  # -> date32
+            "ticker": pc.dictionary_encode(pa.array(df["ticker"], pa.string())),
+            "avg_sentiment": pa.array(df["avg_sentiment"], pa.float64()),
+        }
+    )
+    meta = json.dumps({k: v for k, v in payload.items() if k != "series"}, default=str).encode()
+    table = table.replace_schema_metadata({_META_KEY: meta})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def decode_panel_stats(data: bytes) -> dict:
+    """
+    Decodes :func:`encode_panel_stats` output: the payload with ``series`` as a DataFrame
+    (date as datetime64, ticker as categorical, avg_sentiment as float64).
+    """
+    import pyarrow as pa
+
+    table = pa.ipc.open_stream(pa.py_buffer(data)).read_all()  # references ``data``, no copy
+    meta = json.loads((table.schema.metadata or {}).get(_META_KEY, b"{}"))
+    series = table.to_pandas(date_as_object=False, split_blocks=True)
+    return {**meta, "series": series}
+
+
+def series_frame(records: list[dict] | None) -> pd.DataFrame:
+    """
+    JSON ``series`` records as the frame :func:`decode_panel_stats` returns: date as
+    datetime64[ms], ticker as categorical, avg_sentiment as float64 (other columns as sent).
+    """
+    df = pd.DataFrame(records or [], columns=None if records else ["date", "ticker", "avg_sentiment"])
+    return df.assign(
+        date=pd.to_datetime(df["date"], format="ISO8601").astype("datetime64[ms]"),
+        ticker=df["ticker"].astype(str).astype("category"),
+        avg_sentiment=df["avg_sentiment"].astype("float64"),
+    )
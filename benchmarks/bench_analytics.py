@@ -0,0 +1,82 @@
+# research_copilot/benchmarks/bench_analytics.py
+"""
+Sentiment analytics on a synthetic panel (default 5,000 tickers x 5 years of business
+days, ~10% missing): the vectorized matrix functions in app.analytics vs. per-ticker
+pandas groupby equivalents. The correlation baseline (DataFrame.corr) is O(pairs) in
+Python-level loops, so it is timed on the first --corr-baseline tickers only.
+
+    python benchmarks/bench_analytics.py --tickers 5000 --years 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import analytics
+
+
+def synthetic_series(tickers: int, years: int, missing: float = 0.1, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2020-01-01", periods=252 * years)
+    names = np.array([f"T{i:05d}" for i in range(tickers)])
+    factor = rng.normal(0, 0.1, (len(dates), 1))  # shared market mood, so correlations are not all ~0
+    values = np.clip(factor + rng.normal(0, 0.3, (len(dates), tickers)), -1, 1)
+    keep = rng.random(values.shape) >= missing
+    di, ti = np.nonzero(keep)
+    return pd.DataFrame({"date": dates[di], "ticker": names[ti], "avg_sentiment": values[keep]})
+
+
+def timed(label: str, fn, results: dict) -> object:
+    t0 = time.perf_counter()
+    out = fn()
+    results[label] = time.perf_counter() - t0
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tickers", type=int, default=5000)
+    ap.add_argument("--years", type=int, default=5)
+    ap.add_argument("--window", type=int, default=20)
+    ap.add_argument("--corr-baseline", type=int, default=300, help="tickers for the DataFrame.corr baseline")
+    args = ap.parse_args()
+
+    series = synthetic_series(args.tickers, args.years)
+    w, mp = args.window, max(args.window // 2, 2)
+    print(f"rows: {len(series):,} ({args.tickers:,} tickers x {series['date'].nunique():,} days)")
+
+    vec: dict[str, float] = {}
+    mat = timed("pivot", lambda: analytics.to_matrix(series), vec)
+    timed("rolling mean", lambda: analytics.rolling_mean(mat.values, w, mp), vec)
+    timed("rolling z-score", lambda: analytics.zscore(mat.values, w, mp), vec)
+    timed("cross-sectional rank", lambda: analytics.cs_rank(mat.values), vec)
+    timed("correlation", lambda: analytics.correlation(mat.values, w), vec)
+
+    base: dict[str, float] = {}
+    by_ticker = series.sort_values(["ticker", "date"]).groupby("ticker")["avg_sentiment"]
+    timed("rolling mean", lambda: by_ticker.rolling(w, min_periods=mp).mean(), base)
+    timed("rolling z-score", lambda: by_ticker.transform(lambda s: (s - s.rolling(w, min_periods=mp).mean()) / s.rolling(w, min_periods=mp).std()), base)
+    timed("cross-sectional rank", lambda: series.groupby("date")["avg_sentiment"].rank(pct=True), base)
+    sub = mat.frame().iloc[:, : args.corr_baseline]
+    timed("correlation", lambda: sub.corr(min_periods=w), base)
+    sub_vec: dict[str, float] = {}
+    timed("correlation", lambda: analytics.correlation(sub.to_numpy(), w), sub_vec)
+
+    print(f"{'':24}{'vectorized':>12}{'pandas':>12}")
+    for k, v in vec.items():
+        b = f"{base[k]:11.2f}s" if k in base and k != "correlation" else f"{'-':>12}"
+        print(f"{k:24}{v:11.2f}s{b}")
+    label = f"correlation @ {sub.shape[1]}"
+    print(f"{label:24}{sub_vec['correlation']:11.2f}s{base['correlation']:11.2f}s")
+
+
+if __name__ == "__main__":
+    main()
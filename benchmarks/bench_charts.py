@@ -0,0 +1,84 @@
+# research_copilot/benchmarks/bench_charts.py
+"""
+Chart rendering cost as the date range grows: the previous per-request pyplot PNG of every
+point vs. the decimated chart frame (what st.line_chart receives) and the cached PNG export.
+
+    python benchmarks/bench_charts.py --tickers 20
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import charts
+
+
+def series(years: int, n_tickers: int) -> list[dict]:
+    dates = pd.date_range("2000-01-01", periods=365 * years).strftime("%Y-%m-%d")
+    vals = np.random.default_rng(0).normal(size=(n_tickers, len(dates)))
+    return [{"date": d, "ticker": f"T{i:03d}", "avg_sentiment": float(v)} for i in range(n_tickers) for d, v in zip(dates, vals[i], strict=True)]
+
+
+def legacy_png(records: list[dict]) -> BytesIO:
+    df = pd.DataFrame(records)
+    buf = BytesIO()
+    fig, ax = plt.subplots(figsize=(7, 3))
+    for t, g in df.groupby("ticker"):
+        tmp = g.sort_values("date")
+        ax.plot(pd.to_datetime(g["date"]), tmp["avg_sentiment"], label=t)
+    ax.legend(loc="upper left", ncol=3, fontsize=8)
+    fig.tight_layout()
+    fig.savefig(buf, format="png", dpi=120)
+    return buf  # figure intentionally left open, as before
+
+
+def measure(fn, *args) -> tuple[float, float]:
+    """(wall ms, peak traced MiB); timed in a separate run so tracing does not skew it."""
+    t0 = time.perf_counter()
+    fn(*args)
+    dt = time.perf_counter() - t0
+    tracemalloc.start()
+    fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return dt * 1e3, peak / 2**20
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tickers", type=int, default=20)
+    args = ap.parse_args()
+
+    print(f"{'years':>5} {'points':>9} | {'legacy png':>19} | {'chart frame':>19} | {'png (cold)':>10} | {'png (cached)':>19}")
+    for years in (1, 5, 10, 20):
+        recs = series(years, args.tickers)
+        legacy = measure(legacy_png, recs)
+        frame = measure(charts.chart_frame, recs)
+        charts._PNG_CACHE.clear()
+        t0 = time.perf_counter()
+        charts.png(recs)
+        cold = ((time.perf_counter() - t0) * 1e3, 0.0)
+        cached = measure(charts.png, recs)
+        print(
+            f"{years:>5} {len(recs):>9,} | {legacy[0]:8.0f}ms {legacy[1]:6.1f}MiB | {frame[0]:8.0f}ms {frame[1]:6.1f}MiB"
+            f" | {cold[0]:8.0f}ms | {cached[0]:8.0f}ms {cached[1]:6.1f}MiB"
+        )
+    print(f"open pyplot figures left by legacy path: {len(plt.get_fignums())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# research_copilot/benchmarks/bench_mcp_transport.py
+"""
+Per-call latency of MCPClient's pooled keep-alive transport vs. bare ``requests.post``
+(one new TCP connection per call), against a local stub sentiment server.
+
+    python benchmarks/bench_mcp_transport.py --calls 500
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.mcp_client import MCPClient
+from app.stub_server import StubServer
+
+BODY = {"tickers": ["AAPL", "MSFT", "NVDA"], "date_from": "2024-01-01", "date_to": "2024-12-31"}
+
+
+def _timed(fn, calls: int) -> list[float]:
+    out = []
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        fn()
+        out.append((time.perf_counter() - t0) * 1e3)
+    return out
+
+
+def _report(label: str, ms: list[float]) -> None:
+    q = statistics.quantiles(ms, n=100)
+    print(f"{label:<10} mean={statistics.fmean(ms):7.3f}ms  p50={q[49]:7.3f}ms  p99={q[98]:7.3f}ms")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--calls", type=int, default=500)
+    args = ap.parse_args()
+
+    with StubServer() as srv:
+        url = f"{srv.url}/panel_stats"
+
+        def bare() -> None:
+            r = requests.post(url, json=BODY, timeout=60)
+            r.raise_for_status()
+            r.json()
+
+        client = MCPClient(base_urls={"sentiment": srv.url}, cache=None)
+        pooled = lambda: client.sentiment_panel_stats(BODY["tickers"], BODY["date_from"], BODY["date_to"])  # noqa: E731
+
+        bare()
+        pooled()  # warm-up both paths
+        c0 = srv.connections
+        bare_ms = _timed(bare, args.calls)
+        c1 = srv.connections
+        pooled_ms = _timed(pooled, args.calls)
+        c2 = srv.connections
+        client.close()
+
+    _report("bare", bare_ms)
+    _report("pooled", pooled_ms)
+    print(f"connections opened: bare={c1 - c0} pooled={c2 - c1}")
+    print(f"speedup (mean): {statistics.fmean(bare_ms) / statistics.fmean(pooled_ms):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# research_copilot/benchmarks/bench_startup.py
+"""
+Cold-start cost of the Streamlit UI, each measured in a fresh interpreter:
+
+* import time per module (``python -X importtime``), heaviest first;
+* time-to-first-render: running the script once through Streamlit's AppTest harness.
+
+    python benchmarks/bench_startup.py --top 15
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+RENDER = """
+import time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app/ui_streamlit.py", default_timeout=120).run()
+assert not at.exception, at.exception
+print(time.perf_counter() - t0)
+"""
+
+
+def import_times(module: str) -> list[tuple[int, int, int, str]]:
+    """(self_us, cumulative_us, depth, module) for every module imported by ``import module``."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, raw = line[len("import time:") :].split("|")
+        depth = (len(raw) - len(raw.lstrip()) - 1) // 2
+        rows.append((int(self_us), int(cum_us), depth, raw.strip()))
+    return rows
+
+
+def first_render_s() -> float:
+    proc = subprocess.run([sys.executable, "-c", RENDER], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--top", type=int, default=15)
+    args = ap.parse_args()
+
+    rows = import_times("app.ui_streamlit")
+    total = next(cum for _, cum, _, name in rows if name == "app.ui_streamlit")
+    print(f"import app.ui_streamlit: {total / 1e3:8.1f} ms")
+    print(f"{'cumulative':>12} {'self':>10}  module imported directly by the UI")
+    direct = [r for r in rows if r[2] == 1]
+    for self_us, cum_us, _, name in sorted(direct, key=lambda r: -r[1])[: args.top]:
+        print(f"{cum_us / 1e3:10.1f}ms {self_us / 1e3:8.1f}ms  {name}")
+    print(f"time-to-first-render:    {first_render_s() * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# research_copilot/benchmarks/bench_symbols.py
+"""
+Symbol resolution on a synthetic universe (default 6,000 tickers): exact hits, corrected
+misspellings, rejected names (first and repeated) and query extraction, per call.
+
+    python benchmarks/bench_symbols.py --tickers 6000
+"""
+
+import argparse
+import contextlib
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.symbols import SymbolIndex, UnknownSymbol
+
+
+def per_call_us(fn, names: list[str]) -> float:
+    t0 = time.perf_counter()
+    for n in names:
+        with contextlib.suppress(UnknownSymbol):
+            fn(n)
+    return (time.perf_counter() - t0) / len(names) * 1e6
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tickers", type=int, default=6000)
+    ap.add_argument("--n", type=int, default=2000)
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    universe = sorted({"".join(rng.choices(string.ascii_uppercase, k=rng.randint(2, 5))) for _ in range(args.tickers)})
+    t0 = time.perf_counter()
+    index = SymbolIndex(universe)
+    print(f"build: {(time.perf_counter() - t0) * 1e3:.1f} ms for {len(index):,} symbols")
+
+    exact = rng.choices(universe, k=args.n)
+    typos = [t[:-1] + rng.choice(string.ascii_uppercase) + t[-1] for t in rng.choices([u for u in universe if len(u) >= 4], k=args.n)]
+    bad = ["".join(rng.choices(string.digits + "XYZQ", k=6)) for _ in range(args.n)]
+    queries = [f"Summarize {a} and {b} 2023 risks vs {c} sentiment" for a, b, c in zip(exact, typos, bad, strict=True)]
+
+    print(f"exact:            {per_call_us(index.resolve, exact):8.2f} us")
+    print(f"misspelled:       {per_call_us(index.resolve, typos):8.2f} us")
+    print(f"unknown (first):  {per_call_us(index.resolve, bad):8.2f} us")
+    print(f"unknown (repeat): {per_call_us(index.resolve, bad):8.2f} us")
+    print(f"extract:          {per_call_us(index.extract, queries):8.2f} us per query")
+
+
+if __name__ == "__main__":
+    main()
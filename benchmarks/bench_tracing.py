@@ -0,0 +1,53 @@
+# research_copilot/benchmarks/bench_tracing.py
+"""
+Cost of a span: route_query with tracing off (no active trace, TRACING unset), inside an
+active trace, and without any span (the compiled matcher it wraps), per call.
+
+    python benchmarks/bench_tracing.py --n 200000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import tracing
+from app.router import _KEYWORD_RE, _route_hits, route_query
+
+QUERY = "What are NVDA 2023 risks and how did sentiment perform last quarter?"
+
+
+def bare(q: str) -> tuple[str, float, str]:
+    return _route_hits(frozenset(_KEYWORD_RE.findall(q.lower())))
+
+
+def per_call_us(fn, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn(QUERY)
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=200_000)
+    args = ap.parse_args()
+
+    tracing.S.TRACING = False
+    per_call_us(route_query, 10_000)  # warm up
+    base = per_call_us(bare, args.n)
+    off = per_call_us(route_query, args.n)
+    with tracing.trace("bench", export=False) as tr:
+        on = per_call_us(route_query, args.n)
+    print(f"calls:        {args.n:,}")
+    print(f"no span:      {base:8.2f} us/call")
+    print(f"tracing off:  {off:8.2f} us/call  (+{off - base:.2f} us)")
+    print(f"tracing on:   {on:8.2f} us/call  (+{on - base:.2f} us, {len(tr.spans) - 1:,} spans recorded)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# research_copilot/benchmarks/bench_wire.py
+"""
+panel_stats payload size and client-side decode time: JSON records (json + DataFrame
+construction) vs. the Arrow IPC stream format, for growing ticker counts over --years years.
+With --http the same comparison runs end to end through MCPClient against the stub server.
+
+    python benchmarks/bench_wire.py --years 5
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import stub_server, wire
+from app.mcp_client import MCPClient
+
+
+def payload(n_tickers: int, years: int) -> dict:
+    dates = pd.bdate_range("2020-01-01", periods=252 * years).strftime("%Y-%m-%d")
+    vals = np.random.default_rng(0).normal(size=n_tickers * len(dates)).round(6)
+    tickers = [f"T{i:04d}" for i in range(n_tickers)]
+    series = [{"date": d, "ticker": t, "avg_sentiment": float(v)} for (t, d), v in zip(((t, d) for t in tickers for d in dates), vals, strict=True)]
+    return {"stats": {"avg_sentiment": float(vals.mean()), "n_rows": len(series), "n_tickers": n_tickers}, "series": series}
+
+
+def best_ms(fn, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1e3
+
+
+def decode_json(data: bytes) -> pd.DataFrame:
+    return pd.DataFrame(json.loads(data)["series"])
+
+
+def decode_arrow(data: bytes) -> pd.DataFrame:
+    return wire.decode_panel_stats(data)["series"]
+
+
+def http_ms(client: MCPClient, tickers: list[str]) -> float:
+    return best_ms(lambda: pd.DataFrame(client.sentiment_panel_stats(tickers, "2020-01-01", "2024-12-31")["series"]))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--years", type=int, default=5)
+    ap.add_argument("--tickers", type=int, nargs="+", default=[10, 100, 500, 1000])
+    ap.add_argument("--http", action="store_true", help="also time MCPClient round trips against the stub server")
+    args = ap.parse_args()
+
+    print(f"{'tickers':>7} {'rows':>10} | {'json':>9} {'gzip':>9} {'decode':>9} | {'arrow':>9} {'gzip':>9} {'decode':>9} | {'size':>6} {'speed':>6}")
+    for n in args.tickers:
+        p = payload(n, args.years)
+        j = json.dumps(p).encode()
+        a = wire.encode_panel_stats(p)
+        tj, ta = best_ms(decode_json, j), best_ms(decode_arrow, a)
+        print(
+            f"{n:>7} {len(p['series']):>10,} | {len(j) / 2**20:7.1f}MB {len(gzip.compress(j, 1)) / 2**20:7.1f}MB {tj:7.0f}ms"
+            f" | {len(a) / 2**20:7.1f}MB {len(gzip.compress(a, 1)) / 2**20:7.1f}MB {ta:7.1f}ms | {len(j) / len(a):5.1f}x {tj / ta:5.0f}x"
+        )
+
+    if args.http:
+        # the stub answers one row per ticker; serve the generated series instead
+        # (timings include the stub encoding the response on every call)
+        n = args.tickers[-1]
+        p = payload(n, args.years)
+        stub_server.ROUTES[("POST", "/panel_stats")] = lambda _body: p
+        tickers = [f"T{i:04d}" for i in range(n)]
+        with stub_server.StubServer() as srv:
+            for fmt in ("json", "arrow"):
+                with MCPClient(base_urls={"sentiment": srv.url}, cache=None, wire=fmt) as client:
+                    print(f"http {fmt:>5}: {http_ms(client, tickers):7.0f}ms per panel_stats call ({n} tickers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# test_analytics.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import analytics
+
+
+@pytest.fixture
+def wide() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(120, 12)).round(1)  # rounded: plenty of ties for the ranks
+    values[rng.random(values.shape) < 0.2] = np.nan
+    return pd.DataFrame(values, index=pd.bdate_range("2024-01-01", periods=120, name="date"), columns=pd.Index([f"T{i:02d}" for i in range(12)], name="ticker"))
+
+
+@pytest.fixture
+def series(wide) -> pd.DataFrame:
+    long = wide.stack().rename("avg_sentiment").reset_index()
+    long["date"] = long["date"].dt.strftime("%Y-%m-%d")
+    return long.dropna().sample(frac=1, random_state=0)  # order must not matter
+
+
+def test_to_matrix(series, wide) -> None:
+    """
+    Test that records are scattered into the date x ticker matrix, duplicates averaged.
+    """
+    dup = pd.DataFrame({"date": ["2024-01-01"], "ticker": ["T00"], "avg_sentiment": [wide.iloc[0, 0] + 1.0 if not np.isnan(wide.iloc[0, 0]) else 1.0]})
+    mat = analytics.to_matrix(series)
+    pd.testing.assert_frame_equal(mat.frame(), wide, check_freq=False)
+    both = analytics.to_matrix(pd.concat([series, dup]))
+    first = series[(series["date"] == "2024-01-01") & (series["ticker"] == "T00")]["avg_sentiment"]
+    assert both.values[0, 0] == pytest.approx((first.sum() + dup["avg_sentiment"].item()) / (len(first) + 1))
+    assert analytics.to_matrix([]).values.shape == (0, 0)
+
+
+def test_rolling_and_zscore_match_pandas(series, wide) -> None:
+    """
+    Test that cumulative-sum rolling statistics and z-scores equal pandas' NaN-aware versions.
+    """
+    v = analytics.to_matrix(series).values
+    np.testing.assert_allclose(analytics.rolling_mean(v, 10, 5), wide.rolling(10, min_periods=5).mean(), atol=1e-12)
+    np.testing.assert_allclose(analytics.rolling_std(v, 10, 5), wide.rolling(10, min_periods=5).std(), atol=1e-12)
+    np.testing.assert_allclose(analytics.zscore(v), (wide - wide.mean()) / wide.std(), atol=1e-12)
+    rm, rs = wide.rolling(10, min_periods=5).mean(), wide.rolling(10, min_periods=5).std()
+    np.testing.assert_allclose(analytics.zscore(v, 10, 5), ((wide - rm) / rs).replace([np.inf, -np.inf], np.nan), atol=1e-9)
+    with pytest.raises(ValueError):
+        analytics.rolling_mean(v, 0)
+
+
+def test_cs_rank_matches_pandas(wide) -> None:
+    """
+    Test that cross-sectional ranks average ties and skip NaN like DataFrame.rank(axis=1).
+    """
+    np.testing.assert_allclose(analytics.cs_rank(wide.to_numpy()), wide.rank(axis=1, pct=True))
+    np.testing.assert_allclose(analytics.cs_rank(wide.to_numpy(), pct=False), wide.rank(axis=1))
+
+
+def test_correlation_matches_pandas(series, wide) -> None:
+    """
+    Test that the pairwise-complete correlation matrix equals DataFrame.corr, min_periods included.
+    """
+    np.testing.assert_allclose(analytics.correlation(wide.to_numpy(), 80), wide.corr(min_periods=80), atol=1e-12)
+    corr = analytics.correlation_frame(series, min_periods=20)
+    assert list(corr.index) == list(wide.columns)
+    np.testing.assert_allclose(np.diag(corr), 1.0)
+
+
+def test_features(series) -> None:
+    """
+    Test the long feature frame: one row per observed value, ranks within (0, 1].
+    """
+    feats = analytics.features(series, window=10)
+    assert len(feats) == len(series)
+    assert list(feats.columns) == ["date", "ticker", "avg_sentiment", "rolling_mean", "rolling_z", "cs_rank"]
+    assert feats["cs_rank"].between(0, 1, inclusive="right").all()
+    assert feats["rolling_mean"].notna().any()
+    assert analytics.features([]).empty
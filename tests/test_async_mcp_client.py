@@ -0,0 +1,57 @@
+# test_async_mcp_client.py
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.async_mcp_client import AsyncMCPClient
+from app.mcp_client import MCPClient
+from app.stub_server import StubServer
+
+
+def test_single_operation() -> None:
+    """
+    Test that an async operation returns the service's JSON payload.
+    """
+    with StubServer() as srv:
+        client = AsyncMCPClient(MCPClient(base_urls={"risk": srv.url}))
+        res = asyncio.run(client.risk_summarize("NVDA", 2023))
+        assert res["issuer"] == "NVDA"
+        client.close()
+
+
+def test_gather_latency_is_slowest_call() -> None:
+    """
+    Test that fan-out to three services takes about as long as the slowest one, not the sum.
+    """
+    with StubServer(latency=0.3) as s1, StubServer(latency=0.3) as s2, StubServer(latency=0.3) as s3:
+        client = AsyncMCPClient(MCPClient(base_urls={"sentiment": s1.url, "risk": s2.url, "strategy": s3.url}))
+        t0 = time.perf_counter()
+        out = client.gather_sync(
+            {
+                "sentiment": ("sentiment_panel_stats", {"tickers": ["NVDA"], "date_from": "2024-01-01", "date_to": "2024-03-31"}),
+                "risk": ("risk_summarize", {"issuer": "NVDA", "year": 2023}),
+                "strategy": ("strategy_last_metrics", {}),
+            }
+        )
+        elapsed = time.perf_counter() - t0
+        client.close()
+    assert all(r["ok"] for r in out.values())
+    assert elapsed < 0.8
+
+
+def test_gather_budget_times_out_one_call() -> None:
+    """
+    Test that a call over its budget reports a timeout while the others still succeed.
+    """
+    with StubServer(latency=1.0) as slow, StubServer() as fast:
+        client = AsyncMCPClient(MCPClient(base_urls={"risk": slow.url, "strategy": fast.url}))
+        out = client.gather_sync({"risk": ("risk_summarize", {"issuer": "NVDA", "year": 2023}), "strategy": ("strategy_last_metrics", {})}, budgets={"risk": 0.2})
+        client.close()
+    assert out["strategy"]["ok"]
+    assert not out["risk"]["ok"]
+    assert "timed out" in out["risk"]["error"]
@@ -0,0 +1,41 @@
+# test_backends.py
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import backends
+from app.resources import REGISTRY
+
+
+def test_probe_missing_package(monkeypatch) -> None:
+    """
+    Test that probing a missing package returns an error message instead of raising.
+    """
+    monkeypatch.setitem(backends.BACKENDS, "sentiment", ("no_such_pkg_xyz.public_api", "Sentiment API"))
+    assert backends.probe("sentiment") == "Sentiment API import failed: No module named 'no_such_pkg_xyz'"
+
+
+def test_probe_does_not_import(monkeypatch) -> None:
+    """
+    Test that probing an installed package does not import it.
+    """
+    monkeypatch.setitem(backends.BACKENDS, "risk", ("xmlrpc.client", "Risk API"))
+    monkeypatch.delitem(sys.modules, "xmlrpc.client", raising=False)
+    monkeypatch.delitem(sys.modules, "xmlrpc", raising=False)
+    assert backends.probe("risk") is None
+    assert "xmlrpc.client" not in sys.modules
+
+
+def test_get_imports_once(monkeypatch) -> None:
+    """
+    Test that get() imports the backend module on first use and reuses it afterwards.
+    """
+    monkeypatch.setitem(backends.BACKENDS, "strategy", ("json", "Strategy API"))
+    monkeypatch.setattr(REGISTRY, "_entries", {})
+    fn = backends.get("strategy", "dumps")
+    assert fn({"a": 1}) == '{"a": 1}'
+    assert backends.load("strategy") is backends.load("strategy")
+    assert REGISTRY.is_loaded("backend.strategy")
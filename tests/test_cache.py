@@ -0,0 +1,51 @@
+# test_cache.py
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.cache import TTLCache, panel_stats_key
+
+
+def test_lru_eviction_and_stats() -> None:
+    """
+    Test that the least recently used entry is evicted and hits/misses are counted.
+    """
+    c = TTLCache(maxsize=2, ttl=0)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1
+    c.set("c", 3)
+    assert c.get("b") is None
+    assert c.get("a") == 1 and c.get("c") == 3
+    assert c.stats()["hits"] == 3
+    assert c.stats()["misses"] == 1
+
+
+def test_ttl_expiry() -> None:
+    """
+    Test that entries older than the TTL are treated as misses.
+    """
+    c = TTLCache(maxsize=4, ttl=0.05)
+    c.set("k", "v")
+    assert c.get("k") == "v"
+    time.sleep(0.06)
+    assert c.get("k") is None
+    assert len(c) == 0
+
+
+def test_panel_key_sorted_and_mtime(tmp_path) -> None:
+    """
+    Test that the key ignores ticker order and changes when the panel file is rewritten.
+    """
+    p = tmp_path / "panel.parquet"
+    p.write_bytes(b"v1")
+    k1 = panel_stats_key(["MSFT", "AAPL"], "2024-01-01", "2024-12-31", str(p))
+    assert k1 == panel_stats_key(["AAPL", "MSFT"], "2024-01-01", "2024-12-31", str(p))
+    p.write_bytes(b"v2-longer")
+    os.utime(p, ns=(0, 1))
+    assert panel_stats_key(["AAPL", "MSFT"], "2024-01-01", "2024-12-31", str(p)) != k1
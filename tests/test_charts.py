@@ -0,0 +1,58 @@
+# test_charts.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import charts
+
+
+def _series(n_days: int, tickers: list[str]) -> list[dict]:
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2015-01-01", periods=n_days).strftime("%Y-%m-%d")
+    return [{"date": d, "ticker": t, "avg_sentiment": float(v)} for t in tickers for d, v in zip(dates, rng.normal(size=n_days), strict=True)]
+
+
+def test_decimate_bounds_points_and_keeps_extremes() -> None:
+    """
+    Test that long series are reduced to the pixel budget while keeping each ticker's min and max.
+    """
+    wide = charts.to_wide(_series(5000, ["AAPL", "MSFT"]))
+    out = charts.minmax_decimate(wide, 400)
+    assert len(out) <= 400
+    assert list(out.columns) == ["AAPL", "MSFT"]
+    assert np.allclose(out.max().to_numpy(), wide.max().to_numpy())
+    assert np.allclose(out.min().to_numpy(), wide.min().to_numpy())
+    assert out.index.is_monotonic_increasing
+
+
+def test_short_series_untouched() -> None:
+    """
+    Test that series shorter than the budget are returned as is.
+    """
+    wide = charts.to_wide(_series(30, ["NVDA"]))
+    pd.testing.assert_frame_equal(charts.minmax_decimate(wide, 400), wide)
+
+
+def test_png_is_cached_and_leaves_no_pyplot_figures(monkeypatch) -> None:
+    """
+    Test that identical exports render once and no pyplot figures stay open.
+    """
+    import matplotlib.pyplot as plt
+
+    renders = []
+    real = charts._render_png
+    monkeypatch.setattr(charts, "_render_png", lambda wide: renders.append(1) or real(wide))
+    series = _series(60, ["AAPL", "TSLA"])
+    a = charts.png(series)
+    b = charts.png(series)
+    assert a.read()[:4] == b"\x89PNG"
+    assert b.read() == charts.png(series).read()
+    assert len(renders) == 1
+    assert plt.get_fignums() == []
+    assert charts.png([]) is None
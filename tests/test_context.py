@@ -0,0 +1,91 @@
+# test_context.py
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.context import RiskContext, call_risk_backend
+from app.mcp_client import MCPClient
+
+
+def test_resolve_defaults() -> None:
+    """
+    Test that missing issuer/year fall back to the context and explicit ones win.
+    """
+    ctx = RiskContext(issuer="NVDA", year=2024)
+    assert ctx.resolve(None, None) == ("NVDA", 2024)
+    assert ctx.resolve("AAPL", "2023") == ("AAPL", 2023)
+
+
+def test_concurrent_calls_keep_their_data_dir(monkeypatch) -> None:
+    """
+    Test that parallel requests see their own data dir and never touch os.environ.
+    """
+    monkeypatch.delenv("RISK_DATA_DIR", raising=False)
+    barrier = threading.Barrier(8)
+
+    def summarize(issuer, year, question, data_dir=None):
+        barrier.wait(timeout=5)  # all calls in flight at once
+        return {"issuer": issuer, "data_dir": data_dir, "env": os.environ.get("RISK_DATA_DIR")}
+
+    with ThreadPoolExecutor(8) as ex:
+        futs = [ex.submit(call_risk_backend, summarize, f"T{i}", 2023, "q", RiskContext(data_dir=f"/data/{i}")) for i in range(8)]
+        results = [f.result() for f in futs]
+    assert [r["data_dir"] for r in results] == [f"/data/{i}" for i in range(8)]
+    assert all(r["env"] is None for r in results)
+
+
+def test_env_fallback_is_serialized(monkeypatch) -> None:
+    """
+    Test that env-reading backends each see their own data dir and the environment is restored.
+    """
+    monkeypatch.setenv("RISK_DATA_DIR", "/default")
+
+    def summarize(issuer, year, question):
+        return os.environ["RISK_DATA_DIR"]
+
+    with ThreadPoolExecutor(8) as ex:
+        futs = [ex.submit(call_risk_backend, summarize, "AAPL", 2023, "q", RiskContext(data_dir=f"/data/{i}")) for i in range(32)]
+        assert [f.result() for f in futs] == [f"/data/{i}" for i in range(32)]
+    assert os.environ["RISK_DATA_DIR"] == "/default"
+
+
+def test_env_fallback_without_override_runs_concurrently(monkeypatch) -> None:
+    """
+    Test that env-reading calls needing no override (or the current value) are not serialized, and
+    a call with another data dir waits for them.
+    """
+    monkeypatch.setenv("RISK_DATA_DIR", "/default")
+    barrier = threading.Barrier(4)
+
+    def summarize(issuer, year, question):
+        if issuer != "OTHER":
+            barrier.wait(timeout=5)  # all four in flight at once, or this times out
+        return os.environ["RISK_DATA_DIR"]
+
+    dirs = [None, "/default", None, "/default"]
+    with ThreadPoolExecutor(5) as ex:
+        futs = [ex.submit(call_risk_backend, summarize, "AAPL", 2023, "q", RiskContext(data_dir=d)) for d in dirs]
+        other = ex.submit(call_risk_backend, summarize, "OTHER", 2023, "q", RiskContext(data_dir="/other"))
+        assert [f.result() for f in futs] == ["/default"] * 4
+        assert other.result() == "/other"
+    assert os.environ["RISK_DATA_DIR"] == "/default"
+
+
+def test_mcp_client_sends_context() -> None:
+    """
+    Test that MCPClient.risk_summarize takes issuer defaults, data dir and timeout from the context.
+    """
+    client = MCPClient(risk_cache=None, semantic_cache=None)
+    with patch("requests.Session.post") as mock_post:
+        mock_post.return_value.json.return_value = {"summary": "s"}
+        client.risk_summarize(query="top risks", ctx=RiskContext(data_dir="/filings", issuer="NVDA", year=2024, timeout=5))
+    _, kwargs = mock_post.call_args
+    assert kwargs["json"] == {"issuer": "NVDA", "year": 2024, "query": "top risks", "data_dir": "/filings"}
+    assert kwargs["timeout"] == 5
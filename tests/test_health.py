@@ -0,0 +1,122 @@
+# test_health.py
+import sys
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import health
+from app.health import CircuitOpen, HealthRegistry, ServiceHealth
+from app.mcp_client import MCPClient
+from app.stub_server import StubServer
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_fails_fast_and_recovers() -> None:
+    """
+    Test that consecutive 5xx open the circuit, calls then fail without reaching the server,
+    and a successful trial call after the reset period closes it again.
+    """
+    clock = FakeClock()
+    reg = HealthRegistry(failures=3, reset_after_s=30, clock=clock)
+    with StubServer() as srv, MCPClient(base_urls={"strategy": srv.url}, health=reg) as client:
+        srv.fail_next(3)
+        for _ in range(3):
+            with pytest.raises(requests.HTTPError):
+                client.strategy_last_metrics()
+        h = reg.snapshot()[srv.url]
+        assert (h["state"], h["errors"]) == ("open", 3)
+
+        t0 = time.perf_counter()
+        with pytest.raises(CircuitOpen, match="strategy service unavailable"):
+            client.strategy_last_metrics()
+        assert time.perf_counter() - t0 < 0.05 and srv.requests == 3
+
+        clock.now = 31.0
+        assert "metrics" in client.strategy_last_metrics()  # half-open trial
+        h = reg.snapshot()[srv.url]
+        assert (h["state"], h["rejected"], srv.requests) == ("closed", 1, 4)
+
+
+def test_failed_trial_reopens_and_client_errors_do_not_count() -> None:
+    """
+    Test that a failing half-open trial re-opens the circuit, and that 4xx answers are not failures.
+    """
+    clock = FakeClock()
+    h = ServiceHealth("risk", failures=2, reset_after_s=10, clock=clock)
+    for _ in range(5):
+        with h.call("/x") as call:
+            call.status(404)
+    assert h.state == "closed"
+    for _ in range(2):
+        with pytest.raises(OSError), h.call("/x"):
+            raise OSError("connection refused")
+    clock.now = 11.0
+    with h.call("/x") as call:
+        call.status(503)
+    assert h.state == "open" and h.snapshot()["retry_in_s"] == pytest.approx(10.0)
+
+
+def test_adaptive_timeout_follows_p99() -> None:
+    """
+    Test that the timeout stays at the default until enough samples exist, then tracks p99 x factor within bounds.
+    """
+    h = ServiceHealth("sentiment", factor=3, min_timeout_s=0.5)
+    for _ in range(health.MIN_SAMPLES - 1):
+        with h.call("/panel_stats"):
+            pass
+    assert h.timeout("/panel_stats", 60) == 60
+    h._latency["/panel_stats"].extend([0.2] * 50)
+    assert h.timeout("/panel_stats", 60) == pytest.approx(0.6)
+    assert h.timeout("/panel_stats", 0.3) == 0.3  # never above the default
+    assert h.timeout("/other", 60) == 60
+    assert health.percentile([1, 2, 3, 4], 50) == 2.5 and health.percentile([], 99) is None
+
+
+def test_hung_service_times_out_at_learned_timeout() -> None:
+    """
+    Test that once latencies are known, a stalled request is cut at p99 x factor instead of the fixed default.
+    """
+    reg = HealthRegistry(factor=3, min_timeout_s=0.2)
+    with StubServer() as srv, MCPClient(base_urls={"strategy": srv.url}, health=reg, adaptive_timeouts=True) as client:
+        for _ in range(health.MIN_SAMPLES):
+            client.strategy_last_metrics()
+        srv.slow_next(1, seconds=2.0)
+        t0 = time.perf_counter()
+        with pytest.raises(requests.RequestException, match="timed out"):
+            client.strategy_last_metrics()
+        assert time.perf_counter() - t0 < 1.0
+        assert reg.snapshot()[srv.url]["errors"] == 1
+        assert "metrics" in client.strategy_last_metrics(timeout=5)  # an explicit timeout is kept
+
+
+def test_timeouts_feed_the_window_so_the_timeout_recovers() -> None:
+    """
+    Test that a call running into its timeout is recorded at the timeout value, so the learned
+    timeout grows back when the service slows down instead of staying at the old p99.
+    """
+    h = ServiceHealth("risk", failures=100, factor=2, min_timeout_s=0.005)
+    for _ in range(health.MIN_SAMPLES):
+        with h.call("/summarize_risk"):
+            pass
+    timeouts = [h.timeout("/summarize_risk", 120)]
+    for _ in range(3):
+        with pytest.raises(requests.Timeout), h.call("/summarize_risk", timeouts[-1]):
+            time.sleep(timeouts[-1])
+            raise requests.Timeout("read timed out")
+        assert h.latencies("/summarize_risk")[-1] == timeouts[-1]
+        timeouts.append(h.timeout("/summarize_risk", 120))
+    assert timeouts == sorted(set(timeouts)) and timeouts[0] == 0.005
+    assert h.snapshot()["errors"] == 3
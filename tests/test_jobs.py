@@ -0,0 +1,77 @@
+# test_jobs.py
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.jobs import JobQueue
+
+
+def _echo(params, job):
+    job.progress(0.5, "half way")
+    return {"echo": params["x"]}
+
+
+def _boom(_params, _job):
+    raise ZeroDivisionError("division by zero")
+
+
+def test_submit_poll_result(tmp_path) -> None:
+    """
+    Test that a job runs in the background and its progress, state and result can be polled.
+    """
+    q = JobQueue(str(tmp_path / "jobs.sqlite"), runners={"echo": _echo, "boom": _boom})
+    ok, bad = q.submit("echo", {"x": 1}), q.submit("boom", {})
+    assert q.wait(ok, timeout=5)["state"] == "done"
+    assert q.result(ok) == {"echo": 1}
+    assert q.status(ok)["progress"] == 1.0 and q.status(ok)["message"] == "half way"
+    failed = q.wait(bad, timeout=5)
+    assert failed["state"] == "failed" and failed["error"].startswith("ZeroDivisionError")
+    assert q.result(bad) is None
+    assert [j["id"] for j in q.recent()] == [bad, ok]
+    q.shutdown()
+
+
+def test_bounded_pool_and_cancel(tmp_path) -> None:
+    """
+    Test that jobs beyond the worker limit wait as queued, and both queued and running jobs can be cancelled.
+    """
+    started, release = threading.Event(), threading.Event()
+
+    def slow(params, job):
+        started.set()
+        while not release.wait(0.01):
+            job.progress(0.1)  # raises once cancelled
+        return "finished"
+
+    q = JobQueue(str(tmp_path / "jobs.sqlite"), max_workers=1, runners={"slow": slow})
+    running, waiting = q.submit("slow", {}), q.submit("slow", {})
+    assert started.wait(5)
+    assert q.status(running)["state"] == "running" and q.status(waiting)["state"] == "queued"
+    assert q.cancel(waiting)
+    assert q.status(waiting)["state"] == "cancelled"
+    assert q.cancel(running)
+    assert q.wait(running, timeout=5)["state"] == "cancelled"
+    assert not q.cancel(running)
+    q.shutdown()
+
+
+def test_restart_resumes_queued_jobs(tmp_path) -> None:
+    """
+    Test that a new queue on the same table runs jobs left queued and fails those left running.
+    """
+    db = str(tmp_path / "jobs.sqlite")
+    JobQueue(db, runners={}).shutdown()
+    with sqlite3.connect(db) as conn:
+        now = time.time()
+        conn.execute("INSERT INTO jobs (id, kind, params, state, progress, submitted) VALUES ('a', 'echo', '{\"x\": 2}', 'queued', 0, ?)", (now,))
+        conn.execute("INSERT INTO jobs (id, kind, params, state, progress, submitted) VALUES ('b', 'echo', '{\"x\": 3}', 'running', 0.4, ?)", (now,))
+    q = JobQueue(db, runners={"echo": _echo})
+    assert q.wait("a", timeout=5)["state"] == "done" and q.result("a") == {"echo": 2}
+    assert q.status("b")["state"] == "failed" and q.status("b")["error"] == "interrupted by restart"
+    q.shutdown()
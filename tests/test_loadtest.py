@@ -0,0 +1,73 @@
+# test_loadtest.py
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import loadtest
+
+
+@pytest.fixture
+def log(tmp_path) -> str:
+    path = tmp_path / "queries.jsonl"
+    records = [
+        {"query": "Summarize AAPL 2023 risks with citations"},
+        {"q": "Show sentiment trend for NVDA"},
+        {"title": "Sharpe and IC for sentiment last year", "body": "ignored"},
+        {"question": "anything", "tool": "strategy"},
+        {"body": "no query text"},
+    ]
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\n\n")
+    return str(path)
+
+
+def test_load_queries(log) -> None:
+    """
+    Test that the query text is taken from the first known field and lines without one are skipped.
+    """
+    queries = loadtest.load_queries(log)
+    assert [q["query"] for q in queries] == ["Summarize AAPL 2023 risks with citations", "Show sentiment trend for NVDA", "Sharpe and IC for sentiment last year", "anything"]
+    assert queries[3]["tool"] == "strategy"
+
+
+def test_run_load_reports_per_tool(log) -> None:
+    """
+    Test that requests are routed, errors are counted per tool and percentiles are reported.
+    """
+
+    def fail(_q):
+        raise RuntimeError("down")
+
+    calls = {"risk": lambda _q: time.sleep(0.01), "sentiment": lambda _q: None, "strategy": fail}
+    results = loadtest.run_load(loadtest.load_queries(log), calls, n=40, concurrency=4)
+    assert len(results) == 40 and results["latency_ms"].notna().all()
+    rep = loadtest.report(results).set_index("tool")
+    assert list(rep.index) == ["risk", "sentiment", "strategy", "router", "total"]
+    assert rep.loc["risk", "requests"] == 10 and rep.loc["risk", "p50_ms"] >= 10
+    assert rep.loc["strategy", "error_rate"] == 1.0 and rep.loc["sentiment", "errors"] == 0
+    assert rep.loc["total", "errors"] == 20 and rep.loc["router", "requests"] == 40
+    assert (rep["p50_ms"] <= rep["p95_ms"]).all() and (rep["p95_ms"] <= rep["p99_ms"]).all()
+
+
+def test_open_loop_paces_arrivals(log) -> None:
+    """
+    Test that a fixed arrival rate spreads the requests over time.
+    """
+    results = loadtest.run_load(loadtest.load_queries(log), dict.fromkeys(("risk", "sentiment", "strategy"), lambda _q: None), n=11, rate=100)
+    assert results.attrs["wall_s"] >= 0.1
+
+
+def test_main_against_stubs(log, capsys) -> None:
+    """
+    Test the command line end to end against stub services, including the error-rate gate.
+    """
+    assert loadtest.main([log, "--n", "20", "--latency", "0.001"]) == 0
+    assert "p99_ms" in capsys.readouterr().out
+    assert loadtest.main([log, "--n", "20", "--error-rate", "strategy=1", "--max-error-rate", "0.5"]) == 1
+    assert "FAIL strategy: error rate 100.0%" in capsys.readouterr().out
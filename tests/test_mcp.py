@@ -3,20 +3,24 @@ import sys
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+import requests
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from app.mcp_client import MCPClient
+from app.stub_server import StubServer
 
 
 def test_sentiment_panel_stats() -> None:
     """
     Test that MCPClient.sentiment_panel_stats handles the response correctly.
-    Mocks the requests.post method to return a predefined JSON response.
+    Mocks the pooled Session.post method to return a predefined JSON response.
     :return:
     """
-    with patch("requests.post") as mock_post:
+    with patch("requests.Session.post") as mock_post:
         mock_post.return_value.json.return_value = {"stats": 1}
         mock_post.return_value.raise_for_status = lambda: None
         client = MCPClient()
@@ -27,11 +31,11 @@ def test_sentiment_panel_stats() -> None:
 def test_risk_summarize() -> None:
     """
     Test that MCPClient.risk_summarize handles the response correctly.
-    Mocks the requests.post method to return a predefined JSON response.
+    Mocks the pooled Session.post method to return a predefined JSON response.
     :return:
     """
     client = MCPClient()
-    with patch("requests.post") as mock_post:
+    with patch("requests.Session.post") as mock_post:
         mock_post.return_value.json.return_value = {"risk": "ok"}
         mock_post.return_value.raise_for_status = lambda: None
         result = client.risk_summarize("AAPL", 2023)
@@ -41,11 +45,11 @@ def test_risk_summarize() -> None:
 def test_strategy_last_metrics() -> None:
     """
     Test that MCPClient.strategy_last_metrics handles the response correctly.
-    Mocks the requests.get method to return a predefined JSON response.
+    Mocks the pooled Session.get method to return a predefined JSON response.
     :return:
     """
     client = MCPClient()
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.return_value.json.return_value = {"metrics": "ok"}
         mock_get.return_value.raise_for_status = lambda: None
         result = client.strategy_last_metrics()
@@ -55,12 +59,78 @@ def test_strategy_last_metrics() -> None:
 def test_strategy_run_backtest() -> None:
     """
     Test that MCPClient.strategy_run_backtest handles the response correctly.
-    Mocks the requests.post method to return a predefined JSON response.
+    Mocks the pooled Session.post method to return a predefined JSON response.
     :return:
     """
     client = MCPClient()
-    with patch("requests.post") as mock_post:
+    with patch("requests.Session.post") as mock_post:
         mock_post.return_value.json.return_value = {"backtest": "ok"}
         mock_post.return_value.raise_for_status = lambda: None
         result = client.strategy_run_backtest()
         assert "backtest" in result
+
+
+def test_sessions_are_pooled_per_service() -> None:
+    """
+    Test that each service gets its own session, reused across calls.
+    """
+    client = MCPClient(pool_size=4)
+    s = client.session("sentiment")
+    assert client.session("sentiment") is s
+    assert client.session("risk") is not s
+    adapter = s.get_adapter("http://localhost:8601")
+    assert adapter._pool_maxsize == 4
+    client.close()
+
+
+def test_keep_alive_reuses_connection() -> None:
+    """
+    Test that repeated calls against a local stub server share one TCP connection.
+    """
+    with StubServer() as srv:
+        client = MCPClient(base_urls={"sentiment": srv.url, "strategy": srv.url}, cache=None)
+        for _ in range(5):
+            assert "stats" in client.sentiment_panel_stats(["AAPL"], "2024-01-01", "2024-01-31")
+        assert srv.requests == 5
+        assert srv.connections == 1
+        client.close()
+
+
+def test_retry_on_idempotent_get() -> None:
+    """
+    Test that GET calls are retried on 503 when retries are enabled, and POSTs are not.
+    """
+    with StubServer() as srv:
+        client = MCPClient(retries=2, backoff=0, base_urls={"strategy": srv.url})
+        srv.fail_next(1)
+        assert "metrics" in client.strategy_last_metrics()
+        srv.fail_next(1)
+        with pytest.raises(requests.HTTPError):
+            client.strategy_run_backtest()
+        client.close()
+
+
+def test_sentiment_panel_stats_cached() -> None:
+    """
+    Test that identical panel_stats calls are served from the cache after the first request.
+    """
+    from app.cache import TTLCache
+
+    with StubServer() as srv:
+        cache = TTLCache(maxsize=8, ttl=60)
+        client = MCPClient(base_urls={"sentiment": srv.url}, cache=cache)
+        client.sentiment_panel_stats(["NVDA", "AAPL"], "2024-01-01", "2024-03-31")
+        client.sentiment_panel_stats(["AAPL", "NVDA"], "2024-01-01", "2024-03-31")
+        assert srv.requests == 1
+        assert cache.stats()["hits"] == 1
+        client.close()
+
+
+def test_sentiment_panel_stats_not_cached_by_default() -> None:
+    """
+    Test that a client only caches panel_stats when given a cache, so clients never share one implicitly.
+    """
+    with StubServer() as srv, MCPClient(base_urls={"sentiment": srv.url}) as client:
+        for _ in range(2):
+            client.sentiment_panel_stats(["NVDA"], "2024-01-01", "2024-03-31")
+        assert client.cache is None and srv.requests == 2
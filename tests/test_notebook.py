@@ -0,0 +1,103 @@
+# test_notebook.py
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import context, notebook
+from app.config import S
+from app.mcp_client import MCPClient
+from app.strategy_store import StrategyStore
+from app.stub_server import StubServer
+
+QUERIES = [
+    {"query": "Summarize AAPL 2023 risks with citations", "issuer": "AAPL", "year": 2023},
+    {"query": "Show sentiment trend for NVDA", "tickers": ["NVDA"]},
+    {"query": "Sharpe and IC for sentiment last year", "tool": "strategy"},
+]
+
+
+def fake_calls() -> dict:
+    def strategy(_q):
+        raise RuntimeError("no strategy package")
+
+    return {
+        "risk": lambda q: {"summary": f"summary for {q['issuer']}", "categories": [{"label": "Liquidity"}], "sources": ["10-K"]},
+        "sentiment": lambda q: {"stats": {"avg_sentiment": 0.1, "tickers": ",".join(q["tickers"])}, "series_rows": 3, "chart_png": b"\x89PNG"},
+        "strategy": strategy,
+    }
+
+
+def test_export_bundle(tmp_path) -> None:
+    """
+    Test that every query lands in the Markdown, notebook and parquet outputs, failures included.
+    """
+    summary = notebook.export(QUERIES, str(tmp_path), calls=fake_calls(), concurrency=2, title="Nightly")
+    assert (summary["queries"], summary["ok"], summary["errors"]) == (3, 2, 1)
+
+    md = (tmp_path / "notebook.md").read_text()
+    assert md.startswith("# Nightly")
+    assert "summary for AAPL" in md and "| Liquidity |" in md
+    assert "![sentiment](assets/000001_sentiment.png)" in md and (tmp_path / "assets" / "000001_sentiment.png").read_bytes() == b"\x89PNG"
+    assert "> **Error:** RuntimeError: no strategy package" in md
+
+    nb = json.loads((tmp_path / "notebook.ipynb").read_text())
+    assert nb["nbformat"] == 4 and len(nb["cells"]) == 4
+    assert {c["id"] for c in nb["cells"]} == {"title", "q0", "q1", "q2"}
+
+    df = pd.read_parquet(tmp_path / "results.parquet").sort_values("n")
+    assert list(df["tool"]) == ["risk", "sentiment", "strategy"]
+    assert list(df["status"]) == ["ok", "ok", "error"]
+    assert json.loads(df["stats"].iloc[1])["tickers"] == "NVDA"
+
+
+def test_export_reads_queries_lazily(tmp_path) -> None:
+    """
+    Test that the query stream is only read a bounded distance ahead of the written results.
+    """
+    read = []
+    written = []
+
+    def queries():
+        for i in range(50):
+            read.append(i)
+            yield {"query": f"risk {i}", "issuer": "AAPL"}
+
+    def on_result(rec):
+        written.append(rec["n"])
+        assert len(read) - len(written) <= 2 * 2 + 1
+
+    summary = notebook.export(queries(), str(tmp_path), formats=["parquet"], calls=fake_calls(), concurrency=2, on_result=on_result)
+    assert summary["queries"] == 50 and sorted(written) == list(range(50))
+    assert len(pd.read_parquet(tmp_path / "results.parquet")) == 50
+
+
+def test_export_rejects_unknown_format(tmp_path) -> None:
+    """
+    Test that an unknown output format fails before any query runs.
+    """
+    with pytest.raises(ValueError, match="unknown format"):
+        notebook.export(QUERIES, str(tmp_path), formats=["pdf"], calls=fake_calls())
+
+
+def test_export_over_http(tmp_path, monkeypatch) -> None:
+    """
+    Test the real tool functions end to end against stub services.
+    """
+    monkeypatch.setattr(notebook, "STRATEGY_STORE", StrategyStore(str(tmp_path / "backtests")))
+    monkeypatch.setattr(notebook, "RISK_CACHE", None)
+    with StubServer() as srv, MCPClient(base_urls=dict.fromkeys(("sentiment", "risk", "strategy"), srv.url), risk_cache=None, semantic_cache=None) as client:
+        seen = []
+        real = client.risk_summarize
+        client.risk_summarize = lambda *a, **kw: seen.append((kw.get("ctx"), context._env_users > 0)) or real(*a, **kw)
+        summary = notebook.export(QUERIES, str(tmp_path / "out"), formats=["md"], calls=notebook.tool_calls("http", client))
+    assert summary["errors"] == 0, (tmp_path / "out" / "notebook.md").read_text()
+    assert seen and all(ctx is not None and ctx.data_dir == S.RISK_DATA_DIR and not locked for ctx, locked in seen)
+    md = (tmp_path / "out" / "notebook.md").read_text()
+    assert "Stub summary for AAPL 2023" in md and "| IC |" in md
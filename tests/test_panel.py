@@ -0,0 +1,65 @@
+# test_panel.py
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import panel
+
+
+@pytest.fixture
+def panel_file(tmp_path) -> str:
+    """
+    A panel sorted by ticker then date, one row group per ticker, plus an unused column.
+    """
+    dates = pd.date_range("2024-01-01", "2024-03-31", freq="D")
+    frames = [pd.DataFrame({"date": dates, "ticker": t, "avg_sentiment": i / 10, "headline": "x" * 50}) for i, t in enumerate(["AAPL", "MSFT", "NVDA", "TSLA"])]
+    path = tmp_path / "panel.parquet"
+    pq.write_table(pa.Table.from_pandas(pd.concat(frames, ignore_index=True), preserve_index=False), path, row_group_size=len(dates))
+    return str(path)
+
+
+def test_select_row_groups_prunes_by_ticker_and_date(panel_file) -> None:
+    """
+    Test that row groups outside the ticker/date filters are skipped.
+    """
+    pf = panel.open_panel(panel_file)
+    assert pf.metadata.num_row_groups == 4
+    assert panel.select_row_groups(pf, ["MSFT", "TSLA"]) == [1, 3]
+    assert panel.select_row_groups(pf, None, "2025-01-01", None) == []
+
+
+def test_read_panel_filters_and_prunes_columns(panel_file) -> None:
+    """
+    Test that only the requested rows and panel columns are returned.
+    """
+    df = panel.read_panel(panel_file, ["NVDA"], "2024-02-01", "2024-02-29")
+    assert list(df.columns) == ["date", "ticker", "avg_sentiment"]
+    assert set(df["ticker"]) == {"NVDA"}
+    assert len(df) == 29
+
+
+def test_panel_stats_payload(panel_file) -> None:
+    """
+    Test that panel_stats returns the sentiment service payload shape.
+    """
+    out = panel.panel_stats(panel_file, ["AAPL", "MSFT"], "2024-01-01", "2024-01-10")
+    assert out["stats"] == {"avg_sentiment": pytest.approx(0.05), "n_news": 20}
+    assert len(out["series"]) == 20
+    assert out["series"][0] == {"date": "2024-01-01", "ticker": "AAPL", "avg_sentiment": 0.0}
+
+
+def test_can_serve(panel_file, tmp_path) -> None:
+    """
+    Test that can_serve checks the file exists and has the panel columns.
+    """
+    assert panel.can_serve(panel_file)
+    assert not panel.can_serve(str(tmp_path / "missing.parquet"))
+    assert not panel.can_serve(panel_file, columns=("date", "score"))
@@ -0,0 +1,100 @@
+# test_panel_index.py
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import panel_index
+
+
+def _news(days: pd.DatetimeIndex, tickers: list[str]) -> pd.DataFrame:
+    # two headlines per ticker per day, at 09:00 and 15:00
+    rows = [{"date": d + pd.Timedelta(hours=h), "ticker": t, "sentiment": 0.1 * i + (0.2 if h == 15 else 0.0)} for d in days for i, t in enumerate(tickers) for h in (9, 15)]
+    return pd.DataFrame(rows)
+
+
+def _write(path: Path, frames: list[pd.DataFrame]) -> None:
+    # one row group per frame, as an appending writer would produce
+    with pq.ParquetWriter(path, pa.Schema.from_pandas(frames[0], preserve_index=False)) as w:
+        for f in frames:
+            w.write_table(pa.Table.from_pandas(f, preserve_index=False))
+
+
+def test_store_aggregates_raw_news(tmp_path) -> None:
+    """
+    Test that the store serves daily (ticker, date) averages of raw intraday rows.
+    """
+    path = tmp_path / "news_labeled.parquet"
+    _write(path, [_news(pd.date_range("2024-01-01", periods=5), ["AAPL", "MSFT"])])
+    out = panel_index.panel_stats(str(path), ["MSFT"], "2024-01-02", "2024-01-03")
+    assert out["stats"] == {"avg_sentiment": 0.2, "n_news": 4}
+    assert out["series"][0]["date"] == "2024-01-02"
+    assert abs(out["series"][0]["avg_sentiment"] - 0.2) < 1e-12
+    assert panel_index.store_dir(str(path)).is_dir()
+
+
+def test_incremental_update_reads_only_new_row_groups(tmp_path, monkeypatch) -> None:
+    """
+    Test that appended row groups are folded in without reading or re-aggregating earlier ones.
+    """
+    path = tmp_path / "news_labeled.parquet"
+    f1 = _news(pd.date_range("2024-01-01", periods=3), ["AAPL"])
+    _write(path, [f1])
+    panel_index.update(str(path))
+
+    seen, read = [], []
+    real, real_read = panel_index._aggregate, pq.ParquetFile.read_row_group
+    monkeypatch.setattr(panel_index, "_aggregate", lambda pf, groups, vcol: seen.append(groups) or real(pf, groups, vcol))
+    monkeypatch.setattr(pq.ParquetFile, "read_row_group", lambda self, i, **kw: read.append(i) or real_read(self, i, **kw))
+    f2 = _news(pd.date_range("2024-01-03", periods=2), ["AAPL"])
+    _write(path, [f1, f2])
+    out = panel_index.panel_stats(str(path), ["AAPL"], "2024-01-01", "2024-01-31")
+    assert seen == [[1]] and read == [1]  # the indexed prefix is checked from the footer
+    assert len(out["series"]) == 4
+    assert out["stats"]["n_news"] == 10  # 2024-01-03 has rows from both appends
+
+
+def test_rewritten_panel_rebuilds(tmp_path) -> None:
+    """
+    Test that changing already-indexed rows triggers a rebuild instead of double counting.
+    """
+    path = tmp_path / "news_labeled.parquet"
+    _write(path, [_news(pd.date_range("2024-01-01", periods=3), ["AAPL"])])
+    panel_index.update(str(path))
+    _write(path, [_news(pd.date_range("2024-02-01", periods=2), ["NVDA"])])
+    out = panel_index.panel_stats(str(path), None, None, None)
+    assert out["stats"]["n_news"] == 4
+    assert {r["ticker"] for r in out["series"]} == {"NVDA"}
+
+
+def test_rewrite_with_same_sizes_rebuilds(tmp_path) -> None:
+    """
+    Test that rewriting indexed rows with different values but identical row group sizes is detected
+    (from the footer statistics).
+    """
+    path = tmp_path / "news_labeled.parquet"
+    f1 = _news(pd.date_range("2024-01-01", periods=3), ["AAPL", "MSFT"])
+    _write(path, [f1])
+    before = panel_index.panel_stats(str(path), ["AAPL"], None, None)["stats"]["avg_sentiment"]
+    sizes = [pq.ParquetFile(path).metadata.row_group(0).total_byte_size]
+    f2 = f1.assign(sentiment=f1["sentiment"] + 0.5)
+    _write(path, [f2])
+    assert [pq.ParquetFile(path).metadata.row_group(0).total_byte_size] == sizes
+    after = panel_index.panel_stats(str(path), ["AAPL"], None, None)["stats"]["avg_sentiment"]
+    assert after != before and abs(after - f2[f2.ticker == "AAPL"]["sentiment"].mean()) < 1e-12
+
+
+def test_can_index(tmp_path) -> None:
+    """
+    Test that panels without a sentiment column are not indexed.
+    """
+    path = tmp_path / "p.parquet"
+    pq.write_table(pa.table({"date": ["2024-01-01"], "ticker": ["AAPL"], "x": [1]}), path)
+    assert not panel_index.can_index(str(path))
+    assert not panel_index.can_index(None)
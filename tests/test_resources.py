@@ -0,0 +1,49 @@
+# test_resources.py
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.resources import ResourceRegistry
+
+
+def test_concurrent_first_use_loads_once() -> None:
+    """
+    Test that many threads asking for the same resource trigger a single load.
+    """
+    reg = ResourceRegistry()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    reg.register("model", loader)
+    out = []
+    threads = [threading.Thread(target=lambda: out.append(reg.get("model"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert all(o is out[0] for o in out)
+
+
+def test_evict_reloads_and_stats() -> None:
+    """
+    Test that eviction forces a reload and stats report load time and reuse.
+    """
+    reg = ResourceRegistry()
+    counter = iter(range(10))
+    first = reg.get("index", lambda: next(counter))
+    assert reg.get("index") == first
+    (row,) = reg.stats()
+    assert row["loaded"] and row["hits"] == 1 and row["load_time_s"] >= 0
+    reg.evict("index")
+    assert not reg.is_loaded("index")
+    assert reg.get("index") == first + 1
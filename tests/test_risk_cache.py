@@ -0,0 +1,78 @@
+# test_risk_cache.py
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import risk_cache
+from app.risk_cache import RiskCache, normalize_question
+
+
+def _data_dir(tmp_path: Path) -> str:
+    d = tmp_path / "filings" / "AAPL" / "2023"
+    d.mkdir(parents=True)
+    (d / "item_1a.txt").write_text("Risk factors v1")
+    return str(tmp_path / "filings")
+
+
+def test_normalize_question() -> None:
+    """
+    Test that case, spacing and trailing punctuation do not change the key.
+    """
+    assert normalize_question("  Top   RISKS? ") == "top risks"
+
+
+def test_hit_survives_restart(tmp_path) -> None:
+    """
+    Test that a stored summary is served by a fresh cache instance on the same directory.
+    """
+    data = _data_dir(tmp_path)
+    RiskCache(str(tmp_path / "cache")).put("aapl", 2023, "Top risks", data, {"summary": "s"})
+    fresh = RiskCache(str(tmp_path / "cache"))
+    assert fresh.get("AAPL", 2023, "top risks?", data) == {"summary": "s"}
+    assert fresh.get("AAPL", 2022, "top risks", data) is None
+    assert fresh.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_changed_filings_invalidate(tmp_path, monkeypatch) -> None:
+    """
+    Test that modifying a filing makes earlier entries miss and purges them on the next put.
+    """
+    monkeypatch.setattr(risk_cache, "_FINGERPRINTS", risk_cache.TTLCache(ttl=0.0001))
+    data = _data_dir(tmp_path)
+    cache = RiskCache(str(tmp_path / "cache"))
+    cache.put("AAPL", 2023, "top risks", data, {"summary": "old"})
+    f = Path(data) / "AAPL" / "2023" / "item_1a.txt"
+    f.write_text("Risk factors v2, amended")
+    os.utime(f, ns=(1, 1))
+    assert cache.get("AAPL", 2023, "top risks", data) is None
+    cache.put("AAPL", 2023, "top risks", data, {"summary": "new"})
+    assert cache.stats()["size"] == 1
+
+
+def test_no_local_data_dir_is_not_cached(tmp_path) -> None:
+    """
+    Test that nothing is cached when the data dir cannot be fingerprinted.
+    """
+    cache = RiskCache(str(tmp_path / "cache"))
+    cache.put("AAPL", 2023, "top risks", None, {"summary": "s"})
+    assert cache.get("AAPL", 2023, "top risks", None) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_unusable_cache_dir_turns_the_cache_off(tmp_path) -> None:
+    """
+    Test that nothing touches the cache dir until first use, and a dir that cannot be created means misses instead of errors.
+    """
+    lazy = RiskCache(str(tmp_path / "later"))
+    assert not (tmp_path / "later").exists()
+    (tmp_path / "blocker").write_text("a file, not a directory")
+    cache = RiskCache(str(tmp_path / "blocker" / "cache"))
+    data = _data_dir(tmp_path)
+    cache.put("AAPL", 2023, "top risks", data, {"summary": "s"})
+    assert cache.get("AAPL", 2023, "top risks", data) is None
+    assert cache.stats()["size"] == 0 and cache.error
+    assert lazy.stats()["size"] == 0 and (tmp_path / "later" / "risk_cache.sqlite").exists()
@@ -5,7 +5,7 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from app.router import route_query
+from app.router import _keyword_scores, route_plan, route_queries, route_query
 
 
 def test_sentiment_keywords() -> None:
@@ -44,3 +44,47 @@ def test_route_query_override():
     assert tool == "risk"
     assert conf == 1.0
     assert "Forced" in reason
+
+
+def test_route_plan_mixed_query() -> None:
+    """
+    Test that 'route_plan' keeps every matched intent, ranked by confidence.
+    """
+    plan = route_plan("What are NVDA 2023 risks and how did news sentiment perform?")
+    tools = [t for t, _, _ in plan]
+    assert tools == ["sentiment", "risk"]
+    assert abs(sum(c for _, c, _ in plan) - 1.0) < 1e-9
+
+
+def test_route_plan_threshold() -> None:
+    """
+    Test that tools below the threshold are dropped from the plan.
+    """
+    plan = route_plan("news sentiment tone for the 10-k", threshold=0.5)
+    assert [t for t, _, _ in plan] == ["sentiment"]
+
+
+def test_route_plan_override_and_no_match() -> None:
+    """
+    Test that overrides and unmatched queries fall back to a single-tool plan.
+    """
+    assert route_plan("news and risk", override="strategy") == [("strategy", 1.0, "Forced tool = strategy")]
+    assert len(route_plan("hello")) == 1
+
+
+def test_keywords_match_whole_words_only() -> None:
+    """
+    Test that short keywords such as 'ic' do not match inside other words.
+    """
+    assert _keyword_scores("critical cybersecurity topics")["strategy"] == 0
+    assert _keyword_scores("IC of the factor")["strategy"] == 1
+    assert _keyword_scores("top risks in the 10-K")["risk"] == 2
+
+
+def test_route_queries_batch() -> None:
+    """
+    Test that 'route_queries' routes each query like 'route_query'.
+    """
+    batch = ["show news sentiment", "summarize item 1a", "sharpe of the backtest"]
+    assert route_queries(batch) == [route_query(q) for q in batch]
+    assert [t for t, _, _ in route_queries(batch)] == ["sentiment", "risk", "strategy"]
@@ -0,0 +1,89 @@
+# test_semantic_cache.py
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import risk_cache
+from app.semantic_cache import SemanticCache, hashing_embedder
+
+
+def test_hashing_embedder_similarity() -> None:
+    """
+    Test that rewordings score closer than unrelated questions with the fallback embedder.
+    """
+    v = hashing_embedder()(["summarize item 1A risk factors", "summarise Item 1A risk factors", "liquidity and debt covenants"])
+    v /= np.linalg.norm(v, axis=1, keepdims=True)
+    assert v[0] @ v[1] > 0.9 > v[0] @ v[2]
+
+
+def test_near_duplicate_hit_and_stats(tmp_path) -> None:
+    """
+    Test that a reworded question reuses the answer, an unrelated one misses, and saved latency is reported.
+    """
+    d = str(tmp_path)
+    cache = SemanticCache(0.8, embed=hashing_embedder())
+    cache.store("aapl", 2023, "summarize item 1A risk factors", {"summary": "s"}, latency_s=2.5, data_dir=d)
+    assert cache.lookup("AAPL", 2023, "Summarise Item 1A risk factors", d) == {"summary": "s"}
+    assert cache.lookup("AAPL", 2023, "liquidity and debt covenants", d) is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "latency_saved_s": 2.5}
+
+
+def test_scoped_by_issuer_year_and_data_dir(tmp_path) -> None:
+    """
+    Test that answers are never reused across issuers, years or data directories.
+    """
+    a, b = tmp_path / "a", tmp_path / "b"
+    a.mkdir()
+    b.mkdir()
+    cache = SemanticCache(0.5, embed=hashing_embedder())
+    cache.store("AAPL", 2023, "top risks", {"summary": "aapl"}, data_dir=str(a))
+    assert cache.lookup("MSFT", 2023, "top risks", str(a)) is None
+    assert cache.lookup("AAPL", 2022, "top risks", str(a)) is None
+    assert cache.lookup("AAPL", 2023, "top risks", str(b)) is None
+    assert cache.lookup("AAPL", 2023, "top risks", str(a)) == {"summary": "aapl"}
+
+
+def test_no_fingerprint_no_cache() -> None:
+    """
+    Test that nothing is stored or reused for a data dir that cannot be fingerprinted, since such answers would never expire.
+    """
+    cache = SemanticCache(0.5, embed=hashing_embedder())
+    for d in (None, "/no/such/dir"):
+        cache.store("AAPL", 2023, "top risks", {"summary": "aapl"}, data_dir=d)
+        assert cache.lookup("AAPL", 2023, "top risks", d) is None
+    assert not cache._buckets and cache.stats()["hits"] == 0
+
+
+def test_capacity_overwrites_oldest(tmp_path) -> None:
+    """
+    Test that a full bucket drops its oldest answer.
+    """
+    d = str(tmp_path)
+    cache = SemanticCache(0.99, embed=hashing_embedder(), capacity=2)
+    for q in ["top risks", "key risk factors", "liquidity and debt covenants"]:
+        cache.store("AAPL", 2023, q, q, data_dir=d)
+    assert cache.lookup("AAPL", 2023, "top risks", d) is None
+    assert cache.lookup("AAPL", 2023, "liquidity and debt covenants", d) == "liquidity and debt covenants"
+
+
+def test_changed_filing_invalidates_answers(tmp_path, monkeypatch) -> None:
+    """
+    Test that answers stored for a data directory are not reused once a filing in it changes.
+    """
+    monkeypatch.setattr(risk_cache, "_FINGERPRINTS", risk_cache.TTLCache(ttl=0.0001))
+    f = tmp_path / "AAPL_2023_10K.txt"
+    f.write_text("Risk factors v1")
+    cache = SemanticCache(0.8, embed=hashing_embedder())
+    cache.store("AAPL", 2023, "top risks", {"summary": "v1"}, data_dir=str(tmp_path))
+    assert cache.lookup("AAPL", 2023, "top risks", str(tmp_path)) == {"summary": "v1"}
+    f.write_text("Risk factors v2, amended")
+    os.utime(f, ns=(1, 1))
+    assert cache.lookup("AAPL", 2023, "top risks", str(tmp_path)) is None
+    cache.store("AAPL", 2023, "top risks", {"summary": "v2"}, data_dir=str(tmp_path))
+    assert cache.lookup("AAPL", 2023, "top risks", str(tmp_path)) == {"summary": "v2"}
@@ -0,0 +1,90 @@
+# test_singleflight.py
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.mcp_client import MCPClient
+from app.singleflight import SingleFlight
+from app.stub_server import StubServer
+from app.tools import run_risk
+
+
+def _concurrently(n: int, fn) -> list:
+    with ThreadPoolExecutor(max_workers=n) as ex:
+        futs = [ex.submit(fn) for _ in range(n)]
+    return [f.exception() or f.result() for f in futs]
+
+
+def test_identical_calls_share_one_execution() -> None:
+    """
+    Test that concurrent calls with the same key run fn once and all get its result; the key is then forgotten.
+    """
+    flight = SingleFlight()
+    release = threading.Event()
+    runs = []
+
+    def fn():
+        runs.append(1)
+        release.wait(5)
+        return {"n": len(runs)}
+
+    with ThreadPoolExecutor(max_workers=6) as ex:
+        futs = [ex.submit(flight.do, "k", fn) for _ in range(6)]
+        while flight.stats()["coalesced"] < 5:
+            time.sleep(0.005)
+        release.set()
+        results = [f.result() for f in futs]
+    assert len(runs) == 1 and all(r is results[0] for r in results)
+    assert flight.stats() == {"executions": 1, "coalesced": 5, "in_flight": 0}
+    assert flight.do("k", fn) == {"n": 2}
+
+
+def test_errors_reach_every_waiter() -> None:
+    """
+    Test that the leader's exception is raised in every coalesced caller, and different keys do not wait on each other.
+    """
+    flight = SingleFlight()
+
+    def boom():
+        time.sleep(0.2)
+        raise RuntimeError("backend down")
+
+    out = _concurrently(4, lambda: flight.do("k", boom))
+    assert all(isinstance(e, RuntimeError) and str(e) == "backend down" for e in out)
+    assert flight.stats()["executions"] == 1
+    assert flight.do("other", lambda: "ok") == "ok"
+
+
+def test_run_risk_coalesces_backend_calls() -> None:
+    """
+    Test that concurrent identical run_risk calls reach the backend once.
+    """
+    calls = []
+
+    def backend(issuer, year, question):
+        calls.append(issuer)
+        time.sleep(0.2)
+        return {"summary": f"{issuer} {year}"}
+
+    flight = SingleFlight()
+    out = _concurrently(5, lambda: run_risk(backend, "NVDA", 2023, "top risks", cache=None, semantic_cache=None, flight=flight))
+    assert calls == ["NVDA"] and {o[0] for o in out} == {"NVDA 2023"}
+    assert flight.stats()["coalesced"] == 4
+
+
+def test_mcp_client_coalesces_http_calls() -> None:
+    """
+    Test that identical in-flight panel_stats requests from several clients send one HTTP request.
+    """
+    flight = SingleFlight()
+    with StubServer(latency=0.2) as srv:
+        clients = [MCPClient(base_urls={"sentiment": srv.url}, cache=None, single_flight=flight) for _ in range(4)]
+        out = _concurrently(4, lambda: clients.pop().sentiment_panel_stats(["AAPL"], "2024-01-01", "2024-01-31"))
+        assert srv.requests == 1 and all("stats" in o for o in out)
+        assert flight.stats() == {"executions": 1, "coalesced": 3, "in_flight": 0}
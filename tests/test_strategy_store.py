@@ -0,0 +1,55 @@
+# test_strategy_store.py
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.strategy_store import StrategyStore, params_match
+
+
+def test_params_match() -> None:
+    """
+    Test that every requested parameter must be reported and equal, compared numerically where possible.
+    """
+    assert not params_match({"metrics": {"IC": 0.1}}, "SENT_L1", 1)
+    assert not params_match({"metrics": {"factor": "SENT_L1", "horizon": "1"}, "params": {"costs_bps": 10}}, "SENT_L1", 1, "SP500", 10.0)
+    assert params_match({"metrics": {"factor": "SENT_L1", "horizon": "1"}, "params": {"costs_bps": 10, "universe": "SP500"}}, "SENT_L1", 1, "SP500", 10.0)
+    assert not params_match({"metrics": {"factor": "SENT_L1", "horizon": 5}}, "SENT_L1", 1)
+
+
+def test_round_trip_and_private_curve(tmp_path) -> None:
+    """
+    Test that a stored backtest is found for the same parameters only and keeps its own equity curve copy.
+    """
+    panel = tmp_path / "panel.parquet"
+    panel.write_bytes(b"v1")
+    curve = tmp_path / "equity_curve.png"
+    curve.write_bytes(b"png1")
+    store = StrategyStore(str(tmp_path / "backtests"))
+
+    stored = store.put("SENT_L1", 1, "SP500", 10, str(panel), {"metrics": {"IC": 0.3}, "equity_curve_path": str(curve)})
+    curve.write_bytes(b"png2")  # backend overwrites its report on the next run
+    hit = store.get("SENT_L1", 1, "SP500", 10.0, str(panel))
+    assert hit["metrics"] == {"IC": 0.3}
+    assert hit["equity_curve_path"] == stored["equity_curve_path"] != str(curve)
+    assert Path(hit["equity_curve_path"]).read_bytes() == b"png1"
+    assert store.get("SENT_L1", 5, "SP500", 10, str(panel)) is None
+    assert store.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_panel_change_invalidates(tmp_path) -> None:
+    """
+    Test that a modified panel no longer matches stored results, and unversioned panels are never stored.
+    """
+    panel = tmp_path / "panel.parquet"
+    panel.write_bytes(b"v1")
+    store = StrategyStore(str(tmp_path / "backtests"))
+    store.put("SENT_L1", 1, "SP500", 10, str(panel), {"metrics": {"IC": 0.3}})
+    panel.write_bytes(b"v2 longer")
+    os.utime(panel, ns=(0, 10**18))
+    assert store.get("SENT_L1", 1, "SP500", 10, str(panel)) is None
+    assert store.put("SENT_L1", 1, "SP500", 10, "missing.parquet", {"metrics": {}}) == {"metrics": {}}
+    assert store.get("SENT_L1", 1, "SP500", 10, "missing.parquet") is None
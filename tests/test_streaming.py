@@ -0,0 +1,83 @@
+# test_streaming.py
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.context import RiskContext
+from app.mcp_client import MCPClient
+from app.semantic_cache import SemanticCache, hashing_embedder
+from app.streaming import StreamError, collect, format_sse, iter_sse, payload_events
+from app.stub_server import StubServer
+
+
+def test_iter_sse_round_trip() -> None:
+    """
+    Test that formatted events parse back, ignoring comments and multi-line data joins.
+    """
+    raw = format_sse("sources", [{"path": "a"}]) + b": keep-alive\n\n" + format_sse("token", "Hello ") + b'event: done\ndata: {"year":\ndata: 2023}\n\n'
+    events = list(iter_sse(raw.split(b"\n")))
+    assert events == [("sources", [{"path": "a"}]), ("token", "Hello "), ("done", {"year": 2023})]
+
+
+def test_collect_rebuilds_payload() -> None:
+    """
+    Test that a replayed payload is reassembled unchanged and error events raise.
+    """
+    payload = {"issuer": "AAPL", "year": 2023, "summary": "s", "categories": [{"label": "x"}], "sources": []}
+    assert collect(payload_events(payload)) == payload
+    with pytest.raises(StreamError, match="boom"):
+        collect([("error", {"detail": "boom"})])
+
+
+def test_risk_summarize_stream_over_http() -> None:
+    """
+    Test that retrieval results arrive before the first token, tokens rebuild the summary and metrics are reported.
+    """
+    with StubServer(token_latency=0.01) as srv, MCPClient(base_urls={"risk": srv.url}, risk_cache=None, semantic_cache=None) as client:
+        events = list(client.risk_summarize_stream("AAPL", 2023, "top risks"))
+        names = [e for e, _ in events]
+        assert names[:3] == ["sources", "categories", "token"]
+        assert names.count("token") > 1
+        assert collect(events)["summary"] == client.risk_summarize("AAPL", 2023, "top risks")["summary"]
+        metrics = events[-1][1]
+        assert events[-1][0] == "metrics" and not metrics["cached"]
+        assert metrics["ttfb_s"] <= metrics["ttft_s"] < metrics["total_s"]
+
+
+def test_risk_summarize_stream_json_fallback() -> None:
+    """
+    Test that a non-streaming JSON answer is replayed as events.
+    """
+    client = MCPClient(risk_cache=None, semantic_cache=None)
+    with patch("requests.Session.post") as mock_post:
+        resp = mock_post.return_value.__enter__.return_value
+        resp.headers = {"Content-Type": "application/json"}
+        resp.json.return_value = {"summary": "all at once", "categories": [], "sources": ["s"]}
+        events = list(client.risk_summarize_stream("AAPL", 2023))
+    assert ("token", "all at once") in events
+    assert collect(events)["sources"] == ["s"]
+
+
+def test_truncated_stream_is_not_cached(tmp_path) -> None:
+    """
+    Test that a stream ending without a done event is passed through but not stored, and a complete one is.
+    """
+    cache = SemanticCache(0.8, embed=hashing_embedder())
+    client = MCPClient(risk_cache=None, semantic_cache=cache)
+    ctx = RiskContext(data_dir=str(tmp_path))
+    complete = b"".join(format_sse(e, d) for e, d in payload_events({"summary": "full answer", "categories": [], "sources": []}))
+    with patch("requests.Session.post") as mock_post:
+        resp = mock_post.return_value.__enter__.return_value
+        resp.headers = {"Content-Type": "text/event-stream"}
+        resp.iter_lines.return_value = complete.split(b"event: done")[0].split(b"\n")
+        events = list(client.risk_summarize_stream("AAPL", 2023, "top risks", ctx=ctx))
+        assert ("token", "full answer") in events and cache.lookup("AAPL", 2023, "top risks", str(tmp_path)) is None
+        resp.iter_lines.return_value = complete.split(b"\n")
+        list(client.risk_summarize_stream("AAPL", 2023, "top risks", ctx=ctx))
+    assert cache.lookup("AAPL", 2023, "top risks", str(tmp_path))["summary"] == "full answer"
@@ -0,0 +1,124 @@
+# test_sweep.py
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import sweep
+from app.mcp_client import MCPClient
+from app.strategy_store import StrategyStore
+from app.stub_server import StubServer
+
+
+def fake_backtest(panel=None, factor=None, horizon=None, costs_bps=None):
+    # module level so process workers can unpickle it
+    if horizon == 13:
+        raise ValueError("unlucky horizon")
+    return {"metrics": {"IC": horizon / 100, "Sharpe": -costs_bps, "rows": len(panel), "pid": os.getpid()}, "equity_curve_path": None}
+
+
+def path_backtest(panel_path=None, factor=None, horizon=None):
+    # like the strategy package: reads the file itself, no universe / costs_bps
+    return {"metrics": {"IC": horizon / 100, "rows": pq.read_metadata(panel_path).num_rows}, "equity_curve_path": None}
+
+
+@pytest.fixture
+def panel_file(tmp_path) -> str:
+    path = str(tmp_path / "panel.parquet")
+    df = pd.DataFrame({"date": pd.date_range("2024-01-01", periods=10).repeat(2), "ticker": ["AAPL", "MSFT"] * 10, "avg_sentiment": 0.1})
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path)
+    return path
+
+
+def test_grid() -> None:
+    """
+    Test that the grid is the full cartesian product.
+    """
+    jobs = sweep.grid(["A", "B"], range(1, 4), [5, 10])
+    assert len(jobs) == 12
+    assert jobs[0] == {"factor": "A", "horizon": 1, "universe": "SP500", "costs_bps": 5}
+
+
+def test_thread_sweep_reads_panel_once(panel_file, monkeypatch) -> None:
+    """
+    Test that the panel is read once for the whole grid, progress is reported per job and failures become rows.
+    """
+    reads = []
+    read_panel = sweep.panel.read_panel
+    monkeypatch.setattr(sweep.panel, "read_panel", lambda p: reads.append(p) or read_panel(p))
+    progress = []
+    jobs = sweep.grid(["SENT_L1"], range(10, 16), [10])
+    df = sweep.run_sweep(jobs, mode="thread", panel_path=panel_file, backtest=fake_backtest, on_progress=lambda d, t, _row: progress.append((d, t)), store=None)
+    assert reads == [panel_file]
+    assert progress == [(i, 6) for i in range(1, 7)]
+    assert list(df["horizon"]) == list(range(10, 16))
+    assert list(df.columns[:4]) == ["factor", "horizon", "universe", "costs_bps"]
+    assert (df.loc[df["horizon"] != 13, "rows"] == 20).all()
+    assert df.loc[df["horizon"] == 13, "error"].item() == "ValueError: unlucky horizon"
+
+
+def test_process_sweep_and_store(panel_file, tmp_path) -> None:
+    """
+    Test that jobs run in worker processes with the panel they loaded and stored results are not recomputed.
+    """
+    store = StrategyStore(str(tmp_path / "backtests"))
+    jobs = sweep.grid(["SENT_L1"], [1, 2, 3], [5, 10])
+    df = sweep.run_sweep(jobs, mode="process", panel_path=panel_file, backtest=fake_backtest, max_workers=2, store=store)
+    assert df["error"].isna().all() and not df["cached"].any()
+    assert (df["rows"] == 20).all()
+    assert os.getpid() not in set(df["pid"])
+    again = sweep.run_sweep(jobs, mode="process", panel_path=panel_file, backtest=fake_backtest, store=store)
+    assert again["cached"].all()
+    pd.testing.assert_frame_equal(again.drop(columns=["elapsed_s", "cached"]), df.drop(columns=["elapsed_s", "cached"]))
+
+
+def test_unsupported_params_cannot_be_swept(panel_file) -> None:
+    """
+    Test that a grid varying a parameter the backtest ignores is rejected, while a single value runs with the panel path.
+    """
+    with pytest.raises(ValueError, match="does not accept costs_bps"):
+        sweep.run_sweep(sweep.grid(["SENT_L1"], [1], [5, 10]), mode="thread", panel_path=panel_file, backtest=path_backtest, store=None)
+    df = sweep.run_sweep(sweep.grid(["SENT_L1"], [1, 2]), mode="thread", panel_path=panel_file, backtest=path_backtest, store=None)
+    assert df["error"].isna().all() and (df["rows"] == 20).all()
+
+
+def test_http_sweep() -> None:
+    """
+    Test that the grid can be spread over concurrent calls to the strategy service.
+    """
+    with StubServer(latency=0.1) as srv, MCPClient(base_urls={"strategy": srv.url}, pool_size=8) as client:
+        t0 = time.perf_counter()
+        df = sweep.run_sweep(sweep.grid(["SENT_L1", "SENT_L5"], range(1, 5)), mode="http", client=client)
+        wall = time.perf_counter() - t0
+    assert len(df) == 8 and df["error"].isna().all()
+    assert srv.connections <= 8
+    assert wall < df["elapsed_s"].sum() / 2  # calls overlapped
+
+
+def test_http_sweep_closes_its_own_client(monkeypatch) -> None:
+    """
+    Test that a client created by run_sweep is closed afterwards.
+    """
+    from app import mcp_client
+
+    closed = []
+
+    class Client(MCPClient):
+        def close(self) -> None:
+            closed.append(self)
+            super().close()
+
+    monkeypatch.setattr(mcp_client, "MCPClient", Client)
+    with StubServer() as srv:
+        monkeypatch.setattr(mcp_client, "STRAT_URL", srv.url)
+        df = sweep.run_sweep(sweep.grid(["SENT_L1"], [1, 2]), mode="http")
+    assert df["error"].isna().all() and len(closed) == 1
@@ -0,0 +1,94 @@
+# test_symbols.py
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import symbols
+from app.tools import run_risk, run_sentiment
+
+TICKERS = ["AAPL", "AMD", "AMZN", "GOOG", "GOOGL", "META", "MSFT", "NVDA", "NVAX", "TSLA"]
+
+
+@pytest.fixture
+def index() -> symbols.SymbolIndex:
+    return symbols.SymbolIndex(TICKERS, ["AAPL", "NVDA"])
+
+
+def test_resolve_exact_and_fuzzy(index) -> None:
+    """
+    Test that exact names resolve case-insensitively and close misspellings are corrected.
+    """
+    assert index.resolve(" nvda ") == symbols.Resolution(" nvda ", "NVDA", 100.0)
+    res = index.resolve("NVDIA", "issuer")
+    assert (res.symbol, res.corrected) == ("NVDA", True)
+    assert index.resolve("GOGL").symbol == "GOOGL"
+    assert index.resolve_tickers("aapl, MSTF,,AAPL") == ["AAPL", "MSFT"]
+
+
+def test_resolve_rejects_unknown_and_ambiguous(index) -> None:
+    """
+    Test that unknown names raise with suggestions instead of guessing.
+    """
+    with pytest.raises(symbols.UnknownSymbol, match="Unknown ticker 'XYZ'") as e:
+        index.resolve("XYZ")
+    assert e.value.suggestions == ()
+    with pytest.raises(symbols.UnknownSymbol, match="did you mean NVAX, NVDA"):
+        index.resolve("NVDX")  # as close to both
+    with pytest.raises(symbols.UnknownSymbol, match="Unknown issuer"):
+        index.resolve("MSFT", "issuer")  # a ticker, but no filings for it
+    assert symbols.SymbolIndex([]).resolve("anything").symbol == "ANYTHING"  # nothing to check against
+
+
+def test_extract(index) -> None:
+    """
+    Test that tickers, cashtags and years are pulled from the query text, jargon skipped.
+    """
+    found = index.extract("Compare NVDIA and $aapl risks vs AI peers in FY2023 and 2024 (IC, ESG, XYZW)")
+    assert found.tickers == ("NVDA", "AAPL")
+    assert found.exact == ("AAPL",)  # NVDIA was corrected, not typed
+    assert found.years == (2023, 2024)
+    assert [(c.query, c.symbol) for c in found.corrections] == [("NVDIA", "NVDA")]
+    assert found.unknown == ("XYZW",)
+    assert index.extract("show sentiment for apple") == symbols.QueryEntities()
+
+
+def test_get_index_from_panel_and_data_dir(tmp_path) -> None:
+    """
+    Test that the shared index reads the panel's tickers and the filings' issuers, and is rebuilt when they change.
+    """
+    panel = tmp_path / "panel.parquet"
+    pd.DataFrame({"date": ["2024-01-01"] * 3, "ticker": ["AAPL", "MSFT", "AAPL"], "avg_sentiment": [0.1, 0.2, 0.3]}).to_parquet(panel)
+    data = tmp_path / "filings"
+    (data / "NVDA").mkdir(parents=True)
+    (data / "AAPL_2023_10K.txt").write_text("")
+    (data / ".DS_Store").write_text("")
+    index = symbols.get_index(str(panel), str(data))
+    assert index.tickers == ("AAPL", "MSFT") and index.issuers == ("AAPL", "NVDA")
+    assert symbols.get_index(str(panel), str(data)) is index
+    (data / "TSLA").mkdir()
+    assert symbols.get_index(str(panel), str(data)).issuers == ("AAPL", "NVDA", "TSLA")
+
+
+def test_tools_fail_fast_on_unknown_symbols(index) -> None:
+    """
+    Test that run_sentiment / run_risk reject bad symbols before any backend call and pass corrected ones on.
+    """
+    calls = []
+
+    def backend(issuer, year, question):
+        calls.append(issuer)
+        return {"summary": "ok"}
+
+    with pytest.raises(symbols.UnknownSymbol):
+        run_risk(backend, "XYZ", 2023, "q", cache=None, semantic_cache=None, index=index)
+    with pytest.raises(symbols.UnknownSymbol):
+        run_sentiment(backend, "AAPL,XYZ", "2024-01-01", "2024-12-31", None, cache=None, index=index)
+    assert calls == []
+    run_risk(backend, "NVDIA", 2023, "q", cache=None, semantic_cache=None, index=index)
+    assert calls == ["NVDA"]
@@ -0,0 +1,85 @@
+# test_tracing.py
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import tracing
+from app.mcp_client import MCPClient
+from app.router import route_plan
+from app.stub_server import StubServer
+
+
+def test_span_is_noop_without_trace(monkeypatch) -> None:
+    """
+    Test that spans cost nothing and record nothing when no trace is active and TRACING is off.
+    """
+    monkeypatch.setattr(tracing.S, "TRACING", False)
+    with tracing.span("stage", a=1) as sp:
+        assert sp is None
+    assert tracing.span("other") is tracing._NOOP
+    assert tracing.current_span() is None
+
+
+def test_spans_nest_and_cross_threads() -> None:
+    """
+    Test that spans nest under the enclosing span, also on pool threads submitted through wrap().
+    """
+
+    def work(i: int) -> None:
+        with tracing.span(f"worker{i}"):
+            pass
+
+    with tracing.trace("request", export=False) as tr:
+        with tracing.span("outer") as outer, ThreadPoolExecutor(2) as ex:
+            list(ex.map(tracing.wrap(work), range(2)))
+        with pytest.raises(ValueError), tracing.span("failing"):
+            raise ValueError("boom")
+    by_name = {s.name: s for s in tr.spans}
+    assert set(by_name) == {"request", "outer", "worker0", "worker1", "failing"}
+    assert by_name["outer"].parent_id == tr.root.span_id
+    assert by_name["worker0"].parent_id == by_name["worker1"].parent_id == outer.span_id
+    assert by_name["failing"].error == "ValueError: boom"
+    rows = tr.breakdown()
+    assert [r["stage"] for r in rows][:2] == ["request", "outer"]
+    assert {r["stage"]: r["depth"] for r in rows}["worker0"] == 2
+    assert tracing.current_span() is None
+
+
+def test_export_jsonl(tmp_path, monkeypatch) -> None:
+    """
+    Test that a finished trace is appended as OpenTelemetry-style JSON lines, one per span.
+    """
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(tracing.S, "TRACING", True)
+    monkeypatch.setattr(tracing.S, "TRACE_FILE", str(path))
+    route_plan("NVDA risks and sentiment")  # outermost span starts its own trace
+    with tracing.trace("request", q="x"), tracing.span("stage", rows=3, obj=object()):
+        pass
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["name"] for line in lines] == ["router.route_plan", "stage", "request"]
+    stage, root = lines[1], lines[2]
+    assert stage["traceId"] == root["traceId"] != lines[0]["traceId"]
+    assert len(root["traceId"]) == 32 and len(stage["spanId"]) == 16
+    assert stage["parentSpanId"] == root["spanId"] and root["parentSpanId"] == ""
+    assert stage["attributes"]["rows"] == 3 and isinstance(stage["attributes"]["obj"], str)
+    assert root["startTimeUnixNano"] <= stage["startTimeUnixNano"] <= stage["endTimeUnixNano"] <= root["endTimeUnixNano"]
+    assert stage["status"] == {"code": "OK"}
+    assert lines[0]["attributes"]["tools"] == "risk,sentiment"
+
+
+def test_http_stages_are_traced() -> None:
+    """
+    Test that client calls record the HTTP round trip and the response decoding.
+    """
+    with StubServer() as srv, MCPClient(base_urls={"sentiment": srv.url}, cache=None) as client, tracing.trace("request", export=False) as tr:
+        client.sentiment_panel_stats(["AAPL"], "2024-01-01", "2024-01-31")
+    http, decode = (next(s for s in tr.spans if s.name == n) for n in ("http.sentiment", "http.decode"))
+    assert http.attributes == {"method": "POST", "path": "/panel_stats", "status": 200}
+    assert decode.parent_id == tr.root.span_id
@@ -1,4 +1,6 @@
 # tests/test_ui_streamlit.py
+import pandas as pd
+
 from app.ui_streamlit import _plot_sentiment
 
 
@@ -29,12 +31,20 @@ def test_route_query_sentiment(monkeypatch):
             ],
         }
 
+    from app import charts
     from app.ui_streamlit import run_sentiment
 
-    stats, img, df = run_sentiment(mock_panel_stats, "AAPL,MSFT", "2024-01-01", "2024-01-02", "dummy_path")
+    renders = []
+    real = charts._render_png
+    monkeypatch.setattr(charts, "_render_png", lambda wide: renders.append(wide) or real(wide))
+    monkeypatch.setattr(charts, "_PNG_CACHE", charts.TTLCache())
+    stats, img, df = run_sentiment(mock_panel_stats, "AAPL,MSFT", "2024-01-01", "2024-01-02", "dummy_path", cache=None)
     assert stats["count"] == 2
-    assert img is not None
     assert not df.empty
+    # the PNG is rendered only when the export is asked for
+    assert renders == []
+    assert img().startswith(b"\x89PNG")
+    assert len(renders) == 1
 
 
 def test_run_risk(monkeypatch):
@@ -79,18 +89,24 @@ def test_run_sentiment_panel_path(monkeypatch):
 
 def test_run_risk_with_data_dir(monkeypatch):
     # Test run_risk with risk_data_dir argument
+    import os
+
+    seen = []
+
     def mock_risk_summarize(issuer, year, question):
+        seen.append(os.environ.get("RISK_DATA_DIR"))
         return {"summary": "Risk summary with dir", "categories": [{"cat": "Market"}], "sources": ["sourceA"]}
 
-    import os
-
     from app.ui_streamlit import run_risk
 
+    monkeypatch.delenv("RISK_DATA_DIR", raising=False)
     summary, categories, sources = run_risk(mock_risk_summarize, "AAPL", 2023, "top risks", "test_dir")
     assert "dir" in summary
     assert not categories.empty
     assert sources == ["sourceA"]
-    assert os.environ["RISK_DATA_DIR"] == "test_dir"
+    # visible to env-reading backends during the call only
+    assert seen == ["test_dir"]
+    assert "RISK_DATA_DIR" not in os.environ
 
 
 def test_run_strategy_no_ic(monkeypatch):
@@ -109,9 +125,9 @@ def test_run_strategy_no_ic(monkeypatch):
 
 
 def test_run_strategy_with_ic(monkeypatch):
-    # Test run_strategy when metrics['IC'] is present
+    # Test run_strategy when metrics['IC'] is present for the requested parameters
     def mock_last_metrics():
-        return {"metrics": {"IC": 0.9}, "equity_curve_path": "curve3.png"}
+        return {"metrics": {"IC": 0.9}, "params": {"factor": "SENT_L1", "horizon": 1, "universe": "SP500", "costs_bps": 10}, "equity_curve_path": "curve3.png"}
 
     def mock_run_bt_from_panel(panel_path=None, factor=None, horizon=None):
         raise Exception("Should not be called")
@@ -123,6 +139,21 @@ def test_run_strategy_with_ic(monkeypatch):
     assert curve_path == "curve3.png"
 
 
+def test_run_strategy_without_reported_params_runs_backtest():
+    # last_metrics that does not say which parameters it is for is never shown
+    def mock_last_metrics():
+        return {"metrics": {"IC": 0.9}, "equity_curve_path": "curve3.png"}
+
+    def mock_run_bt_from_panel(panel_path=None, factor=None, horizon=None):
+        return {"metrics": {"IC": 0.2, "horizon": horizon}, "equity_curve_path": "curve4.png"}
+
+    from app.ui_streamlit import run_strategy
+
+    metrics, curve_path = run_strategy(mock_last_metrics, mock_run_bt_from_panel, "SENT_L1", 2, "dummy_path", store=None)
+    assert metrics == {"IC": 0.2, "horizon": 2}
+    assert curve_path == "curve4.png"
+
+
 def test_get_api_status_all_ok():
     from app.ui_streamlit import get_api_status
 
@@ -176,3 +207,154 @@ def test_main_block_strategy_ok():
 
     result = main_block("strategy", None, None, None)
     assert result["strategy"] is True
+
+
+def test_run_plan_runs_tools_concurrently():
+    import time
+
+    from app.ui_streamlit import run_plan
+
+    def slow(value):
+        def fn():
+            time.sleep(0.2)
+            return value
+
+        return fn
+
+    def boom():
+        raise RuntimeError("down")
+
+    plan = [("sentiment", 0.5, ""), ("risk", 0.3, ""), ("strategy", 0.2, "")]
+    t0 = time.perf_counter()
+    out = run_plan(plan, {"sentiment": slow("s"), "risk": slow("r"), "strategy": boom})
+    assert time.perf_counter() - t0 < 0.35
+    assert out["sentiment"] == "s" and out["risk"] == "r"
+    assert isinstance(out["strategy"], RuntimeError)
+
+
+def test_run_plan_skips_tools_without_runner():
+    from app.ui_streamlit import run_plan
+
+    out = run_plan([("risk", 1.0, "")], {"sentiment": lambda: 1})
+    assert out == {}
+
+
+def test_run_sentiment_cache_skips_backend():
+    from app.cache import TTLCache
+    from app.ui_streamlit import run_sentiment
+
+    calls = []
+
+    def mock_panel_stats(symbols, dfrom, dto, panel_path=None):
+        calls.append(symbols)
+        return {"stats": {"count": 1}, "series": [{"ticker": "AAPL", "date": "2024-01-01", "avg_sentiment": 0.5}]}
+
+    cache = TTLCache(maxsize=8, ttl=60)
+    run_sentiment(mock_panel_stats, "AAPL,MSFT", "2024-01-01", "2024-01-02", "dummy_path", cache=cache)
+    stats, _, df = run_sentiment(mock_panel_stats, "MSFT, AAPL", "2024-01-01", "2024-01-02", "dummy_path", cache=cache)
+    assert len(calls) == 1
+    assert stats["count"] == 1 and not df.empty
+    assert cache.stats()["hits"] == 1
+
+
+def test_run_sentiment_reads_local_panel(tmp_path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from app.cache import TTLCache
+    from app.ui_streamlit import run_sentiment
+
+    path = tmp_path / "panel.parquet"
+    df = pd.DataFrame({"date": ["2024-01-01", "2024-01-02"], "ticker": ["AAPL", "AAPL"], "avg_sentiment": [0.2, 0.4]})
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path)
+
+    def backend_not_called(*args, **kwargs):
+        raise AssertionError("backend should not be called when the panel is local")
+
+    stats, img, out = run_sentiment(backend_not_called, "AAPL", "2024-01-01", "2024-01-31", str(path), cache=TTLCache())
+    assert set(stats) == {"avg_sentiment", "n_news"} and stats["n_news"] == 2
+    assert img is not None
+    assert list(out["avg_sentiment"]) == [0.2, 0.4]
+
+
+def test_run_risk_uses_persistent_cache(tmp_path):
+    from app.risk_cache import RiskCache
+    from app.ui_streamlit import run_risk
+
+    data = tmp_path / "filings"
+    data.mkdir()
+    (data / "AAPL_2023_10k.txt").write_text("filing")
+    calls = []
+
+    def mock_risk_summarize(issuer, year, question):
+        calls.append(issuer)
+        return {"summary": "cached summary", "categories": [{"cat": "Liquidity"}], "sources": ["s"]}
+
+    cache = RiskCache(str(tmp_path / "cache"))
+    run_risk(mock_risk_summarize, "AAPL", 2023, "Top risks", str(data), cache=cache)
+    summary, categories, _ = run_risk(mock_risk_summarize, "AAPL", 2023, "top risks", str(data), cache=cache)
+    assert calls == ["AAPL"]
+    assert summary == "cached summary"
+    assert not categories.empty
+
+
+def test_run_risk_uses_semantic_cache(tmp_path):
+    from app.semantic_cache import SemanticCache, hashing_embedder
+    from app.ui_streamlit import run_risk
+
+    calls = []
+
+    def mock_risk_summarize(issuer, year, question):
+        calls.append(question)
+        return {"summary": "s", "categories": [], "sources": []}
+
+    cache = SemanticCache(0.8, embed=hashing_embedder())
+    run_risk(mock_risk_summarize, "AAPL", 2023, "summarize item 1A risk factors", str(tmp_path), cache=None, semantic_cache=cache)
+    run_risk(mock_risk_summarize, "AAPL", 2023, "Summarise Item 1A risk factors", str(tmp_path), cache=None, semantic_cache=cache)
+    assert calls == ["summarize item 1A risk factors"]
+    assert cache.stats()["hits"] == 1
+
+
+def test_run_strategy_reuses_stored_backtest(tmp_path):
+    from app.strategy_store import StrategyStore
+    from app.ui_streamlit import run_strategy
+
+    panel = tmp_path / "panel.parquet"
+    panel.write_bytes(b"not parquet")
+    calls = []
+
+    def mock_last_metrics():
+        # "last" run was for another horizon: must not be shown for horizon 1
+        return {"metrics": {"IC": 0.9, "factor": "SENT_L1", "horizon": 5}, "equity_curve_path": None}
+
+    def mock_run_bt_from_panel(panel_path=None, factor=None, horizon=None, costs_bps=None):
+        calls.append((horizon, costs_bps))
+        return {"metrics": {"IC": 0.4}, "equity_curve_path": None}
+
+    store = StrategyStore(str(tmp_path / "backtests"))
+    for _ in range(2):
+        metrics, _ = run_strategy(mock_last_metrics, mock_run_bt_from_panel, "SENT_L1", 1, str(panel), store=store)
+        assert metrics == {"IC": 0.4}
+    run_strategy(mock_last_metrics, mock_run_bt_from_panel, "SENT_L1", 1, str(panel), costs_bps=20, store=store)
+    assert calls == [(1, 10.0), (1, 20)]
+
+
+def test_run_strategy_passes_pruned_panel(tmp_path):
+    # backends taking an in-memory panel get a panel-layer read: only the panel columns are decoded
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from app.ui_streamlit import run_strategy
+
+    path = tmp_path / "panel.parquet"
+    df = pd.DataFrame({"date": ["2024-01-01", "2024-01-02"], "ticker": ["AAPL", "AAPL"], "avg_sentiment": [0.2, 0.4], "headline": ["a", "b"]})
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path)
+    seen = []
+
+    def mock_run_bt(panel=None, factor=None, horizon=None):
+        seen.append(list(panel.columns))
+        return {"metrics": {"IC": 0.1}, "equity_curve_path": None}
+
+    metrics, _ = run_strategy(dict, mock_run_bt, "SENT_L1", 1, str(path), store=None)
+    assert metrics == {"IC": 0.1}
+    assert seen == [["date", "ticker", "avg_sentiment"]]
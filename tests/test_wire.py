@@ -0,0 +1,66 @@
+# test_wire.py
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import wire
+from app.mcp_client import MCPClient
+from app.stub_server import StubServer
+
+PAYLOAD = {
+    "stats": {"avg_sentiment": 0.15, "n_rows": 3},
+    "series": [
+        {"date": "2024-01-02", "ticker": "AAPL", "avg_sentiment": 0.1},
+        {"date": "2024-01-02", "ticker": "MSFT", "avg_sentiment": 0.2},
+        {"date": "2024-01-03", "ticker": "AAPL", "avg_sentiment": 0.15},
+    ],
+}
+
+
+def test_round_trip() -> None:
+    """
+    Test that stats survive in the schema metadata and series decode to the same frame as JSON records.
+    """
+    out = wire.decode_panel_stats(wire.encode_panel_stats(PAYLOAD))
+    assert out["stats"] == PAYLOAD["stats"]
+    expected = pd.DataFrame(PAYLOAD["series"]).assign(date=lambda d: pd.to_datetime(d["date"]))
+    got = out["series"].assign(ticker=lambda d: d["ticker"].astype(str), date=lambda d: d["date"].astype("datetime64[ns]"))
+    pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+    assert wire.decode_panel_stats(wire.encode_panel_stats({"stats": {}, "series": []}))["series"].empty
+
+
+def test_accept_header_and_media_type() -> None:
+    """
+    Test that Arrow is offered with a JSON fallback, and Content-Type parameters are ignored.
+    """
+    assert wire.accept_header("json") == wire.JSON
+    assert wire.accept_header("arrow").startswith(wire.ARROW_STREAM)
+    assert wire.media_type("Application/Vnd.Apache.Arrow.Stream; charset=binary") == wire.ARROW_STREAM
+    assert wire.media_type(None) == ""
+
+
+def test_client_negotiates_format() -> None:
+    """
+    Test that MCPClient returns the same DataFrame whether the series came as Arrow or JSON.
+    """
+    with StubServer() as srv:
+        results = {}
+        for fmt in ("arrow", "json"):
+            with MCPClient(base_urls={"sentiment": srv.url}, cache=None, wire=fmt) as client:
+                results[fmt] = client.sentiment_panel_stats(["AAPL", "MSFT"], "2024-01-02", "2024-01-31")
+    assert results["arrow"]["stats"] == results["json"]["stats"]
+    assert not results["json"]["series"].empty
+    pd.testing.assert_frame_equal(results["arrow"]["series"], results["json"]["series"])
+
+
+def test_series_frame_matches_arrow_decoding() -> None:
+    """
+    Test that JSON records convert to the frame the Arrow decoder produces, dtypes included.
+    """
+    pd.testing.assert_frame_equal(wire.series_frame(PAYLOAD["series"]), wire.decode_panel_stats(wire.encode_panel_stats(PAYLOAD))["series"])
+    assert list(wire.series_frame([]).columns) == ["date", "ticker", "avg_sentiment"]